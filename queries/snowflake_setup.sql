@@ -8,7 +8,7 @@
 -- 1. Database and Schema Creation
 -- 2. Bronze Layer Table Creation  
 -- 3. File Format and Stage Setup
--- 4. Data Loading Commands
+-- 4. Data Loading Commands (4b: Parquet alternative)
 -- 5. Validation Queries
 -- =====================================================================================
 
@@ -206,6 +206,55 @@ FROM @ZENDESK_DATA_STAGE/ticket_metrics.csv
 FILE_FORMAT = (FORMAT_NAME = CSV_FORMAT)
 ON_ERROR = 'ABORT_STATEMENT';
 
+-- =====================================================================================
+-- 4b. ALTERNATIVE: LOAD PARQUET OUTPUT
+-- =====================================================================================
+-- Use instead of section 4 when the data was generated with
+--   python scripts/generate_pipeline.py --format parquet
+-- Parquet columns are already typed (INTEGER, BOOLEAN, DECIMAL, DATE, TIMESTAMP) and
+-- multi-line transcript_text needs no quoting rules, so each COPY maps columns by name.
+
+CREATE OR REPLACE FILE FORMAT PARQUET_FORMAT
+TYPE = 'PARQUET'
+BINARY_AS_TEXT = FALSE;
+
+PUT file:///Users/tgordonjr/Desktop/zendesk_demo/data/zendesk_customers.parquet @ZENDESK_DATA_STAGE OVERWRITE=TRUE;
+PUT file:///Users/tgordonjr/Desktop/zendesk_demo/data/zendesk_employees.parquet @ZENDESK_DATA_STAGE OVERWRITE=TRUE;
+PUT file:///Users/tgordonjr/Desktop/zendesk_demo/data/zendesk_tickets.parquet @ZENDESK_DATA_STAGE OVERWRITE=TRUE;
+PUT file:///Users/tgordonjr/Desktop/zendesk_demo/data/call_transcripts.parquet @ZENDESK_DATA_STAGE OVERWRITE=TRUE;
+PUT file:///Users/tgordonjr/Desktop/zendesk_demo/data/ticket_metrics.parquet @ZENDESK_DATA_STAGE OVERWRITE=TRUE;
+
+-- Load in foreign key order: customers, employees, tickets, then transcripts and metrics
+COPY INTO ZENDESK_CUSTOMERS
+FROM @ZENDESK_DATA_STAGE/zendesk_customers.parquet
+FILE_FORMAT = (FORMAT_NAME = PARQUET_FORMAT)
+MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE
+ON_ERROR = 'ABORT_STATEMENT';
+
+COPY INTO ZENDESK_EMPLOYEES
+FROM @ZENDESK_DATA_STAGE/zendesk_employees.parquet
+FILE_FORMAT = (FORMAT_NAME = PARQUET_FORMAT)
+MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE
+ON_ERROR = 'ABORT_STATEMENT';
+
+COPY INTO ZENDESK_TICKETS
+FROM @ZENDESK_DATA_STAGE/zendesk_tickets.parquet
+FILE_FORMAT = (FORMAT_NAME = PARQUET_FORMAT)
+MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE
+ON_ERROR = 'ABORT_STATEMENT';
+
+COPY INTO CALL_TRANSCRIPTS
+FROM @ZENDESK_DATA_STAGE/call_transcripts.parquet
+FILE_FORMAT = (FORMAT_NAME = PARQUET_FORMAT)
+MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE
+ON_ERROR = 'ABORT_STATEMENT';
+
+COPY INTO TICKET_METRICS
+FROM @ZENDESK_DATA_STAGE/ticket_metrics.parquet
+FILE_FORMAT = (FORMAT_NAME = PARQUET_FORMAT)
+MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE
+ON_ERROR = 'ABORT_STATEMENT';
+
 -- =====================================================================================
 -- NEXT STEPS AFTER DATA LOADING
 -- =====================================================================================
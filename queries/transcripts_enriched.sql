@@ -3,6 +3,10 @@
 -- =====================================================================================
 -- This table creates a comprehensive view of call transcripts enriched with all three
 -- core Snowflake Cortex AI functions: SENTIMENT, AI_CLASSIFY, and SUMMARIZE
+--
+-- This rebuilds the table and calls Cortex for every transcript on each run. For repeat
+-- runs use transcripts_enriched_cached.sql, which caches results by transcript text hash
+-- and only sends new or changed transcripts to Cortex.
 
 CREATE OR REPLACE TABLE ENRICHED_CALL_TRANSCRIPTS AS
 SELECT 
@@ -0,0 +1,173 @@
+-- =====================================================================================
+-- INCREMENTAL, CACHED TRANSCRIPT ENRICHMENT
+-- =====================================================================================
+-- Generated by scripts/enrichment_cache.py; regenerate rather than edit.
+-- Same enriched columns as transcripts_enriched.sql, but Cortex results are cached in
+-- CORTEX_ENRICHMENT_CACHE by SHA2(transcript_text) + function + model version, so
+-- each run only calls Cortex for texts it has not seen, and ENRICHED_CALL_TRANSCRIPTS
+-- is merged (not replaced) so Cortex Search change tracking only sees changed rows.
+-- Function versions: SENTIMENT:v1,AI_CLASSIFY:v1,SUMMARIZE:v1
+
+USE DATABASE ZENDESK_ANALYTICS_POC;
+USE SCHEMA BRONZE;
+
+CREATE TABLE IF NOT EXISTS CORTEX_ENRICHMENT_CACHE (
+    text_hash VARCHAR(64) NOT NULL,
+    function_name VARCHAR(50) NOT NULL,
+    model_version VARCHAR(50) NOT NULL,
+    result VARIANT,
+    enriched_at TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
+    PRIMARY KEY (text_hash, function_name, model_version)
+);
+
+-- Optional: seed the cache from a local store (scripts/enrichment_cache.py keeps enrichment_cache.csv)
+-- PUT 'file:///path/to/data/enrichment_cache.csv' @ZENDESK_DATA_STAGE/enrichment_cache/ AUTO_COMPRESS = TRUE OVERWRITE = TRUE;
+-- MERGE INTO CORTEX_ENRICHMENT_CACHE cache
+-- USING (SELECT $1 AS text_hash, $2 AS function_name, $3 AS model_version, PARSE_JSON($4) AS result
+--        FROM @ZENDESK_DATA_STAGE/enrichment_cache/ (FILE_FORMAT => CSV_FORMAT)) seed
+-- ON cache.text_hash = seed.text_hash AND cache.function_name = seed.function_name
+--    AND cache.model_version = seed.model_version
+-- WHEN NOT MATCHED THEN INSERT (text_hash, function_name, model_version, result)
+--     VALUES (seed.text_hash, seed.function_name, seed.model_version, seed.result);
+
+-- SENTIMENT (v1): only distinct texts without a cached result reach Cortex
+MERGE INTO CORTEX_ENRICHMENT_CACHE cache
+USING (
+    SELECT texts.text_hash, TO_VARIANT(SNOWFLAKE.CORTEX.SENTIMENT(texts.transcript_text)) AS result
+    FROM (
+        SELECT DISTINCT SHA2(transcript_text, 256) AS text_hash, transcript_text
+        FROM CALL_TRANSCRIPTS
+    ) texts
+    WHERE NOT EXISTS (
+        SELECT 1 FROM CORTEX_ENRICHMENT_CACHE cached
+        WHERE cached.text_hash = texts.text_hash AND cached.function_name = 'SENTIMENT' AND cached.model_version = 'v1'
+    )
+) uncached
+ON cache.text_hash = uncached.text_hash AND cache.function_name = 'SENTIMENT' AND cache.model_version = 'v1'
+WHEN NOT MATCHED THEN INSERT (text_hash, function_name, model_version, result)
+    VALUES (uncached.text_hash, 'SENTIMENT', 'v1', uncached.result);
+
+-- AI_CLASSIFY (v1): only distinct texts without a cached result reach Cortex
+MERGE INTO CORTEX_ENRICHMENT_CACHE cache
+USING (
+    SELECT texts.text_hash, TO_VARIANT(SNOWFLAKE.CORTEX.AI_CLASSIFY(texts.transcript_text, ['Payment Processing Issues', 'Integration and Technical Support', 'Training and User Education', 'Feature Requests and Enhancements', 'Account Management and Billing'])) AS result
+    FROM (
+        SELECT DISTINCT SHA2(transcript_text, 256) AS text_hash, transcript_text
+        FROM CALL_TRANSCRIPTS
+    ) texts
+    WHERE NOT EXISTS (
+        SELECT 1 FROM CORTEX_ENRICHMENT_CACHE cached
+        WHERE cached.text_hash = texts.text_hash AND cached.function_name = 'AI_CLASSIFY' AND cached.model_version = 'v1'
+    )
+) uncached
+ON cache.text_hash = uncached.text_hash AND cache.function_name = 'AI_CLASSIFY' AND cache.model_version = 'v1'
+WHEN NOT MATCHED THEN INSERT (text_hash, function_name, model_version, result)
+    VALUES (uncached.text_hash, 'AI_CLASSIFY', 'v1', uncached.result);
+
+-- SUMMARIZE (v1): only distinct texts without a cached result reach Cortex
+MERGE INTO CORTEX_ENRICHMENT_CACHE cache
+USING (
+    SELECT texts.text_hash, TO_VARIANT(SNOWFLAKE.CORTEX.SUMMARIZE(texts.transcript_text)) AS result
+    FROM (
+        SELECT DISTINCT SHA2(transcript_text, 256) AS text_hash, transcript_text
+        FROM CALL_TRANSCRIPTS
+    ) texts
+    WHERE NOT EXISTS (
+        SELECT 1 FROM CORTEX_ENRICHMENT_CACHE cached
+        WHERE cached.text_hash = texts.text_hash AND cached.function_name = 'SUMMARIZE' AND cached.model_version = 'v1'
+    )
+) uncached
+ON cache.text_hash = uncached.text_hash AND cache.function_name = 'SUMMARIZE' AND cache.model_version = 'v1'
+WHEN NOT MATCHED THEN INSERT (text_hash, function_name, model_version, result)
+    VALUES (uncached.text_hash, 'SUMMARIZE', 'v1', uncached.result);
+
+CREATE TABLE IF NOT EXISTS ENRICHED_CALL_TRANSCRIPTS (
+    transcript_id INTEGER,
+    ticket_id INTEGER,
+    call_duration INTEGER,
+    call_duration_minutes NUMBER(10,1),
+    transcript_text TEXT,
+    call_date TIMESTAMP_NTZ,
+    agent_name VARCHAR(100),
+    customer_satisfaction INTEGER,
+    resolution_provided BOOLEAN,
+    follow_up_needed BOOLEAN,
+    sentiment_score FLOAT,
+    sentiment_category VARCHAR(20),
+    conversation_category VARCHAR(100),
+    conversation_summary TEXT,
+    original_text_length INTEGER,
+    summary_length INTEGER,
+    compression_ratio NUMBER(10,1),
+    text_hash VARCHAR(64),
+    enrichment_versions VARCHAR(200)
+);
+
+-- A table created by transcripts_enriched.sql has neither tracking column, so add them
+ALTER TABLE ENRICHED_CALL_TRANSCRIPTS ADD COLUMN IF NOT EXISTS text_hash VARCHAR(64);
+ALTER TABLE ENRICHED_CALL_TRANSCRIPTS ADD COLUMN IF NOT EXISTS enrichment_versions VARCHAR(200);
+
+-- Enriched rows come from the cache alone; rows are only rewritten when their text or versions change
+MERGE INTO ENRICHED_CALL_TRANSCRIPTS target
+USING (
+    SELECT
+        ct.transcript_id AS transcript_id,
+        ct.ticket_id AS ticket_id,
+        ct.call_duration AS call_duration,
+        ROUND(ct.call_duration / 60.0, 1) AS call_duration_minutes,
+        ct.transcript_text AS transcript_text,
+        ct.call_date AS call_date,
+        ct.agent_name AS agent_name,
+        ct.customer_satisfaction AS customer_satisfaction,
+        ct.resolution_provided AS resolution_provided,
+        ct.follow_up_needed AS follow_up_needed,
+        sentiment.result::FLOAT AS sentiment_score,
+        CASE
+            WHEN sentiment.result::FLOAT >= 0.1 THEN 'Positive'
+            WHEN sentiment.result::FLOAT <= -0.1 THEN 'Negative'
+            ELSE 'Neutral'
+        END AS sentiment_category,
+        classify.result:labels[0]::STRING AS conversation_category,
+        summary.result::STRING AS conversation_summary,
+        LENGTH(ct.transcript_text) AS original_text_length,
+        LENGTH(summary.result::STRING) AS summary_length,
+        ROUND(LENGTH(summary.result::STRING) * 100.0 / LENGTH(ct.transcript_text), 1) AS compression_ratio,
+        ct.text_hash AS text_hash,
+        'SENTIMENT:v1,AI_CLASSIFY:v1,SUMMARIZE:v1' AS enrichment_versions
+    FROM (SELECT *, SHA2(transcript_text, 256) AS text_hash FROM CALL_TRANSCRIPTS) ct
+    JOIN CORTEX_ENRICHMENT_CACHE sentiment
+        ON sentiment.text_hash = ct.text_hash AND sentiment.function_name = 'SENTIMENT' AND sentiment.model_version = 'v1'
+    JOIN CORTEX_ENRICHMENT_CACHE classify
+        ON classify.text_hash = ct.text_hash AND classify.function_name = 'AI_CLASSIFY' AND classify.model_version = 'v1'
+    JOIN CORTEX_ENRICHMENT_CACHE summary
+        ON summary.text_hash = ct.text_hash AND summary.function_name = 'SUMMARIZE' AND summary.model_version = 'v1'
+) src
+ON target.transcript_id = src.transcript_id
+WHEN MATCHED AND (target.text_hash IS DISTINCT FROM src.text_hash
+                  OR target.enrichment_versions IS DISTINCT FROM src.enrichment_versions) THEN UPDATE SET
+    ticket_id = src.ticket_id,
+    call_duration = src.call_duration,
+    call_duration_minutes = src.call_duration_minutes,
+    transcript_text = src.transcript_text,
+    call_date = src.call_date,
+    agent_name = src.agent_name,
+    customer_satisfaction = src.customer_satisfaction,
+    resolution_provided = src.resolution_provided,
+    follow_up_needed = src.follow_up_needed,
+    sentiment_score = src.sentiment_score,
+    sentiment_category = src.sentiment_category,
+    conversation_category = src.conversation_category,
+    conversation_summary = src.conversation_summary,
+    original_text_length = src.original_text_length,
+    summary_length = src.summary_length,
+    compression_ratio = src.compression_ratio,
+    text_hash = src.text_hash,
+    enrichment_versions = src.enrichment_versions
+WHEN NOT MATCHED THEN INSERT (transcript_id, ticket_id, call_duration, call_duration_minutes, transcript_text, call_date, agent_name, customer_satisfaction, resolution_provided, follow_up_needed, sentiment_score, sentiment_category, conversation_category, conversation_summary, original_text_length, summary_length, compression_ratio, text_hash, enrichment_versions)
+    VALUES (src.transcript_id, src.ticket_id, src.call_duration, src.call_duration_minutes, src.transcript_text, src.call_date, src.agent_name, src.customer_satisfaction, src.resolution_provided, src.follow_up_needed, src.sentiment_score, src.sentiment_category, src.conversation_category, src.conversation_summary, src.original_text_length, src.summary_length, src.compression_ratio, src.text_hash, src.enrichment_versions);
+
+-- Cached results per function and version (enriched_at shows when each batch was paid for)
+SELECT function_name, model_version, COUNT(*) AS cached_results, MAX(enriched_at) AS last_enriched_at
+FROM CORTEX_ENRICHMENT_CACHE
+GROUP BY function_name, model_version
+ORDER BY function_name, model_version;
@@ -0,0 +1,81 @@
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for the columnar engines
+    np = None
+
+from rng_streams import derive_seed
+from timestamps import Timestamp, to_epoch
+
+GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+
+
+def require_numpy():
+    if np is None:
+        raise ImportError("The numpy engines require numpy (pip install numpy)")
+
+
+def category_codes(values, categories, default):
+    """Map a sequence of strings to int8 category codes"""
+    index = {value: code for code, value in enumerate(categories)}
+    fallback = index[default]
+    return np.fromiter((index.get(v, fallback) for v in values), dtype=np.int8, count=len(values))
+
+
+def epoch_seconds(values):
+    """int64 epoch seconds from Timestamps or 'YYYY-MM-DD[ HH:MM:SS]' strings (-1 for blanks)"""
+    return np.fromiter((-1 if v == '' else to_epoch(v) for v in values), dtype=np.int64, count=len(values))
+
+
+def timestamp_column(seconds, present=None):
+    """Timestamps for an array of epoch seconds (floored), '' where `present` is False"""
+    values = np.floor(seconds).astype(np.int64).tolist()
+    if present is None:
+        return [Timestamp(v) for v in values]
+    return [Timestamp(v) if p else '' for v, p in zip(values, present.tolist())]
+
+
+class CounterStreams:
+    """Counter-based uniform draws keyed by (seed, stage, key, slot)
+
+    Every random quantity has its own slot, and each draw is a SplitMix64 hash of
+    the row's key, so a row's values never depend on which batch it is in.
+    """
+
+    def __init__(self, seed, keys, stage):
+        self.seed = seed
+        self.stage = stage
+        self.ids = np.asarray(keys, dtype=np.uint64) * np.uint64(GOLDEN_GAMMA)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def uniform(self, slot, low=0.0, high=1.0):
+        # SplitMix64 finalizer, applied in place to avoid per-step temporaries
+        x = self.ids ^ np.uint64(derive_seed(self.seed, slot, self.stage))
+        x += np.uint64(GOLDEN_GAMMA)
+        x ^= x >> np.uint64(30)
+        x *= np.uint64(0xBF58476D1CE4E5B9)
+        x ^= x >> np.uint64(27)
+        x *= np.uint64(0x94D049BB133111EB)
+        x ^= x >> np.uint64(31)
+        x >>= np.uint64(11)
+        u = x.astype(np.float64)
+        u *= 1.0 / (1 << 53)
+        return low + (high - low) * u
+
+    def randint(self, slot, low, high):
+        """Inclusive integer draws; low/high may be scalars or per-row arrays"""
+        return (low + np.floor(self.uniform(slot) * (np.asarray(high) - low + 1))).astype(np.int64)
+
+    def choices(self, slot, population, weights):
+        cumulative = np.cumsum(weights, dtype=np.float64)
+        picks = np.searchsorted(cumulative / cumulative[-1], self.uniform(slot), side='right')
+        return np.asarray(population)[picks]
+
+    def grouped_choices(self, slot, groups, weight_table):
+        """Draw an option index per row from the weight row selected by `groups`"""
+        cumulative = np.cumsum(np.asarray(weight_table, dtype=np.float64), axis=1)
+        cumulative /= cumulative[:, -1:]
+        u = self.uniform(slot)
+        picks = (u[:, None] >= cumulative[groups]).sum(axis=1)
+        return np.minimum(picks, cumulative.shape[1] - 1)
@@ -0,0 +1,229 @@
+import argparse
+import functools
+import os
+import time
+import zlib
+
+from columnar import np, require_numpy
+from enrichment_cache import CONVERSATION_CATEGORIES
+from generate_call_transcripts import LABELS_FILE
+from table_io import default_data_dir, iter_batches, iter_csv_table
+from text_tokens import TEXT_SEPARATOR, batch_tokens
+
+MODEL_FILE = 'conversation_classifier.npz'
+
+# Unigrams and bigrams are hashed into 2^FEATURE_BITS buckets, so there is no vocabulary to build or store
+FEATURE_BITS = 18
+BIGRAM_MULTIPLIER = 1000003
+
+# Every fifth transcript (by ID) is held out to measure accuracy
+HOLDOUT_EVERY = 5
+
+# Training takes more, smaller steps than prediction needs
+TRAINING_BATCH_SIZE = 250
+EPOCHS = 10
+LEARNING_RATE = 30.0
+
+
+class _TokenHashes(dict):
+    """crc32 of each word, computed on first sight (the separator hashes to -1)"""
+
+    def __init__(self):
+        super().__init__({TEXT_SEPARATOR: -1})
+
+    def __missing__(self, word):
+        value = self[word] = zlib.crc32(word.encode())
+        return value
+
+
+_token_hashes = _TokenHashes()
+
+
+def hashed_features(texts, bits=FEATURE_BITS):
+    """Sparse feature rows for a batch of texts as (rows, columns, values)
+
+    Each text's hashed unigram and bigram counts are log-scaled and scaled to
+    unit length. The whole batch is tokenized and hashed in one pass, and
+    bigrams, counts and norms are array operations over it.
+    """
+    require_numpy()
+    hashes = np.fromiter(map(_token_hashes.__getitem__, batch_tokens(texts)), dtype=np.int64)
+    separator = hashes == -1
+    row = np.cumsum(separator)
+    word = ~separator
+    size = 1 << bits
+
+    # Bigrams never span two texts; the separator sits between them
+    bigram = word[:-1] & word[1:]
+    columns = np.concatenate([hashes[word] % size, (hashes[:-1][bigram] * BIGRAM_MULTIPLIER + hashes[1:][bigram]) % size])
+    rows = np.concatenate([row[word], row[:-1][bigram]])
+
+    keys, counts = np.unique(rows * size + columns, return_counts=True)
+    rows, columns = keys // size, keys % size
+    values = 1.0 + np.log(counts)
+    norms = np.sqrt(np.bincount(rows, weights=values * values, minlength=len(texts)))
+    return rows, columns, (values / norms[rows]).astype(np.float32)
+
+
+def _softmax(scores):
+    scores = scores - scores.max(axis=1, keepdims=True)
+    exp = np.exp(scores)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+class ConversationClassifier:
+    """Linear (softmax) classifier over hashed n-grams, a local stand-in for AI_CLASSIFY"""
+
+    def __init__(self, labels=CONVERSATION_CATEGORIES, bits=FEATURE_BITS, weights=None, bias=None):
+        require_numpy()
+        self.labels = list(labels)
+        self.bits = bits
+        self.weights = weights if weights is not None else np.zeros((1 << bits, len(self.labels)), dtype=np.float32)
+        self.bias = bias if bias is not None else np.zeros(len(self.labels), dtype=np.float32)
+
+    def scores(self, features, count):
+        rows, columns, values = features
+        contributions = self.weights[columns] * values[:, None]
+        scores = np.column_stack([np.bincount(rows, weights=contributions[:, k], minlength=count)
+                                  for k in range(len(self.labels))])
+        return scores + self.bias
+
+    def predict(self, texts):
+        """Most likely label for each text"""
+        if not texts:
+            return []
+        best = self.scores(hashed_features(texts, self.bits), len(texts)).argmax(axis=1)
+        return [self.labels[i] for i in best.tolist()]
+
+    def fit(self, batches, epochs=EPOCHS, learning_rate=LEARNING_RATE, regularization=1e-6):
+        """Mini-batch gradient descent on cross-entropy over (features, count, label indexes) batches"""
+        for epoch in range(epochs):
+            rate = learning_rate / (1 + epoch)
+            for features, count, targets in batches:
+                rows, columns, values = features
+                error = _softmax(self.scores(features, count))
+                error[np.arange(count), targets] -= 1.0
+                error /= count
+
+                # Only the buckets that occur in the batch are updated
+                touched, position = np.unique(columns, return_inverse=True)
+                step = np.column_stack([np.bincount(position, weights=error[rows, k] * values, minlength=len(touched))
+                                        for k in range(len(self.labels))])
+                self.weights[touched] -= (rate * (step + regularization * self.weights[touched])).astype(np.float32)
+                self.bias -= (rate * error.sum(axis=0)).astype(np.float32)
+        return self
+
+    def save(self, path):
+        # Through a file handle, as savez_compressed would add .npz to a path without it
+        with open(path, 'wb') as f:
+            np.savez_compressed(f, weights=self.weights, bias=self.bias, labels=np.array(self.labels), bits=self.bits)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as model:
+            return cls(model['labels'].tolist(), int(model['bits']), model['weights'], model['bias'])
+
+
+@functools.lru_cache(maxsize=None)
+def load_classifier(path):
+    """A saved classifier, loaded once per process"""
+    return ConversationClassifier.load(path)
+
+
+def iter_labeled(transcripts_path, labels_path):
+    """(transcript_id, text, true label) for every transcript with a ground-truth label"""
+    labels = {row['transcript_id']: row['true_category'] for row in iter_csv_table(labels_path)}
+    for transcript in iter_csv_table(transcripts_path):
+        label = labels.get(transcript['transcript_id'])
+        if label is not None:
+            yield int(transcript['transcript_id']), transcript['transcript_text'], label
+
+
+def evaluate(classifier, examples, batch_size=1000):
+    """Accuracy against ground truth, overall and per label, and prediction rows/sec"""
+    correct, total = {}, {}
+    started = time.perf_counter()
+    for batch in iter_batches(examples, batch_size):
+        predicted = classifier.predict([text for _, text, _ in batch])
+        for (_, _, label), guess in zip(batch, predicted):
+            total[label] = total.get(label, 0) + 1
+            correct[label] = correct.get(label, 0) + (guess == label)
+    elapsed = time.perf_counter() - started
+    rows = sum(total.values())
+    return {
+        'rows': rows,
+        'accuracy': sum(correct.values()) / rows if rows else 0.0,
+        'by_label': {label: correct[label] / total[label] for label in sorted(total)},
+        'seconds': elapsed,
+        'rows_per_sec': rows / elapsed if elapsed else 0.0
+    }
+
+
+def train_classifier(data_dir=None, transcripts_path=None, labels_path=None, model_path=None, epochs=EPOCHS, bits=FEATURE_BITS,
+                     batch_size=1000, verbose=True):
+    """Train on the generated transcripts' ground-truth labels, holding out every fifth transcript
+
+    Features are hashed once and kept as sparse arrays for the training epochs.
+    Returns the classifier and its evaluation on the held-out transcripts.
+    """
+    if data_dir is None:
+        data_dir = default_data_dir()
+    transcripts_path = transcripts_path or os.path.join(data_dir, 'call_transcripts.csv')
+    labels_path = labels_path or os.path.join(data_dir, LABELS_FILE)
+    model_path = model_path or os.path.join(data_dir, MODEL_FILE)
+
+    classifier = ConversationClassifier(bits=bits)
+    label_index = {label: i for i, label in enumerate(classifier.labels)}
+    examples = list(iter_labeled(transcripts_path, labels_path))
+    training = [example for example in examples if example[0] % HOLDOUT_EVERY]
+    holdout = [example for example in examples if not example[0] % HOLDOUT_EVERY]
+
+    started = time.perf_counter()
+    batches = [(hashed_features([text for _, text, _ in batch], bits), len(batch),
+                np.array([label_index[label] for _, _, label in batch]))
+               for batch in iter_batches(training, TRAINING_BATCH_SIZE)]
+    classifier.fit(batches, epochs)
+    elapsed = time.perf_counter() - started
+    classifier.save(model_path)
+    result = evaluate(classifier, holdout, batch_size)
+
+    if verbose:
+        print(f"Trained on {len(training)} transcripts ({epochs} epochs) in {elapsed:.2f}s -> {model_path}")
+        report_evaluation(result, "held-out transcripts")
+    return classifier, result
+
+
+def report_evaluation(result, description):
+    print(f"\n📊 Accuracy on {result['rows']} {description}: {result['accuracy'] * 100:.1f}%")
+    for label, accuracy in result['by_label'].items():
+        print(f"  {label}: {accuracy * 100:.1f}%")
+    print(f"⏱ Classified {result['rows']} transcripts in {result['seconds']:.2f}s ({result['rows_per_sec']:,.0f} rows/sec)")
+
+
+def main():
+    """Command line interface"""
+    parser = argparse.ArgumentParser(description="Train and evaluate a local stand-in for AI_CLASSIFY on the generated ground-truth labels")
+    parser.add_argument('--data-dir', default=None, help="Directory holding call_transcripts.csv and transcript_labels.csv (defaults to data/)")
+    parser.add_argument('--transcripts', default=None, help="Transcripts CSV (defaults to call_transcripts.csv in the data directory)")
+    parser.add_argument('--labels', default=None, help=f"Ground-truth labels CSV (defaults to {LABELS_FILE} in the data directory)")
+    parser.add_argument('--model', default=None, help=f"Model file to write, or read with --evaluate (defaults to {MODEL_FILE} in the data directory)")
+    parser.add_argument('--epochs', type=int, default=EPOCHS, help="Passes over the training transcripts")
+    parser.add_argument('--bits', type=int, default=FEATURE_BITS, help="Hash n-grams into 2^BITS features")
+    parser.add_argument('--batch-size', type=int, default=1000, help="Transcripts classified per batch")
+    parser.add_argument('--evaluate', action='store_true',
+                        help="Score an existing model against every labeled transcript instead of training")
+    args = parser.parse_args()
+
+    if not args.evaluate:
+        train_classifier(data_dir=args.data_dir, transcripts_path=args.transcripts, labels_path=args.labels,
+                         model_path=args.model, epochs=args.epochs, bits=args.bits, batch_size=args.batch_size)
+        return
+
+    data_dir = args.data_dir or default_data_dir()
+    classifier = ConversationClassifier.load(args.model or os.path.join(data_dir, MODEL_FILE))
+    examples = iter_labeled(args.transcripts or os.path.join(data_dir, 'call_transcripts.csv'),
+                            args.labels or os.path.join(data_dir, LABELS_FILE))
+    report_evaluation(evaluate(classifier, examples, args.batch_size), "labeled transcripts")
+
+if __name__ == "__main__":
+    main()
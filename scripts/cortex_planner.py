@@ -0,0 +1,312 @@
+import argparse
+import glob
+import os
+import re
+import sys
+import textwrap
+
+# Cortex functions evaluated once per row (aggregates such as AI_AGG can't move into a per-row CTE)
+ROW_FUNCTIONS = [
+    'SENTIMENT', 'AI_SENTIMENT', 'SUMMARIZE', 'AI_CLASSIFY', 'CLASSIFY_TEXT', 'AI_FILTER', 'COMPLETE',
+    'AI_COMPLETE', 'TRANSLATE', 'EXTRACT_ANSWER', 'EMBED_TEXT_768', 'EMBED_TEXT_1024'
+]
+CALL_PATTERN = re.compile(r'\b(?:SNOWFLAKE\.CORTEX\.)?(' + '|'.join(ROW_FUNCTIONS) + r')\s*\(', re.IGNORECASE)
+SELECT_PATTERN = re.compile(r'\bSELECT\b', re.IGNORECASE)
+FROM_PATTERN = re.compile(r'\bFROM\s+([\w.]+)(?:\s+(?:AS\s+)?(\w+))?', re.IGNORECASE)
+LITERAL_OR_SPACE_PATTERN = re.compile(r"'(?:[^']|'')*'|\s+")
+QUALIFIER_PATTERN = re.compile(r'\b(\w+)\.\w+')
+TAIL_PATTERN = re.compile(r'\b(JOIN|WHERE|GROUP|HAVING|QUALIFY|LIMIT|UNION)\b', re.IGNORECASE)
+UNSUPPORTED_TAIL_PATTERN = re.compile(r'\b(GROUP\s+BY|HAVING|QUALIFY|UNION)\b', re.IGNORECASE)
+ALIAS_PATTERN = re.compile(r'\bAS\s+(\w+)\s*$', re.IGNORECASE)
+
+# Unique key of each table a query can start from (the primary keys in snowflake_setup.sql). Rows are
+# narrowed by key, so a one-to-many join can't repeat them in the CTE
+TABLE_KEYS = {
+    'ZENDESK_CUSTOMERS': 'customer_id',
+    'ZENDESK_EMPLOYEES': 'employee_id',
+    'ZENDESK_TICKETS': 'ticket_id',
+    'CALL_TRANSCRIPTS': 'ticket_id',
+    'TICKET_METRICS': 'ticket_id',
+    'ENRICHED_CALL_TRANSCRIPTS': 'transcript_id'
+}
+KEYWORDS = {'JOIN', 'LEFT', 'RIGHT', 'INNER', 'FULL', 'CROSS', 'NATURAL', 'WHERE', 'GROUP', 'ORDER', 'HAVING',
+            'QUALIFY', 'LIMIT', 'UNION', 'ON', 'USING'}
+
+SELECTED_CTE = 'selected_rows'
+CALLS_CTE = 'cortex_calls'
+
+
+def blank_literals(sql):
+    """The SQL with comments and string literals replaced by spaces (same length, newlines kept)
+
+    Searches run on this so that keywords, parentheses and semicolons inside
+    strings or comments are ignored, while positions still index the original.
+    """
+    out = list(sql)
+    i = 0
+    while i < len(sql):
+        if sql.startswith('--', i):
+            end = sql.find('\n', i)
+            end = len(sql) if end == -1 else end
+        elif sql.startswith('/*', i):
+            end = sql.find('*/', i + 2)
+            end = len(sql) if end == -1 else end + 2
+        elif sql[i] == "'":
+            end = i + 1
+            while end < len(sql):
+                if sql[end] == "'" and sql.startswith("''", end):
+                    end += 2
+                elif sql[end] == "'":
+                    end += 1
+                    break
+                else:
+                    end += 1
+        else:
+            i += 1
+            continue
+        for j in range(i, end):
+            if out[j] != '\n':
+                out[j] = ' '
+        i = end
+    return ''.join(out)
+
+
+def squeeze(text):
+    """Collapse whitespace outside string literals (none just inside brackets), so equal calls compare equal"""
+    def replace(match):
+        token = match.group(0)
+        if token.startswith("'"):
+            return token
+        if match.start() > 0 and text[match.start() - 1] in '([':
+            return ''
+        if match.end() < len(text) and text[match.end()] in ')]':
+            return ''
+        return ' '
+    return LITERAL_OR_SPACE_PATTERN.sub(replace, text).strip()
+
+
+def split_statements(sql):
+    """(start, end) spans of each statement, ending before its semicolon"""
+    blanked = blank_literals(sql)
+    spans, start = [], 0
+    for match in re.finditer(';', blanked):
+        spans.append((start, match.start()))
+        start = match.end()
+    if blanked[start:].strip():
+        spans.append((start, len(sql)))
+    return spans
+
+
+def _top_level(blanked, pattern, start=0):
+    """First match of pattern at parenthesis depth 0"""
+    depth = 0
+    position = start
+    for match in pattern.finditer(blanked, start):
+        depth += blanked.count('(', position, match.start()) - blanked.count(')', position, match.start())
+        position = match.start()
+        if depth == 0:
+            return match
+    return None
+
+
+def find_calls(sql, blanked):
+    """Row-level Cortex calls as (function, normalized argument text, start, end)"""
+    calls = []
+    for match in CALL_PATTERN.finditer(blanked):
+        depth, end = 0, match.end() - 1
+        for end in range(match.end() - 1, len(blanked)):
+            if blanked[end] == '(':
+                depth += 1
+            elif blanked[end] == ')':
+                depth -= 1
+                if depth == 0:
+                    break
+        arguments = sql[match.end():end]
+        calls.append((match.group(1).upper(), squeeze(arguments), match.start(), end + 1))
+    return calls
+
+
+def plan_statement(sql):
+    """How a statement's Cortex calls dedup: calls per row before/after, plus the rewrite (or why none)"""
+    blanked = blank_literals(sql)
+    calls = find_calls(sql, blanked)
+    distinct = list(dict.fromkeys((name, arguments) for name, arguments, _, _ in calls))
+    code = re.search(r'\S', blanked)
+    plan = {'calls': len(calls), 'distinct': len(distinct), 'functions': {}, 'rewritten': None, 'note': None,
+            'offset': code.start() if code else 0}
+    for name, _ in distinct:
+        plan['functions'][name] = plan['functions'].get(name, 0)
+    for name, _, _, _ in calls:
+        plan['functions'][name] += 1
+    if len(calls) == len(distinct):
+        return plan
+
+    select = _top_level(blanked, SELECT_PATTERN)
+    source = _top_level(blanked, FROM_PATTERN, select.end()) if select else None
+    if source is None:
+        plan['note'] = "no top-level SELECT ... FROM to rewrite"
+        return plan
+    table, alias = source.group(1), source.group(2)
+    if alias is None or alias.upper() in KEYWORDS:
+        alias = table.split('.')[-1]
+    if any(start < source.start() <= end for _, _, start, end in calls) or any(start > source.start() for _, _, start, _ in calls):
+        plan['note'] = "Cortex calls outside the select list"
+        return plan
+    qualifiers = {q.lower() for _, arguments, _, _ in calls for q in QUALIFIER_PATTERN.findall(blank_literals(arguments))}
+    if qualifiers - {alias.lower()}:
+        plan['note'] = f"call arguments reference tables other than {alias}"
+        return plan
+    if re.search(r'\bWITH\b', blanked[:select.start()], re.IGNORECASE):
+        plan['note'] = "statement already has a WITH clause"
+        return plan
+
+    # Only a plain row-level query keeps its results when calls move into a CTE
+    tail = blanked[source.end():]
+    unsupported = _top_level(tail, UNSUPPORTED_TAIL_PATTERN)
+    if unsupported:
+        plan['note'] = f"{' '.join(unsupported.group(1).upper().split())} in the query"
+        return plan
+    call_aliases = {alias_name.lower() for alias_name in _call_aliases(blanked, calls, select, source)}
+    sorted_on = call_aliases & {word.lower() for word in re.findall(r'\w+', tail)}
+    if sorted_on:
+        plan['note'] = f"the query filters or sorts on a Cortex result ({', '.join(sorted(sorted_on))})"
+        return plan
+    if TAIL_PATTERN.search(tail) and table.split('.')[-1].upper() not in TABLE_KEYS:
+        plan['note'] = f"no known unique key for {table} to narrow rows by"
+        return plan
+
+    plan['rewritten'] = rewrite_statement(sql, blanked, calls, distinct, select, source, table, alias)
+    return plan
+
+
+def _call_aliases(blanked, calls, select, source):
+    """Output names of the select-list items that contain a Cortex call"""
+    items, depth, position = [], 0, select.end()
+    for i in range(select.end(), source.start()):
+        if blanked[i] == '(':
+            depth += 1
+        elif blanked[i] == ')':
+            depth -= 1
+        elif blanked[i] == ',' and depth == 0:
+            items.append((position, i))
+            position = i + 1
+    items.append((position, source.start()))
+    aliases = []
+    for start, end in items:
+        alias = ALIAS_PATTERN.search(blanked[start:end].rstrip())
+        if alias and any(start <= call_start < end for _, _, call_start, _ in calls):
+            aliases.append(alias.group(1))
+    return aliases
+
+
+def result_columns(distinct):
+    """Column name for each distinct call, e.g. sentiment_result, summarize_result_2"""
+    names, used = {}, {}
+    for name, arguments in distinct:
+        used[name] = used.get(name, 0) + 1
+        suffix = '' if used[name] == 1 else f'_{used[name]}'
+        names[(name, arguments)] = f'{name.lower()}_result{suffix}'
+    return names
+
+
+def rewrite_statement(sql, blanked, calls, distinct, select, source, table, alias):
+    """Move each distinct call into a CTE evaluated once per selected row, and read it from there"""
+    columns = result_columns(distinct)
+    first_call = {}
+    for name, arguments, start, end in calls:
+        first_call.setdefault((name, arguments), sql[start:end])
+
+    # Select list with every call replaced by the CTE column holding its result
+    select_list, position = [], select.start()
+    for name, arguments, start, end in calls:
+        select_list.append(sql[position:start])
+        select_list.append(f'{alias}.{columns[(name, arguments)]}')
+        position = end
+    select_list.append(sql[position:source.start()])
+
+    # The keys of the rows the query returns are found first, with its original joins, filters and
+    # limit, so calls are made once per base row that survives them (unless nothing but an ORDER BY
+    # follows the base table). The outer query then joins and filters as before.
+    tail = sql[source.end():]
+    narrowed = TAIL_PATTERN.search(blank_literals(tail)) is not None
+    base = sql[source.start() + 4:source.end()].strip()
+    ctes = []
+    if narrowed:
+        key_column = TABLE_KEYS[table.split('.')[-1].upper()]
+        narrowing = textwrap.indent(sql[source.start():].strip(), '    ')
+        ctes.append(f"{SELECTED_CTE} AS (\n    SELECT {alias}.{key_column}\n{narrowing}\n)")
+        calls_source = f"{base}\n    WHERE {alias}.{key_column} IN (SELECT {key_column} FROM {SELECTED_CTE})"
+    else:
+        calls_source = base
+    call_lines = ",\n".join(f"        {squeeze(text)} AS {columns[key]}" for key, text in first_call.items())
+    ctes.append(f"{CALLS_CTE} AS (\n    SELECT\n        {alias}.*,\n{call_lines}\n    FROM {calls_source}\n)")
+
+    prefix = sql[:select.start()]
+    body = ''.join(select_list) + f"FROM {CALLS_CTE} {alias}" + tail
+    return f"{prefix}WITH {(',' + chr(10)).join(ctes)}\n{body}"
+
+
+def plan_file(path):
+    """Plans for every statement in a SQL file, with the file's text rewritten where calls repeat"""
+    with open(path) as f:
+        sql = f.read()
+    pieces, plans, position = [], [], 0
+    for start, end in split_statements(sql):
+        plan = plan_statement(sql[start:end])
+        plan['line'] = sql.count('\n', 0, start + plan['offset']) + 1
+        plans.append(plan)
+        pieces.append(sql[position:start])
+        pieces.append(plan['rewritten'] or sql[start:end])
+        position = end
+    pieces.append(sql[position:])
+    return plans, ''.join(pieces)
+
+
+def report_file(path, plans):
+    with_calls = [plan for plan in plans if plan['calls']]
+    if not with_calls:
+        return 0
+    print(f"📁 {path}")
+    removed = 0
+    for plan in with_calls:
+        saved = plan['calls'] - plan['distinct'] if plan['rewritten'] else 0
+        removed += saved
+        functions = ', '.join(f"{name} x{count}" for name, count in plan['functions'].items())
+        if plan['rewritten']:
+            status = f"{plan['calls']} -> {plan['distinct']} calls per row ({saved} removed)"
+        elif plan['calls'] == plan['distinct']:
+            status = f"{plan['calls']} calls per row, no repeats"
+        else:
+            status = f"{plan['calls']} calls per row, not rewritten: {plan['note']}"
+        print(f"  line {plan['line']}: {status} [{functions}]")
+    return removed
+
+
+def main():
+    """Command line interface"""
+    parser = argparse.ArgumentParser(description="Find repeated Cortex calls in SQL files and rewrite them to run once per row")
+    parser.add_argument('paths', nargs='*', help="SQL files to plan (defaults to queries/*.sql)")
+    parser.add_argument('--write', default=None, metavar='DIR',
+                        help="Write each file, with repeated calls moved into a CTE, to this directory")
+    args = parser.parse_args()
+
+    paths = args.paths or sorted(glob.glob(os.path.join(os.path.dirname(__file__), '..', 'queries', '*.sql')))
+    if not paths:
+        print("No SQL files found")
+        sys.exit(1)
+    if args.write:
+        os.makedirs(args.write, exist_ok=True)
+
+    total_removed = 0
+    for path in paths:
+        plans, rewritten = plan_file(path)
+        total_removed += report_file(os.path.normpath(path), plans)
+        if args.write and any(plan['rewritten'] for plan in plans):
+            output_path = os.path.join(args.write, os.path.basename(path))
+            with open(output_path, 'w') as f:
+                f.write(rewritten)
+            print(f"  Wrote {output_path}")
+    print(f"\n✅ {total_removed} Cortex calls per row removed")
+
+if __name__ == "__main__":
+    main()
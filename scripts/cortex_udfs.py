@@ -0,0 +1,133 @@
+import collections
+import hashlib
+import json
+import os
+
+from conversation_classifier import hashed_features, load_classifier
+from enrichment_cache import CONVERSATION_CATEGORIES, EnrichmentCache, text_hash
+from offline_cortex import sentiment, summarize
+
+# Offline results are kept apart from enrichment_cache.csv, which records what Cortex has actually been paid for
+OFFLINE_CACHE_FILE = 'offline_cortex_cache.csv'
+OFFLINE_VERSION = 'offline-v1'
+
+# Distinct texts remembered per function; repeats within a row or query are almost always recent
+MEMO_SIZE = 16384
+
+
+class MemoizedFunction:
+    """A Cortex stand-in registered as a SQLite function, memoized by text hash
+
+    Results are looked up in an in-memory LRU, then in the on-disk cache (when
+    the call is one the cache can hold), and only computed on a miss. Counts
+    of each outcome give the hit rate. Calls are SQLite's calls, which depend
+    on its plan (an ORDER BY ... LIMIT sorter calls for rows it then drops), so
+    they measure local work, not what Cortex would be billed for.
+    """
+
+    def __init__(self, name, compute, version, cache=None, cacheable=None, encode=None, maxsize=MEMO_SIZE):
+        self.name = name
+        self.compute = compute
+        self.version = version
+        self.cache = cache
+        self.cacheable = cacheable or (lambda *args: True)
+        self.encode = encode or (lambda result: result)
+        self.maxsize = maxsize
+        self.memo = collections.OrderedDict()
+        self.calls = self.memo_hits = self.cache_hits = self.evaluations = 0
+
+    def __call__(self, text, *args):
+        if text is None:
+            return None
+        self.calls += 1
+        digest = text_hash(text)
+        key = (digest,) + args
+        if key in self.memo:
+            self.memo_hits += 1
+            self.memo.move_to_end(key)
+            return self.memo[key]
+
+        use_cache = self.cache is not None and self.cacheable(*args)
+        result = self.cache.get(digest, self.name, self.version) if use_cache else None
+        if result is not None:
+            self.cache_hits += 1
+        else:
+            self.evaluations += 1
+            result = self.compute(text, *args)
+            if use_cache:
+                self.cache.put(digest, self.name, self.version, result)
+
+        value = self.memo[key] = self.encode(result)
+        if len(self.memo) > self.maxsize:
+            self.memo.popitem(last=False)
+        return value
+
+    def stats(self):
+        hits = self.memo_hits + self.cache_hits
+        return {
+            'calls': self.calls,
+            'memo_hits': self.memo_hits,
+            'cache_hits': self.cache_hits,
+            'evaluations': self.evaluations,
+            'hit_rate': hits / self.calls if self.calls else 0.0
+        }
+
+
+def classifier_version(classifier_path):
+    """Model version for AI_CLASSIFY results, so retraining the classifier invalidates them"""
+    if not classifier_path or not os.path.exists(classifier_path):
+        return f"{OFFLINE_VERSION}-unclassified"
+    with open(classifier_path, 'rb') as f:
+        return f"{OFFLINE_VERSION}-{hashlib.sha256(f.read()).hexdigest()[:12]}"
+
+
+def register_cortex_functions(conn, classifier_path=None, cache=None):
+    """Register memoized SENTIMENT, AI_CLASSIFY and SUMMARIZE stand-ins on a SQLite connection
+
+    AI_CLASSIFY returns Cortex's {"labels": [...]} JSON, picking the classifier's
+    best label among the categories passed in; without a saved classifier the
+    labels are empty. Only calls with the standard conversation categories
+    go to the on-disk cache. Returns the functions, whose stats() give hit rates.
+    """
+    classifier = load_classifier(classifier_path) if classifier_path and os.path.exists(classifier_path) else None
+    standard_categories = json.dumps(CONVERSATION_CATEGORIES)
+
+    def ai_classify(text, categories):
+        allowed = set(json.loads(categories))
+        labels = []
+        if classifier is not None:
+            scores = classifier.scores(hashed_features([text], classifier.bits), 1)[0]
+            ranked = [classifier.labels[i] for i in scores.argsort()[::-1]]
+            labels = [label for label in ranked if label in allowed][:1]
+        return {'labels': labels}
+
+    functions = [
+        MemoizedFunction('SENTIMENT', sentiment, OFFLINE_VERSION, cache),
+        MemoizedFunction('AI_CLASSIFY', ai_classify, classifier_version(classifier_path), cache,
+                         cacheable=lambda categories: json.dumps(json.loads(categories)) == standard_categories,
+                         encode=json.dumps),
+        MemoizedFunction('SUMMARIZE', summarize, OFFLINE_VERSION, cache)
+    ]
+    for function in functions:
+        # Deterministic lets SQLite use the functions in indexes and factor them out of loops
+        conn.create_function(function.name, 2 if function.name == 'AI_CLASSIFY' else 1, function, deterministic=True)
+    return functions
+
+
+def open_offline_cache(data_dir, path=None):
+    """The on-disk store for offline results (see enrichment_cache.EnrichmentCache)"""
+    return EnrichmentCache(path or os.path.join(data_dir, OFFLINE_CACHE_FILE))
+
+
+def report_hit_rates(functions):
+    """Calls SQLite made to each stand-in and how many were evaluated locally rather than served from memo or cache"""
+    print("\n📊 Local Cortex stand-in calls by function (as SQLite executed the queries, not Cortex billing)")
+    calls = evaluations = 0
+    for function in functions:
+        stats = function.stats()
+        calls += stats['calls']
+        evaluations += stats['evaluations']
+        print(f"  {function.name} {function.version}: {stats['calls']} calls, {stats['evaluations']} local evaluations, "
+              f"{stats['memo_hits']} memo hits, {stats['cache_hits']} cache hits ({stats['hit_rate'] * 100:.1f}% hit rate)")
+    if calls:
+        print(f"  {evaluations} local evaluations for {calls} calls ({(calls - evaluations) / calls * 100:.1f}% served from memo or cache)")
@@ -1,9 +1,220 @@
 import csv
+import gzip
+import itertools
 import json
+import math
+import random
+import re
 import sys
+from functools import lru_cache
 from pathlib import Path
 
-def csv_to_json(csv_file_path, json_file_path=None, pretty=True, sample_size=None):
+# Column types, in the order inference tries them (the first type every sampled value fits wins)
+COLUMN_TYPES = ('int', 'float', 'bool', 'timestamp', 'json_array', 'string')
+
+INT_PATTERN = re.compile(r'-?(0|[1-9][0-9]*)')  # no leading zeros, so ZIP codes like 02134 stay strings
+FLOAT_PATTERN = re.compile(r'-?(0|[1-9][0-9]*)(\.[0-9]+)?')
+TIMESTAMP_PATTERN = re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2}( [0-9]{2}:[0-9]{2}:[0-9]{2})?')
+
+def _is_json_array(value):
+    if not value.startswith('['):
+        return False
+    try:
+        return isinstance(json.loads(value), list)
+    except ValueError:
+        return False
+
+TYPE_CHECKS = {
+    'int': INT_PATTERN.fullmatch,
+    'float': FLOAT_PATTERN.fullmatch,
+    'bool': lambda value: value in ('True', 'False'),
+    'timestamp': TIMESTAMP_PATTERN.fullmatch,
+    'json_array': _is_json_array,
+    'string': lambda value: True
+}
+
+def _invalid(column_type, value):
+    raise ValueError(f"not a {column_type}: {value!r}")
+
+@lru_cache(maxsize=4096)
+def _parse_array(value):
+    return tuple(json.loads(value))
+
+_is_timestamp = TIMESTAMP_PATTERN.fullmatch
+_BOOLEANS = {'True': True, 'False': False}
+
+# Value converter per column type. Blank values become None (except in string
+# columns), timestamps keep their 'YYYY-MM-DD HH:MM:SS' text, and JSON arrays
+# are parsed once per distinct value (tags and permissions repeat heavily).
+CONVERTERS = {
+    'int': lambda value: int(value) if value else None,
+    'float': lambda value: float(value) if value else None,
+    'bool': lambda value: _BOOLEANS[value] if value else None,
+    'timestamp': lambda value: (value if _is_timestamp(value) else _invalid('timestamp', value)) if value else None,
+    'json_array': lambda value: list(_parse_array(value)) if value else None,
+    'string': str
+}
+
+def infer_schema(csv_file_path, sample_rows=1000):
+    """
+    Infer each column's type from the first sample_rows rows
+    
+    Returns:
+        dict: {column: type} with types from COLUMN_TYPES (all-blank columns are 'string')
+    """
+    with open(csv_file_path, 'r', encoding='utf-8', newline='') as csvfile:
+        reader = csv.reader(csvfile)
+        fieldnames = next(reader)
+        candidates = [list(COLUMN_TYPES) for _ in fieldnames]
+        for i, row in enumerate(reader):
+            if i >= sample_rows:
+                break
+            for column, value in enumerate(row):
+                if value != '':
+                    candidates[column] = [t for t in candidates[column] if TYPE_CHECKS[t](value)]
+    return {field: types[0] for field, types in zip(fieldnames, candidates)}
+
+def load_schema(schema):
+    """Read a {column: type} schema from a JSON file (or pass a dict through) and check its types"""
+    if not isinstance(schema, dict):
+        with open(schema, 'r', encoding='utf-8') as f:
+            schema = json.load(f)
+    unknown = {column: t for column, t in schema.items() if t not in CONVERTERS}
+    if unknown:
+        raise ValueError(f"Unknown column types {unknown}; expected one of {', '.join(COLUMN_TYPES)}")
+    return schema
+
+def resolve_schema(csv_path, schema=None, infer_rows=1000):
+    """Inferred schema, with any explicitly given column types taking precedence"""
+    resolved = infer_schema(csv_path, infer_rows)
+    if schema is not None:
+        resolved.update((column, t) for column, t in load_schema(schema).items() if column in resolved)
+    return resolved
+
+def compile_converters(fieldnames, schema):
+    """
+    Build a function that turns a CSV row (list of strings) into a typed record
+    
+    Each column's converter is fixed once, so conversion is one positional pass
+    per row. A value that does not fit its column type raises ValueError.
+    """
+    converters = tuple(CONVERTERS[schema.get(field, 'string')] for field in fieldnames)
+    
+    def convert(values):
+        try:
+            return dict(zip(fieldnames, [c(v) for c, v in zip(converters, values)]))
+        except (ValueError, KeyError):
+            for field, c, v in zip(fieldnames, converters, values):
+                try:
+                    c(v)
+                except (ValueError, KeyError):
+                    raise ValueError(f"Value {v!r} in column {field!r} does not match its type "
+                                     f"{schema.get(field, 'string')!r} (pass a schema file or a larger --infer-rows)")
+            raise
+    return convert
+
+SAMPLE_METHODS = ('reservoir', 'stratified', 'head')
+
+def _open_uniform(rng):
+    """Uniform draw in (0, 1), safe to take the log of"""
+    u = rng.random()
+    while u == 0.0:
+        u = rng.random()
+    return u
+
+def reservoir_sample(rows, k, rng):
+    """
+    Uniform random sample of k items from an iterable of unknown length, in one pass
+    
+    Algorithm L: after the reservoir fills, the number of items to skip before the
+    next replacement is drawn directly, so random draws grow with k*log(n/k), not n.
+    Returns ((position, item) pairs, number of items read).
+    """
+    # zip pulls a position before each item, so once rows run out the counter is one past the total
+    positions = itertools.count()
+    items = zip(positions, rows)
+    reservoir = list(itertools.islice(items, k))
+    if len(reservoir) < k:
+        return reservoir, len(reservoir)
+    w = math.exp(math.log(_open_uniform(rng)) / k)
+    while True:
+        skip = math.floor(math.log(_open_uniform(rng)) / math.log1p(-w))
+        item = next(itertools.islice(items, skip, None), None)
+        if item is None:
+            return reservoir, next(positions) - 1
+        reservoir[rng.randrange(k)] = item
+        w *= math.exp(math.log(_open_uniform(rng)) / k)
+
+def allocate_proportional(counts, k):
+    """Split k across strata in proportion to their counts (largest remainder, summing to min(k, total))"""
+    total = sum(counts.values())
+    k = min(k, total)
+    if not total:
+        return {}
+    quotas = {key: k * n / total for key, n in counts.items()}
+    allocation = {key: int(q) for key, q in quotas.items()}
+    remaining = k - sum(allocation.values())
+    for key in sorted(quotas, key=lambda key: quotas[key] - allocation[key], reverse=True)[:remaining]:
+        allocation[key] += 1
+    return allocation
+
+def stratified_sample(rows, k, column, rng):
+    """
+    Sample k rows with each value of `column` represented in proportion to its frequency, in one pass
+    
+    Each stratum keeps its own reservoir of up to k rows (Algorithm R), so memory is
+    bounded by k times the number of strata. Once the file is read, each reservoir
+    is subsampled to its proportional share. Returns ((position, row) pairs, stratum counts).
+    """
+    reservoirs = {}
+    counts = {}
+    for position, row in enumerate(rows):
+        key = row[column]
+        n = counts.get(key, 0) + 1
+        counts[key] = n
+        if n <= k:
+            reservoirs.setdefault(key, []).append((position, row))
+        else:
+            j = rng.randrange(n)
+            if j < k:
+                reservoirs[key][j] = (position, row)
+    sample = []
+    for key, share in allocate_proportional(counts, k).items():
+        sample += rng.sample(reservoirs[key], share)
+    return sample, counts
+
+def read_records(csvfile, schema, sample_size=None, sample_method='reservoir', stratify_by=None, seed=None):
+    """
+    Return the header, an iterator of typed records and a description of the rows read
+    
+    Without sample_size every row is converted lazily. 'head' takes the first
+    sample_size rows; 'reservoir' and 'stratified' (by the stratify_by column) read
+    the whole file once and convert only the sampled rows, returned in file order.
+    """
+    if sample_method not in SAMPLE_METHODS:
+        raise ValueError(f"sample_method must be one of {', '.join(SAMPLE_METHODS)}, not {sample_method!r}")
+    reader = csv.reader(csvfile)
+    fieldnames = next(reader)
+    convert = compile_converters(fieldnames, schema)
+    if not sample_size:
+        return fieldnames, map(convert, reader), {}
+    if sample_method == 'head':
+        return fieldnames, map(convert, itertools.islice(reader, sample_size)), {}
+    
+    rng = random.Random(seed)
+    if sample_method == 'stratified':
+        if stratify_by not in fieldnames:
+            raise ValueError(f"Stratified sampling needs a column to stratify by; {stratify_by!r} is not in {fieldnames}")
+        sample, counts = stratified_sample(reader, sample_size, fieldnames.index(stratify_by), rng)
+        population = {"records": sum(counts.values()), "stratified_by": stratify_by, "strata": counts}
+    else:
+        sample, total = reservoir_sample(reader, sample_size, rng)
+        population = {"records": total}
+    sample.sort(key=lambda item: item[0])
+    return fieldnames, (convert(row) for _, row in sample), population
+
+def csv_to_json(csv_file_path, json_file_path=None, pretty=True, sample_size=None, schema=None, infer_rows=1000,
+                sample_method='reservoir', stratify_by=None, seed=None):
     """
     Convert CSV file to JSON format
     
@@ -12,6 +223,11 @@ def csv_to_json(csv_file_path, json_file_path=None, pretty=True, sample_size=Non
         json_file_path (str, optional): Path for output JSON file. If None, replaces .csv with .json
         pretty (bool): Whether to format JSON with indentation
         sample_size (int, optional): Number of records to include (for large files)
+        schema (dict or str, optional): {column: type} or a JSON file of it; overrides inferred types
+        infer_rows (int): Rows sampled to infer column types
+        sample_method (str): 'reservoir' (uniform), 'stratified' (proportional by stratify_by) or 'head' (first rows)
+        stratify_by (str, optional): Column to stratify on, e.g. 'organization_type' or 'priority'
+        seed (int, optional): Seed for reproducible samples
     
     Returns:
         dict: JSON data with metadata
@@ -27,30 +243,11 @@ def csv_to_json(csv_file_path, json_file_path=None, pretty=True, sample_size=Non
     else:
         json_path = Path(json_file_path)
     
-    # Read CSV data
-    records = []
-    with open(csv_path, 'r', encoding='utf-8') as csvfile:
-        reader = csv.DictReader(csvfile)
-        fieldnames = reader.fieldnames
-        
-        for i, row in enumerate(reader):
-            # Convert numeric fields
-            for key, value in row.items():
-                if value.isdigit():
-                    row[key] = int(value)
-                elif key == 'monthly_revenue' and value.replace('.', '').isdigit():
-                    row[key] = float(value)
-                elif key == 'payment_methods' and value.startswith('['):
-                    try:
-                        row[key] = json.loads(value)
-                    except:
-                        pass  # Keep as string if parsing fails
-            
-            records.append(row)
-            
-            # Limit records if sample_size specified
-            if sample_size and i + 1 >= sample_size:
-                break
+    # Read CSV data, converting each column with its schema type
+    schema = resolve_schema(csv_path, schema, infer_rows)
+    with open(csv_path, 'r', encoding='utf-8', newline='') as csvfile:
+        fieldnames, rows, population = read_records(csvfile, schema, sample_size, sample_method, stratify_by, seed)
+        records = list(rows)
     
     # Create JSON structure with metadata
     json_data = {
@@ -59,6 +256,9 @@ def csv_to_json(csv_file_path, json_file_path=None, pretty=True, sample_size=Non
             "total_records": len(records),
             "fields": fieldnames,
             "sample_size": sample_size if sample_size else len(records),
+            "sample_method": sample_method if sample_size else None,
+            "population": population,
+            "schema": schema,
             "organization_types": {}
         },
         "records": records
@@ -86,26 +286,152 @@ def csv_to_json(csv_file_path, json_file_path=None, pretty=True, sample_size=Non
     
     return json_data
 
+def csv_to_ndjson(csv_file_path, ndjson_file_path=None, compress=False, metadata='sidecar', sample_size=None,
+                  schema=None, infer_rows=1000, sample_method='reservoir', stratify_by=None, seed=None):
+    """
+    Stream a CSV file to newline-delimited JSON, one record per line, in constant memory
+    
+    Rows are converted and written as they are read, so only the metadata counters
+    are kept. Each line is a standalone JSON object, loadable as a Snowflake VARIANT
+    with FILE_FORMAT = (TYPE = 'JSON').
+    
+    Args:
+        csv_file_path (str): Path to the CSV file
+        ndjson_file_path (str, optional): Output path. If None, replaces .csv with .ndjson (.ndjson.gz when compressed)
+        compress (bool): Whether to gzip the output
+        metadata (str): 'sidecar' writes it to <output>.meta.json, 'trailer' appends it as a final
+            {"_metadata": {...}} line
+        sample_size (int, optional): Number of records to include (memory is then bounded by the sample)
+        schema (dict or str, optional): {column: type} or a JSON file of it; overrides inferred types
+        infer_rows (int): Rows sampled to infer column types
+        sample_method (str): 'reservoir', 'stratified' or 'head', as in csv_to_json()
+        stratify_by (str, optional): Column to stratify on
+        seed (int, optional): Seed for reproducible samples
+    
+    Returns:
+        dict: The metadata
+    """
+    
+    csv_path = Path(csv_file_path)
+    if not csv_path.exists():
+        raise FileNotFoundError(f"CSV file not found: {csv_file_path}")
+    if metadata not in ('sidecar', 'trailer'):
+        raise ValueError(f"metadata must be 'sidecar' or 'trailer', not {metadata!r}")
+    
+    # Determine output path
+    if ndjson_file_path is None:
+        ndjson_path = csv_path.with_suffix('.ndjson.gz' if compress else '.ndjson')
+    else:
+        ndjson_path = Path(ndjson_file_path)
+    
+    schema = resolve_schema(csv_path, schema, infer_rows)
+    total_records = 0
+    org_types = {}
+    
+    # Rows go to a temporary file that only replaces the output once every row has
+    # converted, so a failure part way through never leaves a truncated file behind
+    tmp_path = ndjson_path.with_name(ndjson_path.name + '.tmp')
+    if compress:
+        out_file = gzip.open(tmp_path, 'wt', compresslevel=6, encoding='utf-8')
+    else:
+        out_file = open(tmp_path, 'w', encoding='utf-8')
+    try:
+        with open(csv_path, 'r', encoding='utf-8', newline='') as csvfile, out_file as out:
+            fieldnames, rows, population = read_records(csvfile, schema, sample_size, sample_method, stratify_by, seed)
+            for row in rows:
+                if 'organization_type' in row:
+                    org_type = row['organization_type']
+                    org_types[org_type] = org_types.get(org_type, 0) + 1
+                out.write(json.dumps(row, ensure_ascii=False))
+                out.write('\n')
+                total_records += 1
+            
+            meta = {
+                "source_file": str(csv_path),
+                "total_records": total_records,
+                "fields": fieldnames,
+                "sample_size": sample_size if sample_size else total_records,
+                "sample_method": sample_method if sample_size else None,
+                "population": population,
+                "schema": schema,
+                "organization_types": org_types
+            }
+            if metadata == 'trailer':
+                out.write(json.dumps({"_metadata": meta}, ensure_ascii=False))
+                out.write('\n')
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    tmp_path.replace(ndjson_path)
+    
+    if metadata == 'sidecar':
+        meta_path = Path(str(ndjson_path).removesuffix('.gz').removesuffix('.ndjson') + '.meta.json')
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2, ensure_ascii=False)
+    
+    print(f"✅ Streamed {total_records} records from CSV to NDJSON")
+    print(f"📁 Input:  {csv_path}")
+    print(f"📁 Output: {ndjson_path}" + (f" (metadata in {meta_path.name})" if metadata == 'sidecar' else ""))
+    print(f"📊 Organization distribution: {org_types}")
+    
+    return meta
+
 def main():
     """Command line interface"""
     if len(sys.argv) < 2:
-        print("Usage: python csv_to_json.py <csv_file> [json_file] [--sample=N]")
+        print("Usage: python csv_to_json.py <csv_file> [json_file] [--sample=N] [--ndjson [--gzip] [--trailer]]")
+        print("                             [--schema=schema.json] [--infer-rows=N] [--write-schema=schema.json]")
+        print("                             [--sample-method=reservoir|stratified|head] [--stratify=column] [--seed=N]")
         print("Example: python csv_to_json.py ZENDESK_customers.csv --sample=10")
+        print("Example: python csv_to_json.py zendesk_tickets.csv --sample=500 --stratify=priority --seed=42")
+        print("Example: python csv_to_json.py call_transcripts.csv --ndjson --gzip")
         return
     
     csv_file = sys.argv[1]
     json_file = sys.argv[2] if len(sys.argv) > 2 and not sys.argv[2].startswith('--') else None
     
-    # Parse sample size
+    # Parse sample size and schema options
     sample_size = None
+    schema = None
+    infer_rows = 1000
+    write_schema = None
+    sample_method = 'reservoir'
+    stratify_by = None
+    seed = None
     for arg in sys.argv:
         if arg.startswith('--sample='):
             sample_size = int(arg.split('=')[1])
+        elif arg.startswith('--schema='):
+            schema = arg.split('=', 1)[1]
+        elif arg.startswith('--infer-rows='):
+            infer_rows = int(arg.split('=')[1])
+        elif arg.startswith('--write-schema='):
+            write_schema = arg.split('=', 1)[1]
+        elif arg.startswith('--sample-method='):
+            sample_method = arg.split('=', 1)[1]
+        elif arg.startswith('--stratify='):
+            stratify_by = arg.split('=', 1)[1]
+            sample_method = 'stratified'
+        elif arg.startswith('--seed='):
+            seed = int(arg.split('=')[1])
     
     try:
-        csv_to_json(csv_file, json_file, sample_size=sample_size)
+        if '--ndjson' in sys.argv:
+            metadata = csv_to_ndjson(csv_file, json_file, compress='--gzip' in sys.argv,
+                                     metadata='trailer' if '--trailer' in sys.argv else 'sidecar',
+                                     sample_size=sample_size, schema=schema, infer_rows=infer_rows,
+                                     sample_method=sample_method, stratify_by=stratify_by, seed=seed)
+        else:
+            metadata = csv_to_json(csv_file, json_file, sample_size=sample_size, schema=schema,
+                                   infer_rows=infer_rows, sample_method=sample_method,
+                                   stratify_by=stratify_by, seed=seed)["metadata"]
+        if write_schema:
+            with open(write_schema, 'w', encoding='utf-8') as f:
+                json.dump(metadata["schema"], f, indent=2)
+            print(f"📁 Schema: {write_schema}")
     except Exception as e:
         print(f"❌ Error: {e}")
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,322 @@
+import argparse
+import csv
+import hashlib
+import json
+import os
+
+from table_io import default_data_dir, iter_csv_table
+
+CACHE_FILE = 'enrichment_cache.csv'
+CACHE_TABLE = 'CORTEX_ENRICHMENT_CACHE'
+CACHE_COLUMNS = ['text_hash', 'function_name', 'model_version', 'result']
+ENRICHED_TABLE = 'ENRICHED_CALL_TRANSCRIPTS'
+
+# Labels AI_CLASSIFY picks conversation categories from (same list as transcripts_enriched.sql)
+CONVERSATION_CATEGORIES = [
+    'Payment Processing Issues',
+    'Integration and Technical Support',
+    'Training and User Education',
+    'Feature Requests and Enhancements',
+    'Account Management and Billing'
+]
+
+# Cortex calls made per transcript, keyed by function name. Bump a version to
+# re-enrich everything with that function (e.g. after a model change); cached
+# results for other versions are kept but no longer used.
+ENRICHMENT_FUNCTIONS = {
+    'SENTIMENT': {
+        'call': "SNOWFLAKE.CORTEX.SENTIMENT({text})",
+        'version': 'v1'
+    },
+    'AI_CLASSIFY': {
+        'call': "SNOWFLAKE.CORTEX.AI_CLASSIFY({text}, [" + ", ".join(f"'{c}'" for c in CONVERSATION_CATEGORIES) + "])",
+        'version': 'v1'
+    },
+    'SUMMARIZE': {
+        'call': "SNOWFLAKE.CORTEX.SUMMARIZE({text})",
+        'version': 'v1'
+    }
+}
+
+
+def text_hash(text):
+    """Hex SHA-256 of the UTF-8 text, the same value as SHA2(text, 256) in Snowflake"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def function_versions(overrides=None):
+    """{function: model version}, with any overrides applied"""
+    versions = {name: spec['version'] for name, spec in ENRICHMENT_FUNCTIONS.items()}
+    for name, version in (overrides or {}).items():
+        if name not in versions:
+            raise ValueError(f"Unknown enrichment function {name!r}, expected one of {', '.join(versions)}")
+        versions[name] = version
+    return versions
+
+
+class EnrichmentCache:
+    """Cortex results keyed by (text hash, function, model version), stored as a CSV
+
+    Results are kept as JSON text, the same form as the VARIANT column of
+    CORTEX_ENRICHMENT_CACHE, so the file and an export of that table can be
+    exchanged. New entries are appended on save; existing ones are never rewritten.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.results = {}
+        self.unsaved = []
+        if os.path.exists(path):
+            for row in iter_csv_table(path):
+                self.results[(row['text_hash'], row['function_name'], row['model_version'])] = row['result']
+
+    def __len__(self):
+        return len(self.results)
+
+    def __contains__(self, key):
+        return key in self.results
+
+    def get(self, text_hash, function_name, model_version):
+        """Cached result (decoded from JSON), or None"""
+        result = self.results.get((text_hash, function_name, model_version))
+        return None if result is None else json.loads(result)
+
+    def put(self, text_hash, function_name, model_version, result):
+        key = (text_hash, function_name, model_version)
+        if key in self.results:
+            return
+        self.results[key] = json.dumps(result)
+        self.unsaved.append(key)
+
+    def import_rows(self, rows):
+        """Add rows exported from CORTEX_ENRICHMENT_CACHE (column names in any case); returns how many were new"""
+        added = 0
+        for row in rows:
+            row = {name.lower(): value for name, value in row.items()}
+            key = (row['text_hash'], row['function_name'], row['model_version'])
+            if key not in self.results:
+                self.results[key] = row['result']
+                self.unsaved.append(key)
+                added += 1
+        return added
+
+    def save(self):
+        """Append entries added since the last save"""
+        if not self.unsaved:
+            return 0
+        new_file = not os.path.exists(self.path)
+        with open(self.path, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            if new_file:
+                writer.writerow(CACHE_COLUMNS)
+            for key in self.unsaved:
+                writer.writerow([*key, self.results[key]])
+        saved = len(self.unsaved)
+        self.unsaved = []
+        return saved
+
+
+def plan_enrichment(transcripts, cache, versions):
+    """Count the Cortex calls a run needs per function once cached and repeated texts are skipped"""
+    rows = 0
+    hashes = set()
+    for transcript in transcripts:
+        rows += 1
+        hashes.add(text_hash(transcript['transcript_text']))
+    plan = {'transcripts': rows, 'distinct_texts': len(hashes), 'functions': {}}
+    for name, version in versions.items():
+        uncached = sum(1 for h in hashes if (h, name, version) not in cache)
+        plan['functions'][name] = {'version': version, 'cached': len(hashes) - uncached, 'calls': uncached}
+    return plan
+
+
+def _cache_match(alias, name, version):
+    return f"{alias}.function_name = '{name}' AND {alias}.model_version = '{version}'"
+
+
+# Columns of ENRICHED_CALL_TRANSCRIPTS: the transcripts_enriched.sql columns plus
+# the text hash and function versions each row was enriched from
+ENRICHED_COLUMNS = [
+    ('transcript_id', 'INTEGER', "ct.transcript_id"),
+    ('ticket_id', 'INTEGER', "ct.ticket_id"),
+    ('call_duration', 'INTEGER', "ct.call_duration"),
+    ('call_duration_minutes', 'NUMBER(10,1)', "ROUND(ct.call_duration / 60.0, 1)"),
+    ('transcript_text', 'TEXT', "ct.transcript_text"),
+    ('call_date', 'TIMESTAMP_NTZ', "ct.call_date"),
+    ('agent_name', 'VARCHAR(100)', "ct.agent_name"),
+    ('customer_satisfaction', 'INTEGER', "ct.customer_satisfaction"),
+    ('resolution_provided', 'BOOLEAN', "ct.resolution_provided"),
+    ('follow_up_needed', 'BOOLEAN', "ct.follow_up_needed"),
+    ('sentiment_score', 'FLOAT', "sentiment.result::FLOAT"),
+    ('sentiment_category', 'VARCHAR(20)', "CASE\n            WHEN sentiment.result::FLOAT >= 0.1 THEN 'Positive'\n"
+                                           "            WHEN sentiment.result::FLOAT <= -0.1 THEN 'Negative'\n"
+                                           "            ELSE 'Neutral'\n        END"),
+    ('conversation_category', 'VARCHAR(100)', "classify.result:labels[0]::STRING"),
+    ('conversation_summary', 'TEXT', "summary.result::STRING"),
+    ('original_text_length', 'INTEGER', "LENGTH(ct.transcript_text)"),
+    ('summary_length', 'INTEGER', "LENGTH(summary.result::STRING)"),
+    ('compression_ratio', 'NUMBER(10,1)', "ROUND(LENGTH(summary.result::STRING) * 100.0 / LENGTH(ct.transcript_text), 1)"),
+    ('text_hash', 'VARCHAR(64)', "ct.text_hash"),
+    ('enrichment_versions', 'VARCHAR(200)', None)
+]
+
+# Columns only the cached enrichment writes (transcripts_enriched.sql doesn't create them)
+TRACKING_COLUMNS = ('text_hash', 'enrichment_versions')
+
+# Alias each function's cached result is joined in as
+RESULT_ALIASES = {'SENTIMENT': 'sentiment', 'AI_CLASSIFY': 'classify', 'SUMMARIZE': 'summary'}
+
+
+def render_enrichment_sql(versions):
+    """SQL that enriches only transcripts whose text hash has no cached result, then merges into ENRICHED_CALL_TRANSCRIPTS"""
+    version_label = ",".join(f"{name}:{version}" for name, version in versions.items())
+    lines = [
+        "-- =====================================================================================",
+        "-- INCREMENTAL, CACHED TRANSCRIPT ENRICHMENT",
+        "-- =====================================================================================",
+        "-- Generated by scripts/enrichment_cache.py; regenerate rather than edit.",
+        "-- Same enriched columns as transcripts_enriched.sql, but Cortex results are cached in",
+        f"-- {CACHE_TABLE} by SHA2(transcript_text) + function + model version, so",
+        "-- each run only calls Cortex for texts it has not seen, and ENRICHED_CALL_TRANSCRIPTS",
+        "-- is merged (not replaced) so Cortex Search change tracking only sees changed rows.",
+        f"-- Function versions: {version_label}",
+        "",
+        "USE DATABASE ZENDESK_ANALYTICS_POC;",
+        "USE SCHEMA BRONZE;",
+        "",
+        f"CREATE TABLE IF NOT EXISTS {CACHE_TABLE} (",
+        "    text_hash VARCHAR(64) NOT NULL,",
+        "    function_name VARCHAR(50) NOT NULL,",
+        "    model_version VARCHAR(50) NOT NULL,",
+        "    result VARIANT,",
+        "    enriched_at TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),",
+        "    PRIMARY KEY (text_hash, function_name, model_version)",
+        ");",
+        "",
+        f"-- Optional: seed the cache from a local store (scripts/enrichment_cache.py keeps {CACHE_FILE})",
+        f"-- PUT 'file:///path/to/data/{CACHE_FILE}' @ZENDESK_DATA_STAGE/enrichment_cache/ AUTO_COMPRESS = TRUE OVERWRITE = TRUE;",
+        f"-- MERGE INTO {CACHE_TABLE} cache",
+        "-- USING (SELECT $1 AS text_hash, $2 AS function_name, $3 AS model_version, PARSE_JSON($4) AS result",
+        "--        FROM @ZENDESK_DATA_STAGE/enrichment_cache/ (FILE_FORMAT => CSV_FORMAT)) seed",
+        "-- ON cache.text_hash = seed.text_hash AND cache.function_name = seed.function_name",
+        "--    AND cache.model_version = seed.model_version",
+        "-- WHEN NOT MATCHED THEN INSERT (text_hash, function_name, model_version, result)",
+        "--     VALUES (seed.text_hash, seed.function_name, seed.model_version, seed.result);",
+        ""
+    ]
+
+    for name, version in versions.items():
+        call = ENRICHMENT_FUNCTIONS[name]['call'].format(text='texts.transcript_text')
+        lines += [
+            f"-- {name} ({version}): only distinct texts without a cached result reach Cortex",
+            f"MERGE INTO {CACHE_TABLE} cache",
+            "USING (",
+            f"    SELECT texts.text_hash, TO_VARIANT({call}) AS result",
+            "    FROM (",
+            "        SELECT DISTINCT SHA2(transcript_text, 256) AS text_hash, transcript_text",
+            "        FROM CALL_TRANSCRIPTS",
+            "    ) texts",
+            "    WHERE NOT EXISTS (",
+            f"        SELECT 1 FROM {CACHE_TABLE} cached",
+            f"        WHERE cached.text_hash = texts.text_hash AND {_cache_match('cached', name, version)}",
+            "    )",
+            ") uncached",
+            f"ON cache.text_hash = uncached.text_hash AND {_cache_match('cache', name, version)}",
+            "WHEN NOT MATCHED THEN INSERT (text_hash, function_name, model_version, result)",
+            f"    VALUES (uncached.text_hash, '{name}', '{version}', uncached.result);",
+            ""
+        ]
+
+    definitions = ",\n".join(f"    {column} {sql_type}" for column, sql_type, _ in ENRICHED_COLUMNS)
+    version_literal = f"'{version_label}'"
+    selects = ",\n".join(f"        {expression or version_literal} AS {column}" for column, _, expression in ENRICHED_COLUMNS)
+    joins = []
+    for name, version in versions.items():
+        alias = RESULT_ALIASES[name]
+        joins.append(f"    JOIN {CACHE_TABLE} {alias}\n"
+                     f"        ON {alias}.text_hash = ct.text_hash AND {_cache_match(alias, name, version)}")
+    columns = [column for column, _, _ in ENRICHED_COLUMNS]
+    updates = ",\n".join(f"    {column} = src.{column}" for column in columns if column != 'transcript_id')
+    lines += [
+        f"CREATE TABLE IF NOT EXISTS {ENRICHED_TABLE} (",
+        definitions,
+        ");",
+        "",
+        "-- A table created by transcripts_enriched.sql has neither tracking column, so add them",
+        *(f"ALTER TABLE {ENRICHED_TABLE} ADD COLUMN IF NOT EXISTS {column} {sql_type};"
+          for column, sql_type, _ in ENRICHED_COLUMNS if column in TRACKING_COLUMNS),
+        "",
+        "-- Enriched rows come from the cache alone; rows are only rewritten when their text or versions change",
+        f"MERGE INTO {ENRICHED_TABLE} target",
+        "USING (",
+        "    SELECT",
+        selects,
+        "    FROM (SELECT *, SHA2(transcript_text, 256) AS text_hash FROM CALL_TRANSCRIPTS) ct",
+        "\n".join(joins),
+        ") src",
+        "ON target.transcript_id = src.transcript_id",
+        "WHEN MATCHED AND (target.text_hash IS DISTINCT FROM src.text_hash",
+        "                  OR target.enrichment_versions IS DISTINCT FROM src.enrichment_versions) THEN UPDATE SET",
+        updates,
+        f"WHEN NOT MATCHED THEN INSERT ({', '.join(columns)})",
+        f"    VALUES ({', '.join('src.' + column for column in columns)});",
+        "",
+        "-- Cached results per function and version (enriched_at shows when each batch was paid for)",
+        f"SELECT function_name, model_version, COUNT(*) AS cached_results, MAX(enriched_at) AS last_enriched_at",
+        f"FROM {CACHE_TABLE}",
+        "GROUP BY function_name, model_version",
+        "ORDER BY function_name, model_version;"
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def report_plan(plan):
+    repeated = plan['transcripts'] - plan['distinct_texts']
+    print(f"📊 {plan['transcripts']} transcripts, {plan['distinct_texts']} distinct texts ({repeated} repeats)")
+    total_calls = 0
+    for name, entry in plan['functions'].items():
+        total_calls += entry['calls']
+        print(f"  {name} {entry['version']}: {entry['cached']} cached, {entry['calls']} Cortex calls")
+    full_calls = plan['transcripts'] * len(plan['functions'])
+    print(f"  {total_calls} Cortex calls instead of {full_calls} for a full re-enrichment")
+
+
+def main():
+    """Command line interface"""
+    parser = argparse.ArgumentParser(description="Plan cached Cortex enrichment of call transcripts and generate its MERGE SQL")
+    parser.add_argument('--data-dir', default=None, help="Directory holding call_transcripts.csv and the cache (defaults to data/)")
+    parser.add_argument('--transcripts', default=None,
+                        help="Transcripts CSV to plan for (defaults to call_transcripts.csv in the data directory)")
+    parser.add_argument('--cache', default=None, help=f"Local result store (defaults to {CACHE_FILE} in the data directory)")
+    parser.add_argument('--import', dest='import_path', default=None,
+                        help=f"Add a CSV export of {CACHE_TABLE} to the local store")
+    parser.add_argument('--model-version', action='append', default=[], metavar='FUNCTION=VERSION',
+                        help="Override a function's model version, e.g. SUMMARIZE=v2 (repeatable)")
+    parser.add_argument('--write-sql', default=None, help="Write the incremental enrichment SQL to this path")
+    args = parser.parse_args()
+
+    data_dir = args.data_dir or default_data_dir()
+    cache = EnrichmentCache(args.cache or os.path.join(data_dir, CACHE_FILE))
+    try:
+        versions = function_versions(dict(item.split('=', 1) for item in args.model_version))
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.import_path:
+        added = cache.import_rows(iter_csv_table(args.import_path))
+        cache.save()
+        print(f"Imported {added} new results into {cache.path} ({len(cache)} cached)")
+
+    transcripts_path = args.transcripts or os.path.join(data_dir, 'call_transcripts.csv')
+    if os.path.exists(transcripts_path):
+        report_plan(plan_enrichment(iter_csv_table(transcripts_path), cache, versions))
+    else:
+        print(f"No transcripts at {transcripts_path} - skipping the plan")
+
+    if args.write_sql:
+        with open(args.write_sql, 'w') as f:
+            f.write(render_enrichment_sql(versions))
+        print(f"Wrote {args.write_sql}")
+
+if __name__ == "__main__":
+    main()
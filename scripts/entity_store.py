@@ -0,0 +1,74 @@
+# Primary key of each table, matching the CREATE TABLE definitions
+PRIMARY_KEYS = {
+    'customers': 'customer_id',
+    'employees': 'employee_id',
+    'tickets': 'ticket_id',
+    'call_transcripts': 'transcript_id',
+    'ticket_metrics': 'ticket_id'
+}
+
+# Foreign keys that get a parent -> children index
+FOREIGN_KEYS = {
+    'employees': ['customer_id'],
+    'tickets': ['customer_id'],
+    'call_transcripts': ['ticket_id'],
+    'ticket_metrics': ['ticket_id']
+}
+
+# Generated rows carry these IDs as ints, rows read back from CSV as strings
+INTEGER_KEYS = {'ticket_id', 'transcript_id'}
+
+
+def normalize_key(column, value):
+    """Return the index key for a column value, so '42' and 42 find the same row"""
+    return int(value) if column in INTEGER_KEYS else value
+
+
+class EntityStore:
+    """In-memory tables with primary-key and foreign-key hash indexes
+
+    Rows are stored by reference, so the store costs a few dict entries per row.
+    Lookups are O(1) instead of scanning a table with next(...) per row.
+    """
+
+    def __init__(self, **tables):
+        self.tables = {}
+        self._primary = {}
+        self._foreign = {}
+        for table, rows in tables.items():
+            self.add(table, rows)
+
+    def add(self, table, rows):
+        """Append rows to a table and update its indexes"""
+        rows = list(rows)
+        self.tables.setdefault(table, []).extend(rows)
+
+        key_column = PRIMARY_KEYS[table]
+        primary = self._primary.setdefault(table, {})
+        for row in rows:
+            primary[normalize_key(key_column, row[key_column])] = row
+
+        for column in FOREIGN_KEYS.get(table, []):
+            index = self._foreign.setdefault((table, column), {})
+            for row in rows:
+                index.setdefault(normalize_key(column, row[column]), []).append(row)
+
+    def rows(self, table):
+        return self.tables.get(table, [])
+
+    def get(self, table, key, default=None):
+        """Look up a row by primary key"""
+        return self._primary.get(table, {}).get(normalize_key(PRIMARY_KEYS[table], key), default)
+
+    def children(self, table, column, key):
+        """Rows of `table` whose foreign key `column` equals key (e.g. a customer's employees)"""
+        return self._foreign.get((table, column), {}).get(normalize_key(column, key), [])
+
+    def child(self, table, column, key):
+        """First matching child row, for one-to-one relations like ticket -> transcript"""
+        matches = self.children(table, column, key)
+        return matches[0] if matches else None
+
+    def parent_keys(self, table, column):
+        """Distinct foreign key values present in a table"""
+        return self._foreign.get((table, column), {}).keys()
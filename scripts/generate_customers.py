@@ -1,24 +1,11 @@
-import csv
-import random
-from datetime import datetime, timedelta
+import argparse
 import json
 import os
 
-# Get the directory of the current script
-script_dir = os.path.dirname(os.path.abspath(__file__))
-data_dir = os.path.join(script_dir, '..', 'data')
-
-# Read existing records
-existing = []
-existing_file = os.path.join(data_dir, 'zendesk_customers.csv')
-try:
-    with open(existing_file, 'r') as f:
-        reader = csv.DictReader(f)
-        existing = list(reader)
-except FileNotFoundError:
-    print("No existing customer records found - starting fresh")
-
-print(f'Starting with {len(existing)} existing records')
+from online_stats import OnlineSummary
+from rng_streams import entity_rng, resolve_seed
+from scaling import id_width, scaled_org_type_targets
+from table_io import default_data_dir, read_csv_table, write_csv_table
 
 # Data for generation
 faith_types = ['church', 'synagogue', 'mosque']
@@ -59,158 +46,210 @@ us_locations = [
     ('Boston', 'MA', 2101, 'America/New_York')
 ] * 50  # Repeat to have enough options
 
-# Generate 980 more records
-new_records = []
-used_names = set(r['organization_name'] for r in existing)
-used_emails = set(r['primary_contact_email'] for r in existing)
-
-# Distribution targets
-faith_count = 640 - sum(1 for r in existing if r['organization_type'] == 'faith')
-school_count = 200 - sum(1 for r in existing if r['organization_type'] == 'school')
-nonprofit_count = 100 - sum(1 for r in existing if r['organization_type'] == 'nonprofit')
-childcare_count = 40 - sum(1 for r in existing if r['organization_type'] == 'childcare')
-community_ed_count = 20 - sum(1 for r in existing if r['organization_type'] == 'community_ed')
-
-record_id = len(existing) + 1
-
-for org_type, target_count, subtypes in [
-    ('faith', faith_count, faith_types),
-    ('school', school_count, school_types),
-    ('nonprofit', nonprofit_count, nonprofit_types),
-    ('childcare', childcare_count, childcare_types),
-    ('community_ed', community_ed_count, community_ed_types)
-]:
+def iter_customers(existing=(), scale_factor=1, seed=0):
+    """Yield new customer records until each organization type reaches its scaled target
+    
+    Records are produced one at a time so callers can stream them to disk; the
+    only state kept between records is a per-base-name suffix counter. Each
+    record draws from its own stream keyed by its sequence number.
+    """
     
-    for i in range(target_count):
-        if record_id > 1000:
-            break
+    targets = scaled_org_type_targets(scale_factor)
+    max_records = sum(targets.values())
+    width = id_width(max_records)
+    
+    used_names = set(r['organization_name'] for r in existing)
+    used_emails = set(r['primary_contact_email'] for r in existing)
+    name_counters = {}
+    
+    # Distribution targets
+    existing_counts = {}
+    for r in existing:
+        existing_counts[r['organization_type']] = existing_counts.get(r['organization_type'], 0) + 1
+    
+    record_id = len(existing) + 1
+    
+    for org_type, subtypes in [
+        ('faith', faith_types),
+        ('school', school_types),
+        ('nonprofit', nonprofit_types),
+        ('childcare', childcare_types),
+        ('community_ed', community_ed_types)
+    ]:
+        target_count = targets[org_type] - existing_counts.get(org_type, 0)
+    
+        for i in range(target_count):
+            if record_id > max_records:
+                return
+            
+            rng = entity_rng(seed, record_id, 'customer')
             
-        # Generate unique organization name
-        if org_type == 'faith':
-            base_name = random.choice(church_names)
-            suffix = random.choice(church_suffixes)
-            org_name = f'{base_name} {suffix}'
-        elif org_type == 'school':
-            base_name = random.choice(school_names)
-            suffix = random.choice(school_suffixes)
-            org_name = f'{base_name} {suffix}'
-        else:
-            org_name = f'{random.choice(["Community", "City", "Metro", "Valley", "County"])} {org_type.title()} Center'
+            # Generate unique organization name
+            if org_type == 'faith':
+                base_name = rng.choice(church_names)
+                suffix = rng.choice(church_suffixes)
+                org_name = f'{base_name} {suffix}'
+            elif org_type == 'school':
+                base_name = rng.choice(school_names)
+                suffix = rng.choice(school_suffixes)
+                org_name = f'{base_name} {suffix}'
+            else:
+                org_name = f'{rng.choice(["Community", "City", "Metro", "Valley", "County"])} {org_type.title()} Center'
             
-        # Ensure uniqueness
-        counter = 1
-        original_name = org_name
-        while org_name in used_names:
-            org_name = f'{original_name} #{counter}'
-            counter += 1
-        used_names.add(org_name)
+            # Ensure uniqueness (suffixes continue per base name, so this stays O(1) at any scale)
+            original_name = org_name
+            counter = name_counters.get(original_name, 0)
+            if counter:
+                org_name = f'{original_name} #{counter}'
+            while org_name in used_names:
+                counter += 1
+                org_name = f'{original_name} #{counter}'
+            name_counters[original_name] = counter + 1
         
-        # Generate other fields
-        subtype = random.choice(subtypes)
-        size_cat = random.choices(['small', 'medium', 'large'], weights=[60, 30, 10])[0]
+            # Generate other fields
+            subtype = rng.choice(subtypes)
+            size_cat = rng.choices(['small', 'medium', 'large'], weights=[60, 30, 10])[0]
         
-        if size_cat == 'small':
-            emp_count = random.randint(5, 50)
-            revenue = random.randint(400, 2000)
-        elif size_cat == 'medium':
-            emp_count = random.randint(51, 150)
-            revenue = random.randint(2000, 8000)
-        else:
-            emp_count = random.randint(151, 500)
-            revenue = random.randint(8000, 25000)
+            if size_cat == 'small':
+                emp_count = rng.randint(5, 50)
+                revenue = rng.randint(400, 2000)
+            elif size_cat == 'medium':
+                emp_count = rng.randint(51, 150)
+                revenue = rng.randint(2000, 8000)
+            else:
+                emp_count = rng.randint(151, 500)
+                revenue = rng.randint(8000, 25000)
             
-        tier = random.choices(['basic', 'standard', 'premium'], weights=[40, 40, 20])[0]
+            tier = rng.choices(['basic', 'standard', 'premium'], weights=[40, 40, 20])[0]
         
-        # Location
-        city, state, base_zip, timezone = random.choice(us_locations)
-        zip_code = base_zip + random.randint(0, 99)
+            # Location
+            city, state, base_zip, timezone = rng.choice(us_locations)
+            zip_code = base_zip + rng.randint(0, 99)
         
-        # Contact info
-        first_names = ['John', 'Sarah', 'Michael', 'Jennifer', 'David', 'Lisa', 'Robert', 'Mary', 'William', 'Patricia']
-        last_names = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez', 'Martinez']
+            # Contact info
+            first_names = ['John', 'Sarah', 'Michael', 'Jennifer', 'David', 'Lisa', 'Robert', 'Mary', 'William', 'Patricia']
+            last_names = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez', 'Martinez']
         
-        first_name = random.choice(first_names)
-        last_name = random.choice(last_names)
+            first_name = rng.choice(first_names)
+            last_name = rng.choice(last_names)
         
-        if org_type == 'faith' and subtype == 'church':
-            contact_name = f'Rev. {first_name} {last_name}'
-        elif org_type == 'faith' and subtype == 'synagogue':
-            contact_name = f'Rabbi {first_name} {last_name}'
-        elif org_type == 'faith' and subtype == 'mosque':
-            contact_name = f'Imam {first_name} {last_name}'
-        elif org_type == 'school':
-            contact_name = f'Principal {first_name} {last_name}'
-        else:
-            contact_name = f'{first_name} {last_name}'
+            if org_type == 'faith' and subtype == 'church':
+                contact_name = f'Rev. {first_name} {last_name}'
+            elif org_type == 'faith' and subtype == 'synagogue':
+                contact_name = f'Rabbi {first_name} {last_name}'
+            elif org_type == 'faith' and subtype == 'mosque':
+                contact_name = f'Imam {first_name} {last_name}'
+            elif org_type == 'school':
+                contact_name = f'Principal {first_name} {last_name}'
+            else:
+                contact_name = f'{first_name} {last_name}'
             
-        # Email
-        domain = org_name.lower().replace(' ', '').replace('#', '').replace("'", '') + '.org'
-        email = f'{first_name.lower()}.{last_name.lower()}@{domain}'
+            # Email
+            domain = org_name.lower().replace(' ', '').replace('#', '').replace("'", '') + '.org'
+            email = f'{first_name.lower()}.{last_name.lower()}@{domain}'
         
-        counter = 1
-        original_email = email
-        while email in used_emails:
-            email = f'{first_name.lower()}.{last_name.lower()}{counter}@{domain}'
-            counter += 1
-        used_emails.add(email)
+            # Domains come from unique organization names, so only pre-existing emails can collide
+            counter = 1
+            original_email = email
+            while email in used_emails:
+                email = f'{first_name.lower()}.{last_name.lower()}{counter}@{domain}'
+                counter += 1
         
-        # Dates
-        setup_year = random.randint(2015, 2024)
-        setup_month = random.randint(1, 12)
-        setup_day = random.randint(1, 28)
-        setup_date = f'{setup_year}-{setup_month:02d}-{setup_day:02d}'
+            # Dates
+            setup_year = rng.randint(2015, 2024)
+            setup_month = rng.randint(1, 12)
+            setup_day = rng.randint(1, 28)
+            setup_date = f'{setup_year}-{setup_month:02d}-{setup_day:02d}'
         
-        # Payment methods
-        methods = ['online']
-        if random.random() < 0.6:
-            methods.append('mobile')
-        if random.random() < 0.4:
-            methods.append('text')
-        if size_cat == 'large' and random.random() < 0.3:
-            methods.append('pos')
+            # Payment methods
+            methods = ['online']
+            if rng.random() < 0.6:
+                methods.append('mobile')
+            if rng.random() < 0.4:
+                methods.append('text')
+            if size_cat == 'large' and rng.random() < 0.3:
+                methods.append('pos')
             
-        record = {
-            'customer_id': f'ZENDESK{record_id:04d}',
-            'organization_name': org_name,
-            'organization_type': org_type,
-            'organization_subtype': subtype,
-            'size_category': size_cat,
-            'employee_count': emp_count,
-            'subscription_tier': tier,
-            'monthly_revenue': f'{revenue:.2f}',
-            'setup_date': setup_date,
-            'primary_contact_name': contact_name,
-            'primary_contact_email': email,
-            'primary_contact_phone': f'555-{random.randint(100,999)}-{random.randint(1000,9999)}',
-            'street_address': f'{random.randint(100, 9999)} {random.choice(["Main", "Oak", "Park", "Church", "School"])} {random.choice(["St", "Ave", "Blvd", "Dr"])}',
-            'city': city,
-            'state': state,
-            'zip_code': str(zip_code),
-            'time_zone': timezone,
-            'payment_methods': json.dumps(methods),
-            'integration_count': random.randint(1, 15),
-            'last_login_date': f'2024-{random.randint(10,11)}-{random.randint(1,20):02d}',
-            'support_tier': 'premium' if tier == 'premium' else 'basic',
-            'created_at': f'{setup_date} {random.randint(8,17):02d}:{random.randint(0,59):02d}:00',
-            'updated_at': f'2024-11-{random.randint(15,20):02d} {random.randint(8,17):02d}:{random.randint(0,59):02d}:00'
-        }
+            record = {
+                'customer_id': f'ZENDESK{record_id:0{width}d}',
+                'organization_name': org_name,
+                'organization_type': org_type,
+                'organization_subtype': subtype,
+                'size_category': size_cat,
+                'employee_count': emp_count,
+                'subscription_tier': tier,
+                'monthly_revenue': f'{revenue:.2f}',
+                'setup_date': setup_date,
+                'primary_contact_name': contact_name,
+                'primary_contact_email': email,
+                'primary_contact_phone': f'555-{rng.randint(100,999)}-{rng.randint(1000,9999)}',
+                'street_address': f'{rng.randint(100, 9999)} {rng.choice(["Main", "Oak", "Park", "Church", "School"])} {rng.choice(["St", "Ave", "Blvd", "Dr"])}',
+                'city': city,
+                'state': state,
+                'zip_code': str(zip_code),
+                'time_zone': timezone,
+                'payment_methods': json.dumps(methods),
+                'integration_count': rng.randint(1, 15),
+                'last_login_date': f'2024-{rng.randint(10,11)}-{rng.randint(1,20):02d}',
+                'support_tier': 'premium' if tier == 'premium' else 'basic',
+                'created_at': f'{setup_date} {rng.randint(8,17):02d}:{rng.randint(0,59):02d}:00',
+                'updated_at': f'2024-11-{rng.randint(15,20):02d} {rng.randint(8,17):02d}:{rng.randint(0,59):02d}:00'
+            }
         
-        new_records.append(record)
-        record_id += 1
-        
-        if record_id > 1000:
-            break
+            yield record
+            record_id += 1
+
+def new_customer_summary():
+    """Single-pass summary of customer records"""
+    return OnlineSummary('customers', counts=['organization_type', 'size_category', 'subscription_tier'],
+                         numeric=['monthly_revenue'], quantiles=['monthly_revenue'])
 
-print(f'Generated {len(new_records)} new records')
+def summarize_customer(summary, customer):
+    summary.add(customer, monthly_revenue=float(customer['monthly_revenue']))
 
-# Combine and write
-all_records = existing + new_records
-output_file = os.path.join(data_dir, 'zendesk_customers.csv')
-with open(output_file, 'w', newline='') as f:
-    if all_records:
-        fieldnames = all_records[0].keys()
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(all_records)
+def generate_customers(data_dir=None, existing=None, write_csv=True, scale_factor=1, seed=None):
+    """Generate customer records, topping up any existing zendesk_customers.csv"""
+    
+    if data_dir is None:
+        data_dir = default_data_dir()
+    
+    # Read existing records
+    if existing is None:
+        existing = []
+        existing_file = os.path.join(data_dir, 'zendesk_customers.csv')
+        try:
+            existing = read_csv_table(existing_file)
+        except FileNotFoundError:
+            print("No existing customer records found - starting fresh")
+    
+    print(f'Starting with {len(existing)} existing records')
+    
+    new_records = list(iter_customers(existing, scale_factor, resolve_seed(seed)))
+    
+    print(f'Generated {len(new_records)} new records')
+    
+    # Combine and write
+    all_records = existing + new_records
+    if write_csv:
+        output_file = os.path.join(data_dir, 'zendesk_customers.csv')
+        write_csv_table(output_file, all_records)
+        summary = new_customer_summary()
+        for customer in all_records:
+            summarize_customer(summary, customer)
+        summary.write_json(output_file)
+        print(f'Wrote {len(all_records)} total records to zendesk_customers.csv')
+    
+    return all_records
+
+def main():
+    """Command line interface"""
+    parser = argparse.ArgumentParser(description="Generate Zendesk customer records")
+    parser.add_argument('--scale-factor', type=float, default=1,
+                        help="Multiple of the base 1,000-customer dataset to generate")
+    parser.add_argument('--seed', type=int, default=None, help="Seed for reproducible output")
+    args = parser.parse_args()
+    
+    generate_customers(scale_factor=args.scale_factor, seed=args.seed)
 
-print(f'Wrote {len(all_records)} total records to zendesk_customers.csv')
\ No newline at end of file
+if __name__ == "__main__":
+    main()
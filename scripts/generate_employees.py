@@ -1,24 +1,33 @@
-import csv
-import random
+import argparse
 import json
 import os
 from datetime import datetime, timedelta
 
-def generate_employees():
-    """Generate employee records for all Zendesk customers"""
+from entity_store import EntityStore
+from online_stats import OnlineSummary
+from rng_streams import entity_rng, resolve_seed
+from scaling import MAX_EMPLOYEES_PER_CUSTOMER, id_width
+from table_io import default_data_dir, read_csv_table, write_csv_table
+from timestamps import DEFAULT_AS_OF
+
+def new_employee_summary():
+    """Single-pass summary of generated employees"""
+    return OnlineSummary('employees', counts=['org_type', 'role', 'is_primary_contact'])
+
+def generate_employees(customers=None, data_dir=None, write_csv=True, start_id=1, width=None, verbose=True,
+                       seed=None, summary=None, as_of=None):
+    """Generate employee records for all Zendesk customers, as of a date (DEFAULT_AS_OF if not given)"""
     
-    # Get the directory of the current script
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    data_dir = os.path.join(script_dir, '..', 'data')
+    if data_dir is None:
+        data_dir = default_data_dir()
     
     # Read customer data to get organization info
-    customers = []
-    customer_file = os.path.join(data_dir, 'zendesk_customers.csv')
-    with open(customer_file, 'r') as f:
-        reader = csv.DictReader(f)
-        customers = list(reader)
+    if customers is None:
+        customer_file = os.path.join(data_dir, 'zendesk_customers.csv')
+        customers = read_csv_table(customer_file)
     
-    print(f"Loaded {len(customers)} customers")
+    if verbose:
+        print(f"Loaded {len(customers)} customers")
     
     # Employee data by organization type
     roles_by_org_type = {
@@ -69,12 +78,18 @@ def generate_employees():
         'Green', 'Adams', 'Nelson', 'Baker', 'Hall', 'Rivera', 'Campbell', 'Mitchell'
     ]
     
+    # Fixed "now" so hire dates don't drift with the wall clock between runs
+    now = as_of or DEFAULT_AS_OF
+    seed = resolve_seed(seed)
+    
     employees = []
-    employee_counter = 1
-    used_emails = set()
+    employee_counter = start_id
+    if width is None:
+        width = id_width(start_id - 1 + len(customers) * MAX_EMPLOYEES_PER_CUSTOMER)
     
     for customer in customers:
         customer_id = customer['customer_id']
+        rng = entity_rng(seed, customer_id, 'employees')
         org_name = customer['organization_name']
         org_type = customer['organization_type']
         org_subtype = customer['organization_subtype']
@@ -83,9 +98,9 @@ def generate_employees():
         
         # Determine number of employees based on size
         if size_category == 'small':
-            num_employees = random.choice([3, 4])
+            num_employees = rng.choice([3, 4])
         elif size_category == 'medium':
-            num_employees = random.choice([4, 5])
+            num_employees = rng.choice([4, 5])
         else:  # large
             num_employees = 5
         
@@ -97,23 +112,26 @@ def generate_employees():
             available_roles.extend(['Staff Member', 'Assistant', 'Coordinator', 'Specialist'])
         
         # Select roles for this organization
-        selected_roles = random.sample(available_roles, min(num_employees, len(available_roles)))
+        selected_roles = rng.sample(available_roles, min(num_employees, len(available_roles)))
         
         # Make first employee the primary contact (matches customer data)
         primary_contact_assigned = False
         
+        # Email domains are unique per organization, so uniqueness only has to hold within it
+        used_emails = set()
+        
         for i in range(num_employees):
-            first_name = random.choice(first_names)
-            last_name = random.choice(last_names)
+            first_name = rng.choice(first_names)
+            last_name = rng.choice(last_names)
             
             # Assign role
             if i < len(selected_roles):
                 title = selected_roles[i]
             else:
-                title = random.choice(['Assistant', 'Coordinator', 'Staff Member'])
+                title = rng.choice(['Assistant', 'Coordinator', 'Staff Member'])
             
             # Determine if this is primary contact
-            is_primary = not primary_contact_assigned and (i == 0 or random.random() < 0.3)
+            is_primary = not primary_contact_assigned and (i == 0 or rng.random() < 0.3)
             if is_primary:
                 primary_contact_assigned = True
             
@@ -133,9 +151,9 @@ def generate_employees():
             setup_dt = datetime.strptime(setup_date, '%Y-%m-%d')
             
             # Hire date between setup date and now
-            days_since_setup = (datetime.now() - setup_dt).days
+            days_since_setup = (now - setup_dt).days
             if days_since_setup > 0:
-                hire_offset = random.randint(0, min(days_since_setup, 2000))  # Max 5.5 years
+                hire_offset = rng.randint(0, min(days_since_setup, 2000))  # Max 5.5 years
                 hire_date = setup_dt + timedelta(days=hire_offset)
             else:
                 hire_date = setup_dt
@@ -158,7 +176,7 @@ def generate_employees():
             elif any(keyword in title.lower() for keyword in ['finance', 'accounting']):
                 role = 'finance'
             else:
-                role = random.choice(['volunteer', 'director', 'teacher'])
+                role = rng.choice(['volunteer', 'director', 'teacher'])
             
             # Permissions based on role
             if is_primary or role == 'admin':
@@ -169,67 +187,72 @@ def generate_employees():
                 permissions = ['basic_access']
             
             # Training completion (higher for newer employees)
-            days_employed = (datetime.now() - hire_date).days
+            days_employed = (now - hire_date).days
             if days_employed < 90:
-                training_completed = random.choice([True, False])
+                training_completed = rng.choice([True, False])
             else:
-                training_completed = random.choice([True, True, True, False])  # 75% trained
+                training_completed = rng.choice([True, True, True, False])  # 75% trained
             
             # Recent login dates (within last 30 days)
-            last_login = datetime(2024, 11, 20) - timedelta(days=random.randint(1, 30))
+            last_login = now - timedelta(days=rng.randint(1, 30))
             
             employee = {
-                'employee_id': f'EMP{employee_counter:04d}',
+                'employee_id': f'EMP{employee_counter:0{width}d}',
                 'customer_id': customer_id,
                 'first_name': first_name,
                 'last_name': last_name,
                 'email': email,
-                'phone': f'555-{random.randint(100,999)}-{random.randint(1000,9999)}',
+                'phone': f'555-{rng.randint(100,999)}-{rng.randint(1000,9999)}',
                 'title': title,
                 'role': role,
                 'department': department,
                 'hire_date': hire_date.strftime('%Y-%m-%d'),
                 'is_primary_contact': is_primary,
-                'is_active': random.choice([True] * 19 + [False]),  # 95% active
+                'is_active': rng.choice([True] * 19 + [False]),  # 95% active
                 'last_login_date': last_login.strftime('%Y-%m-%d'),
                 'training_completed': training_completed,
                 'permissions': json.dumps(permissions),
                 'created_at': hire_date.strftime('%Y-%m-%d %H:%M:%S'),
-                'updated_at': datetime(2024, 11, 20, 14, 30).strftime('%Y-%m-%d %H:%M:%S')
+                'updated_at': now.replace(hour=14, minute=30).strftime('%Y-%m-%d %H:%M:%S')
             }
             
             employees.append(employee)
             employee_counter += 1
     
-    print(f"Generated {len(employees)} employee records")
-    
-    # Write to CSV
-    output_file = os.path.join(data_dir, 'zendesk_employees.csv')
-    with open(output_file, 'w', newline='') as f:
-        if employees:
-            fieldnames = employees[0].keys()
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(employees)
+    if verbose:
+        print(f"Generated {len(employees)} employee records")
     
     # Statistics
-    org_type_counts = {}
-    primary_contacts = 0
-    
+    store = EntityStore(customers=customers)
+    if summary is None:
+        summary = new_employee_summary()
     for emp in employees:
         # Find customer for this employee
-        customer = next(c for c in customers if c['customer_id'] == emp['customer_id'])
-        org_type = customer['organization_type']
-        org_type_counts[org_type] = org_type_counts.get(org_type, 0) + 1
-        
-        if emp['is_primary_contact']:
-            primary_contacts += 1
+        customer = store.get('customers', emp['customer_id'])
+        summary.add(emp, org_type=customer['organization_type'])
+    
+    # Write to CSV
+    if write_csv:
+        output_file = os.path.join(data_dir, 'zendesk_employees.csv')
+        write_csv_table(output_file, employees)
+        summary.write_json(output_file)
     
-    print(f"Employee distribution by org type: {org_type_counts}")
-    print(f"Primary contacts: {primary_contacts}")
+    if not verbose:
+        return employees
+    
+    print(f"Employee distribution by org type: {summary.counts['org_type']}")
+    print(f"Primary contacts: {summary.tally('is_primary_contact')}")
     print(f"Average employees per customer: {len(employees) / len(customers):.1f}")
     
     return employees
 
+def main():
+    """Command line interface"""
+    parser = argparse.ArgumentParser(description="Generate employee records for existing customers")
+    parser.add_argument('--seed', type=int, default=None, help="Seed for reproducible output")
+    args = parser.parse_args()
+    
+    generate_employees(seed=args.seed)
+
 if __name__ == "__main__":
-    generate_employees()
\ No newline at end of file
+    main()
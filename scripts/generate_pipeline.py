@@ -0,0 +1,313 @@
+import argparse
+import os
+import time
+from datetime import datetime
+
+from generate_customers import iter_customers, new_customer_summary, summarize_customer
+from generate_employees import generate_employees, new_employee_summary
+from generate_tickets import generate_tickets, new_ticket_summary
+from generate_call_transcripts import LABELS_FILE, generate_enhanced_call_transcripts, new_transcript_summary
+from generate_ticket_metrics import generate_ticket_metrics, new_metric_summary
+from load_manifest import write_load_files
+from online_stats import summary_path
+from rng_streams import resolve_seed
+from scaling import MAX_EMPLOYEES_PER_CUSTOMER, id_width, scaled_customer_count
+from table_io import CsvTableSink, OUTPUT_EXTENSIONS, default_data_dir, iter_batches, open_table_sink, read_csv_table, write_csv_table
+from timestamps import DEFAULT_AS_OF
+from watermark import DELTA_DIR, delta_dir, read_watermark, watermark_date, write_watermark
+
+TABLE_FILES = {
+    'customers': 'zendesk_customers.csv',
+    'employees': 'zendesk_employees.csv',
+    'tickets': 'zendesk_tickets.csv',
+    'call_transcripts': 'call_transcripts.csv',
+    'ticket_metrics': 'ticket_metrics.csv'
+}
+
+def open_sinks(directory, tables, output_format, part_bytes, compression):
+    """One output sink per table, named after its CSV with the output format's extension"""
+    return {name: open_table_sink(os.path.join(directory, os.path.splitext(TABLE_FILES[name])[0] + OUTPUT_EXTENSIONS[output_format]),
+                                  name, output_format, part_bytes, compression)
+            for name in tables}
+
+def report_outputs(directory, sinks, summaries, part_bytes, compression, stage_prefix='', first_ids=None):
+    """Write each table's summary and, for part files, the load manifest and script"""
+    print()
+    for name, sink in sinks.items():
+        summaries[name].write_json(sink.path)
+        target = f"{len(sink.parts)} part file(s)" if part_bytes else os.path.basename(sink.path)
+        print(f"Wrote {sink.rows_written} records to {target} (summary in {os.path.basename(summary_path(sink.path))})")
+    
+    if part_bytes:
+        manifest_path, script_path = write_load_files(directory, sinks, compression, stage_prefix=stage_prefix, first_ids=first_ids)
+        print(f"Wrote {os.path.basename(manifest_path)} and {os.path.basename(script_path)} "
+              f"(check with: python scripts/load_manifest.py --data-dir {directory})")
+
+def report_timings(stage_times):
+    print(f"\n⏱ Stage timings:")
+    for name, elapsed in stage_times.items():
+        print(f"  {name}: {elapsed:.2f}s")
+    print(f"  total: {sum(stage_times.values()):.2f}s")
+
+def run_pipeline(data_dir=None, seed=None, scale_factor=1, chunk_size=None, workers=None,
+                 metrics_engine='python', tickets_engine='python', output_format='csv', part_size_mb=None,
+                 compression='gzip', as_of=None):
+    """Run all five generators in one process, handing each stage's tables to the next in memory
+
+    With chunk_size set, customers are streamed through the chain that many at a
+    time and every table is appended to its CSV per chunk, so peak memory depends
+    on the chunk size rather than the scale factor.
+    
+    output_format='parquet' writes typed Parquet files (one row group per chunk)
+    instead of CSVs; existing customers are still read from zendesk_customers.csv.
+    
+    With part_size_mb set, each CSV is split into gzip/zstd part files of about
+    that size, and a load manifest plus a parallel PUT/COPY script are written
+    next to them.
+    
+    Data is generated as of `as_of` (DEFAULT_AS_OF if not given), which is
+    recorded in watermark.json along with the next ticket and transcript IDs so
+    run_incremental can pick up from there.
+    
+    Each transcript's true conversation category goes to transcript_labels.csv
+    (always CSV: it is ground truth for local classifiers, not a table to load).
+    """
+
+    if data_dir is None:
+        data_dir = default_data_dir()
+    os.makedirs(data_dir, exist_ok=True)
+
+    seed = resolve_seed(seed)
+    as_of = as_of or DEFAULT_AS_OF
+    if part_size_mb and output_format != 'csv':
+        raise ValueError("Split part files are only written for CSV output")
+    part_bytes = int(part_size_mb * 1024 * 1024) if part_size_mb else None
+
+    # Existing customers are kept and topped up to the scaled targets
+    existing = []
+    try:
+        existing = read_csv_table(os.path.join(data_dir, TABLE_FILES['customers']))
+    except FileNotFoundError:
+        print("No existing customer records found - starting fresh")
+    print(f"Starting with {len(existing)} existing customers (scale factor {scale_factor})")
+
+    total_customers = max(len(existing), scaled_customer_count(scale_factor))
+    employee_width = id_width(total_customers * MAX_EMPLOYEES_PER_CUSTOMER)
+    verbose = chunk_size is None
+
+    def new_customers():
+        yield from existing
+        yield from iter_customers(existing, scale_factor, seed)
+
+    sinks = open_sinks(data_dir, TABLE_FILES, output_format, part_bytes, compression)
+    labels_sink = CsvTableSink(os.path.join(data_dir, LABELS_FILE))
+    stage_times = {name: 0.0 for name in TABLE_FILES}
+    stage_times['write_csv'] = 0.0
+    next_ids = {'employees': 1, 'tickets': 1, 'call_transcripts': 1}
+
+    # One summary per table, accumulated across chunks
+    summaries = {
+        'customers': new_customer_summary(),
+        'employees': new_employee_summary(),
+        'tickets': new_ticket_summary(),
+        'call_transcripts': new_transcript_summary(),
+        'ticket_metrics': new_metric_summary()
+    }
+
+    def run_stage(name, func, **kwargs):
+        if verbose:
+            print(f"\n▶ {name}")
+        started = time.perf_counter()
+        rows = func(data_dir=data_dir, write_csv=False, verbose=verbose, seed=seed, summary=summaries[name], **kwargs)
+        stage_times[name] += time.perf_counter() - started
+        return rows
+
+    try:
+        customer_batches = iter_batches(new_customers(), chunk_size)
+        chunk_number = 0
+        while True:
+            started = time.perf_counter()
+            customers = next(customer_batches, None)
+            stage_times['customers'] += time.perf_counter() - started
+            if customers is None:
+                break
+            for customer in customers:
+                summarize_customer(summaries['customers'], customer)
+            chunk_number += 1
+
+            employees = run_stage('employees', generate_employees, customers=customers,
+                                  start_id=next_ids['employees'], width=employee_width, as_of=as_of)
+            tickets = run_stage('tickets', generate_tickets, customers=customers, employees=employees,
+                                start_id=next_ids['tickets'], engine=tickets_engine, as_of=as_of)
+            labels = []
+            transcripts = run_stage('call_transcripts', generate_enhanced_call_transcripts,
+                                    tickets=tickets, customers=customers, employees=employees,
+                                    start_id=next_ids['call_transcripts'], workers=workers, labels=labels)
+            metrics = run_stage('ticket_metrics', generate_ticket_metrics,
+                                tickets=tickets, customers=customers, transcripts=transcripts,
+                                engine=metrics_engine)
+
+            next_ids['employees'] += len(employees)
+            next_ids['tickets'] += len(tickets)
+            next_ids['call_transcripts'] += len(transcripts)
+
+            # Each chunk's tables are only written once every stage has finished with them
+            started = time.perf_counter()
+            for name, rows in [('customers', customers), ('employees', employees), ('tickets', tickets),
+                               ('call_transcripts', transcripts), ('ticket_metrics', metrics)]:
+                sinks[name].write_rows(rows)
+            labels_sink.write_rows(labels)
+            stage_times['write_csv'] += time.perf_counter() - started
+
+            if not verbose:
+                print(f"Chunk {chunk_number}: {sinks['customers'].rows_written} customers, "
+                      f"{sinks['tickets'].rows_written} tickets, "
+                      f"{sinks['call_transcripts'].rows_written} transcripts so far")
+    finally:
+        for sink in sinks.values():
+            sink.close()
+        labels_sink.close()
+
+    report_outputs(data_dir, sinks, summaries, part_bytes, compression)
+    write_watermark(data_dir, as_of, next_ids)
+    print(f"Data is loaded through {as_of:%Y-%m-%d}; next ticket ID {next_ids['tickets']}")
+    report_timings(stage_times)
+
+    return {name: sink.rows_written for name, sink in sinks.items()}
+
+def run_incremental(as_of, data_dir=None, seed=None, workers=None, metrics_engine='python', tickets_engine='python',
+                    output_format='csv', part_size_mb=None, compression='gzip'):
+    """Generate only the tickets created since the last watermark, and their transcripts and metrics
+    
+    Customers and employees are read from the existing CSVs and left alone. The
+    new rows continue the ticket and transcript ID sequences and are written as
+    delta files under deltas/<as_of>/ (split into part files with their own load
+    script when part_size_mb is set), so a daily load or Cortex enrichment only
+    has to touch the new rows. watermark.json then moves forward to `as_of`.
+    Delta tickets are always generated row by row; the numpy tickets engine
+    has no delta mode.
+    """
+
+    if data_dir is None:
+        data_dir = default_data_dir()
+    seed = resolve_seed(seed)
+    if tickets_engine != 'python':
+        raise ValueError(f"The {tickets_engine} tickets engine cannot generate deltas; incremental tickets use the python engine")
+    if part_size_mb and output_format != 'csv':
+        raise ValueError("Split part files are only written for CSV output")
+    part_bytes = int(part_size_mb * 1024 * 1024) if part_size_mb else None
+
+    watermark = read_watermark(data_dir, TABLE_FILES['tickets'], TABLE_FILES['call_transcripts'])
+    since = watermark_date(watermark)
+    if as_of <= since:
+        print(f"Nothing to generate: data is already loaded through {watermark['as_of']}")
+        return {}
+
+    customers = read_csv_table(os.path.join(data_dir, TABLE_FILES['customers']))
+    employees = read_csv_table(os.path.join(data_dir, TABLE_FILES['employees']))
+    next_ids = dict(watermark['next_ids'])
+    print(f"Generating tickets after {watermark['as_of']} through {as_of:%Y-%m-%d} for {len(customers)} customers "
+          f"(next ticket ID {next_ids['tickets']})")
+
+    output_dir = delta_dir(data_dir, as_of)
+    os.makedirs(output_dir, exist_ok=True)
+    tables = ['tickets', 'call_transcripts', 'ticket_metrics']
+    summaries = {
+        'tickets': new_ticket_summary(),
+        'call_transcripts': new_transcript_summary(),
+        'ticket_metrics': new_metric_summary()
+    }
+    stage_times = {name: 0.0 for name in tables}
+    stage_times['write_csv'] = 0.0
+
+    def run_stage(name, func, **kwargs):
+        started = time.perf_counter()
+        rows = func(data_dir=data_dir, write_csv=False, verbose=False, seed=seed, summary=summaries[name], **kwargs)
+        stage_times[name] += time.perf_counter() - started
+        return rows
+
+    tickets = run_stage('tickets', generate_tickets, customers=customers, employees=employees,
+                        start_id=next_ids['tickets'], as_of=as_of, since=since)
+    labels = []
+    transcripts = run_stage('call_transcripts', generate_enhanced_call_transcripts,
+                            tickets=tickets, customers=customers, employees=employees,
+                            start_id=next_ids['call_transcripts'], workers=workers, labels=labels)
+    metrics = run_stage('ticket_metrics', generate_ticket_metrics,
+                        tickets=tickets, customers=customers, transcripts=transcripts, engine=metrics_engine)
+    # The load script's row check counts only IDs from here on, since the tables already hold earlier loads
+    first_ids = {
+        'tickets': ('ticket_id', next_ids['tickets']),
+        'call_transcripts': ('transcript_id', next_ids['call_transcripts']),
+        'ticket_metrics': ('ticket_id', next_ids['tickets'])
+    }
+    next_ids['tickets'] += len(tickets)
+    next_ids['call_transcripts'] += len(transcripts)
+
+    started = time.perf_counter()
+    sinks = open_sinks(output_dir, tables, output_format, part_bytes, compression)
+    try:
+        for name, rows in [('tickets', tickets), ('call_transcripts', transcripts), ('ticket_metrics', metrics)]:
+            sinks[name].write_rows(rows)
+        write_csv_table(os.path.join(output_dir, LABELS_FILE), labels)
+    finally:
+        for sink in sinks.values():
+            sink.close()
+    stage_times['write_csv'] += time.perf_counter() - started
+
+    report_outputs(output_dir, sinks, summaries, part_bytes, compression,
+                   stage_prefix=f"{DELTA_DIR}/{as_of:%Y-%m-%d}/", first_ids=first_ids)
+    delta = {
+        'since': watermark['as_of'],
+        'as_of': f"{as_of:%Y-%m-%d}",
+        'dir': os.path.relpath(output_dir, data_dir),
+        'rows': {name: sink.rows_written for name, sink in sinks.items()}
+    }
+    write_watermark(data_dir, as_of, next_ids, watermark['deltas'] + [delta])
+    print(f"Data is loaded through {as_of:%Y-%m-%d}; next ticket ID {next_ids['tickets']}")
+    report_timings(stage_times)
+
+    return delta['rows']
+
+def main():
+    """Command line interface"""
+    parser = argparse.ArgumentParser(description="Generate the full Zendesk dataset in a single process")
+    parser.add_argument('--data-dir', default=None, help="Output directory (defaults to the repository's data/)")
+    parser.add_argument('--seed', type=int, default=None, help="Seed for reproducible output")
+    parser.add_argument('--scale-factor', type=float, default=1,
+                        help="Multiple of the base dataset (1 = 1,000 customers, ~20k tickets)")
+    parser.add_argument('--chunk-size', type=int, default=None,
+                        help="Stream customers through the chain this many at a time to bound memory")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Processes to render call transcripts with (defaults to serial)")
+    parser.add_argument('--tickets-engine', choices=['python', 'numpy'], default='python',
+                        help="Engine for ticket skeletons (numpy samples the structured columns as array operations)")
+    parser.add_argument('--metrics-engine', choices=['python', 'numpy'], default='python',
+                        help="Engine for ticket metrics (numpy computes them as array operations)")
+    parser.add_argument('--format', choices=sorted(OUTPUT_EXTENSIONS), default='csv',
+                        help="Output format (parquet writes typed, compressed columns; requires pyarrow)")
+    parser.add_argument('--part-size-mb', type=float, default=None,
+                        help="Split each CSV into compressed part files of about this size, with a load manifest and script")
+    parser.add_argument('--compression', choices=['gzip', 'zstd'], default='gzip',
+                        help="Compression for part files (zstd requires zstandard)")
+    parser.add_argument('--as-of', type=datetime.fromisoformat, default=None,
+                        help=f"Date the data is generated up to, YYYY-MM-DD (defaults to {DEFAULT_AS_OF:%Y-%m-%d})")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Only generate tickets, transcripts and metrics since the last watermark, as delta files (requires --as-of)")
+    args = parser.parse_args()
+
+    if args.incremental:
+        if args.as_of is None:
+            parser.error("--incremental requires --as-of")
+        if args.tickets_engine != 'python':
+            parser.error("--tickets-engine numpy cannot generate deltas; drop it for --incremental runs")
+        run_incremental(args.as_of, data_dir=args.data_dir, seed=args.seed, workers=args.workers,
+                        metrics_engine=args.metrics_engine, tickets_engine=args.tickets_engine, output_format=args.format,
+                        part_size_mb=args.part_size_mb, compression=args.compression)
+        return
+
+    run_pipeline(data_dir=args.data_dir, seed=args.seed, scale_factor=args.scale_factor,
+                 chunk_size=args.chunk_size, workers=args.workers, metrics_engine=args.metrics_engine, tickets_engine=args.tickets_engine,
+                 output_format=args.format, part_size_mb=args.part_size_mb, compression=args.compression, as_of=args.as_of)
+
+if __name__ == "__main__":
+    main()
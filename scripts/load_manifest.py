@@ -0,0 +1,244 @@
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import sys
+
+from table_io import default_data_dir, open_compressed_reader
+from table_schema import SNOWFLAKE_TABLES, TABLE_COLUMNS, TABLE_PARENTS, load_order
+
+MANIFEST_FILE = 'load_manifest.json'
+LOAD_SCRIPT_FILE = 'load_data.sql'
+STAGE = 'ZENDESK_DATA_STAGE'
+
+# COPY INTO accepts at most this many names in FILES = (...); beyond it a PATTERN is used
+MAX_COPY_FILES = 1000
+
+
+def build_manifest(sinks, compression, stage_prefix='', first_ids=None):
+    """Manifest of the part files written by PartitionedCsvSinks, keyed by table in load order
+
+    A delta sets stage_prefix (e.g. deltas/2024-12-05/) so its parts, which are
+    named like the full load's, are staged apart from them, and first_ids
+    ({table: (id column, first new ID)}) so the row check counts only its rows.
+    """
+    tables = {}
+    for table in load_order(list(sinks)):
+        sink = sinks[table]
+        tables[table] = {
+            'snowflake_table': SNOWFLAKE_TABLES[table],
+            'columns': [column for column, _ in TABLE_COLUMNS[table]],
+            'rows': sink.rows_written,
+            'files': sink.parts,
+            'stage_prefix': stage_prefix
+        }
+        if first_ids and table in first_ids:
+            column, first_id = first_ids[table]
+            tables[table]['first_id'] = {'column': column, 'value': first_id}
+    return {'compression': compression, 'tables': tables}
+
+
+def stage_path(table_manifest):
+    return f"@{STAGE}/{table_manifest['snowflake_table'].lower()}/{table_manifest.get('stage_prefix', '')}"
+
+
+def row_count_check(table_manifest):
+    """SELECT comparing a table's loaded rows with the manifest (only the delta's IDs for a delta)"""
+    table = table_manifest['snowflake_table']
+    query = f"SELECT '{table}' AS table_name, COUNT(*) AS loaded_rows, {table_manifest['rows']} AS expected_rows FROM {table}"
+    first_id = table_manifest.get('first_id')
+    if first_id:
+        query += f" WHERE {first_id['column']} >= {first_id['value']}"
+    return query
+
+
+def file_pattern(table_manifest):
+    """Glob matching a table's part files, e.g. zendesk_tickets_part*.csv.gz"""
+    return re.sub(r'_part\d+\.', '_part*.', table_manifest['files'][0]['file'])
+
+
+def file_regex(table_manifest):
+    """COPY PATTERN matching a table's part files"""
+    prefix, suffix = re.split(r'_part\d+', table_manifest['files'][0]['file'])
+    return f".*{re.escape(prefix)}_part[0-9]+{re.escape(suffix)}"
+
+
+def render_load_script(manifest, data_dir, parallel=8):
+    """SQL that PUTs every table's part files in parallel and loads tables in foreign key order"""
+    compression = manifest['compression']
+    data_dir = os.path.abspath(data_dir)
+    total_files = sum(len(t['files']) for t in manifest['tables'].values())
+    lines = [
+        f"-- Generated by scripts/load_manifest.py from {MANIFEST_FILE}; regenerate rather than edit",
+        f"-- {len(manifest['tables'])} tables, {total_files} {compression}-compressed part files",
+        "-- Run after sections 1-3 of queries/snowflake_setup.sql (tables, CSV_FORMAT and stage)",
+        "",
+        "USE DATABASE ZENDESK_ANALYTICS_POC;",
+        "USE SCHEMA BRONZE;",
+        ""
+    ]
+
+    for table, entry in manifest['tables'].items():
+        if not entry['files']:
+            continue
+        local_files = os.path.join(data_dir, file_pattern(entry))
+        lines += [
+            f"-- {entry['snowflake_table']}: {entry['rows']} rows, {len(entry['files'])} part file(s)",
+            f"PUT 'file://{local_files}' {stage_path(entry)}",
+            f"PARALLEL = {parallel} AUTO_COMPRESS = FALSE SOURCE_COMPRESSION = {compression.upper()} OVERWRITE = TRUE;",
+            ""
+        ]
+
+    lines.append("-- Load parents before children so foreign keys always resolve")
+    for table, entry in manifest['tables'].items():
+        if not entry['files']:
+            continue
+        names = [part['file'] for part in entry['files']]
+        if len(names) <= MAX_COPY_FILES:
+            files_clause = "FILES = (" + ", ".join(f"'{name}'" for name in names) + ")"
+        else:
+            files_clause = f"PATTERN = '{file_regex(entry)}'"
+        lines += [
+            f"COPY INTO {entry['snowflake_table']} ({', '.join(entry['columns'])})",
+            f"FROM {stage_path(entry)}",
+            files_clause,
+            "FILE_FORMAT = (FORMAT_NAME = CSV_FORMAT)",
+            "ON_ERROR = 'ABORT_STATEMENT';",
+            ""
+        ]
+
+    if any(entry.get('first_id') for entry in manifest['tables'].values()):
+        lines.append("-- Rows from this delta (IDs from its first new ID on) should match the manifest")
+    else:
+        lines.append("-- Loaded row counts should match the manifest")
+    checks = [row_count_check(entry) for entry in manifest['tables'].values()]
+    lines.append("\nUNION ALL\n".join(checks) + ";")
+    return "\n".join(lines) + "\n"
+
+
+def write_load_files(data_dir, sinks, compression, parallel=8, stage_prefix='', first_ids=None):
+    """Write load_manifest.json and load_data.sql next to the part files"""
+    manifest = build_manifest(sinks, compression, stage_prefix, first_ids)
+    manifest_path = os.path.join(data_dir, MANIFEST_FILE)
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    script_path = os.path.join(data_dir, LOAD_SCRIPT_FILE)
+    with open(script_path, 'w') as f:
+        f.write(render_load_script(manifest, data_dir, parallel))
+    return manifest_path, script_path
+
+
+def sql_statements(script):
+    """Split a SQL script into statements, dropping comment lines"""
+    text = "\n".join(line for line in script.splitlines() if not line.lstrip().startswith('--'))
+    return [" ".join(statement.split()) for statement in text.split(';') if statement.strip()]
+
+
+def validate_part(path, part, columns):
+    """Problems with one part file: size, checksum, header and row count"""
+    if not os.path.exists(path):
+        return [f"{part['file']}: missing"]
+    problems = []
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+            size += len(block)
+    if size != part['bytes']:
+        problems.append(f"{part['file']}: {size} bytes, manifest says {part['bytes']}")
+    if digest.hexdigest() != part['sha256']:
+        problems.append(f"{part['file']}: checksum mismatch")
+
+    with open_compressed_reader(path) as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        rows = sum(1 for _ in reader)
+    if header != columns:
+        problems.append(f"{part['file']}: header {header} does not match {columns}")
+    if rows != part['rows']:
+        problems.append(f"{part['file']}: {rows} rows, manifest says {part['rows']}")
+    return problems
+
+
+def validate_load(data_dir):
+    """Check the part files against the manifest and the load script against both, without Snowflake
+
+    Returns a list of problems (empty when everything is consistent).
+    """
+    with open(os.path.join(data_dir, MANIFEST_FILE)) as f:
+        manifest = json.load(f)
+    with open(os.path.join(data_dir, LOAD_SCRIPT_FILE)) as f:
+        statements = sql_statements(f.read())
+
+    problems = []
+    for table, entry in manifest['tables'].items():
+        for part in entry['files']:
+            problems += validate_part(os.path.join(data_dir, part['file']), part, entry['columns'])
+        if sum(part['rows'] for part in entry['files']) != entry['rows']:
+            problems.append(f"{table}: part row counts do not add up to {entry['rows']}")
+
+    # Every table is PUT before it is copied, and copied after all of its parents
+    by_snowflake_name = {entry['snowflake_table']: table for table, entry in manifest['tables'].items()}
+    put_tables = set()
+    loaded = []
+    for statement in statements:
+        put = re.match(r"PUT 'file://(.+?)' (@\S+)", statement)
+        copy = re.match(r"COPY INTO (\w+) \((.*?)\) FROM (@\S+) (FILES = \((.*?)\)|PATTERN)", statement)
+        if put:
+            local_path, stage = put.groups()
+            matches = [table for table, entry in manifest['tables'].items()
+                       if entry['files'] and stage == stage_path(entry)
+                       and os.path.basename(local_path) == file_pattern(entry)]
+            if not matches:
+                problems.append(f"PUT of {local_path} to {stage} matches no table in the manifest")
+            put_tables.update(matches)
+            if 'PARALLEL' not in statement:
+                problems.append(f"PUT of {local_path} does not set PARALLEL")
+        elif copy:
+            snowflake_table, columns, stage, _, files = copy.groups()
+            table = by_snowflake_name.get(snowflake_table)
+            if table is None:
+                problems.append(f"COPY INTO {snowflake_table} is not in the manifest")
+                continue
+            entry = manifest['tables'][table]
+            if table not in put_tables:
+                problems.append(f"{snowflake_table} is copied before its files are PUT")
+            if stage != stage_path(entry):
+                problems.append(f"{snowflake_table} is copied from {stage}, files were PUT to {stage_path(entry)}")
+            if [c.strip() for c in columns.split(',')] != entry['columns']:
+                problems.append(f"{snowflake_table} column list does not match the part file header")
+            if files is not None:
+                named = [name.strip().strip("'") for name in files.split(',')]
+                if named != [part['file'] for part in entry['files']]:
+                    problems.append(f"{snowflake_table} FILES list does not match the manifest")
+            missing_parents = [p for p in TABLE_PARENTS[table] if p in manifest['tables'] and p not in loaded]
+            if missing_parents:
+                problems.append(f"{snowflake_table} is loaded before {', '.join(missing_parents)}")
+            loaded.append(table)
+
+    for table, entry in manifest['tables'].items():
+        if entry['files'] and table not in loaded:
+            problems.append(f"{entry['snowflake_table']} is never loaded")
+    return problems
+
+
+def main():
+    """Command line interface"""
+    parser = argparse.ArgumentParser(description="Validate split output files and their generated load script locally")
+    parser.add_argument('--data-dir', default=None, help="Directory holding load_manifest.json (defaults to data/)")
+    args = parser.parse_args()
+
+    data_dir = args.data_dir or default_data_dir()
+    problems = validate_load(data_dir)
+    if problems:
+        print(f"❌ {len(problems)} problems in {os.path.join(data_dir, LOAD_SCRIPT_FILE)}:")
+        for problem in problems:
+            print(f"  - {problem}")
+        sys.exit(1)
+    print(f"✅ Manifest, part files and {LOAD_SCRIPT_FILE} are consistent")
+
+if __name__ == "__main__":
+    main()
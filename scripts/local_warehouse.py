@@ -0,0 +1,390 @@
+import argparse
+import os
+import re
+import sqlite3
+import time
+
+from conversation_classifier import MODEL_FILE
+from cortex_planner import blank_literals, split_statements
+from cortex_udfs import OFFLINE_CACHE_FILE, open_offline_cache, register_cortex_functions, report_hit_rates
+from generate_pipeline import TABLE_FILES
+from offline_cortex import ENRICHED_FILE
+from table_io import default_data_dir, iter_batches, iter_csv_table
+from table_schema import SNOWFLAKE_TABLES, TABLE_COLUMNS, TABLE_PARENTS, load_order
+
+DATABASE_FILE = 'zendesk_local.db'
+QUERIES_DIR = os.path.join(os.path.dirname(__file__), '..', 'queries')
+SETUP_SQL = os.path.join(QUERIES_DIR, 'snowflake_setup.sql')
+LOAD_BATCH_SIZE = 10000
+
+# Statements with no local equivalent (Snowflake objects, staging and Cortex services) are skipped
+SKIPPED_PATTERN = re.compile(
+    r'^\s*(?:USE|PUT|COPY|SHOW|DESCRIBE|GRANT|MERGE|ALTER\s+TABLE\s+\w+\s+SET|'
+    r'CREATE\s+(?:OR\s+REPLACE\s+)?(?:DATABASE|SCHEMA|WAREHOUSE|STAGE|FILE\s+FORMAT|CORTEX\s+SEARCH\s+SERVICE|SEMANTIC\s+VIEW))\b',
+    re.IGNORECASE)
+CREATE_OR_REPLACE_PATTERN = re.compile(r'^(\s*)CREATE\s+OR\s+REPLACE\s+(TABLE|VIEW)\s+([\w.]+)', re.IGNORECASE)
+TABLE_DEFINITION_PATTERN = re.compile(r'^\s*CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?[\w.]+\s*\(', re.IGNORECASE)
+# SQLite has ADD COLUMN but not its IF NOT EXISTS; run_file checks for the column instead
+ADD_COLUMN_PATTERN = re.compile(r'^\s*ALTER\s+TABLE\s+([\w.]+)\s+ADD\s+COLUMN\s+(IF\s+NOT\s+EXISTS\s+)?(\w+)', re.IGNORECASE)
+CORTEX_PREFIX_PATTERN = re.compile(r'\bSNOWFLAKE\.CORTEX\.', re.IGNORECASE)
+PATH_PATTERN = re.compile(r'(?:\)|\b([\w.]+))\s*:(\w+)((?:\[\d+\])*)(?:::(\w+))?')
+CAST_PATTERN = re.compile(r'\b([\w.]+)::(\w+)')
+CONCAT_PATTERN = re.compile(r'\bCONCAT\s*\(', re.IGNORECASE)
+
+# Snowflake column types and their SQLite equivalents (dates and timestamps are ISO text)
+SQLITE_TYPES = [
+    (re.compile(r'\b(?:VARCHAR|CHAR|STRING)\s*(?:\(\s*\d+\s*\))?', re.IGNORECASE), 'TEXT'),
+    (re.compile(r'\b(?:TIMESTAMP_NTZ|TIMESTAMP|DATE)\b', re.IGNORECASE), 'TEXT'),
+    (re.compile(r'\b(?:DECIMAL|NUMBER)\s*\(\s*\d+\s*,\s*\d+\s*\)', re.IGNORECASE), 'NUMERIC'),
+    (re.compile(r'\bBOOLEAN\b', re.IGNORECASE), 'INTEGER'),
+    (re.compile(r'\bVARIANT\b', re.IGNORECASE), 'TEXT'),
+    (re.compile(r'\bCURRENT_TIMESTAMP\(\)', re.IGNORECASE), 'CURRENT_TIMESTAMP')
+]
+CAST_TYPES = {'string': 'TEXT', 'varchar': 'TEXT', 'text': 'TEXT', 'int': 'INTEGER', 'integer': 'INTEGER',
+              'number': 'NUMERIC', 'float': 'REAL', 'double': 'REAL', 'boolean': 'INTEGER'}
+COLUMN_TYPES = {'VARCHAR': 'TEXT', 'INTEGER': 'INTEGER', 'DECIMAL': 'NUMERIC', 'FLOAT': 'REAL', 'BOOLEAN': 'INTEGER',
+                'DATE': 'TEXT', 'TIMESTAMP': 'TEXT'}
+
+
+def _matching_paren(blanked, open_index):
+    depth = 0
+    for i in range(open_index, len(blanked)):
+        if blanked[i] == '(':
+            depth += 1
+        elif blanked[i] == ')':
+            depth -= 1
+            if depth == 0:
+                return i
+    raise ValueError("Unbalanced parentheses")
+
+
+def _opening_paren(blanked, close_index):
+    depth = 0
+    for i in range(close_index, -1, -1):
+        if blanked[i] == ')':
+            depth += 1
+        elif blanked[i] == '(':
+            depth -= 1
+            if depth == 0:
+                return i
+    raise ValueError("Unbalanced parentheses")
+
+
+def _split_arguments(sql, blanked, start, end):
+    """Top-level comma-separated arguments between two positions"""
+    arguments, depth, position = [], 0, start
+    for i in range(start, end):
+        if blanked[i] in '([':
+            depth += 1
+        elif blanked[i] in ')]':
+            depth -= 1
+        elif blanked[i] == ',' and depth == 0:
+            arguments.append(sql[position:i].strip())
+            position = i + 1
+    arguments.append(sql[position:end].strip())
+    return arguments
+
+
+def _rewrite_paths(sql):
+    """call(...):labels[0]::string or column:labels[0]::string -> CAST(json_extract(..., '$.labels[0]') AS TEXT)"""
+    while True:
+        blanked = blank_literals(sql)
+        match = PATH_PATTERN.search(blanked)
+        if match is None:
+            return sql
+        if match.group(1):
+            start, end = match.span(1)
+        else:
+            start, end = _opening_paren(blanked, match.start()), match.start() + 1
+            name = re.search(r'[\w.]*$', blanked[:start])
+            start = name.start() if name else start
+        expression = f"json_extract({sql[start:end]}, '$.{match.group(2)}{match.group(3)}')"
+        if match.group(4):
+            expression = f"CAST({expression} AS {CAST_TYPES.get(match.group(4).lower(), 'TEXT')})"
+        sql = sql[:start] + expression + sql[match.end():]
+
+
+def _rewrite_arrays(sql):
+    """Array literals [a, b] -> json_array(a, b)"""
+    while True:
+        blanked = blank_literals(sql)
+        start = blanked.find('[')
+        if start == -1:
+            return sql
+        depth = 0
+        for end in range(start, len(blanked)):
+            if blanked[end] == '[':
+                depth += 1
+            elif blanked[end] == ']':
+                depth -= 1
+                if depth == 0:
+                    break
+        items = _split_arguments(sql, blanked, start + 1, end)
+        sql = sql[:start] + 'json_array(' + ', '.join(item for item in items if item) + ')' + sql[end + 1:]
+
+
+def _rewrite_concat(sql):
+    """CONCAT(a, b) -> (a || b), which keeps Snowflake's NULL-in, NULL-out behaviour"""
+    while True:
+        blanked = blank_literals(sql)
+        match = CONCAT_PATTERN.search(blanked)
+        if match is None:
+            return sql
+        end = _matching_paren(blanked, match.end() - 1)
+        arguments = _split_arguments(sql, blanked, match.end(), end)
+        sql = sql[:match.start()] + '(' + ' || '.join(arguments) + ')' + sql[end + 1:]
+
+
+def _rewrite_casts(sql):
+    blanked = blank_literals(sql)
+    pieces, position = [], 0
+    for match in CAST_PATTERN.finditer(blanked):
+        pieces.append(sql[position:match.start()])
+        pieces.append(f"CAST({sql[match.start(1):match.end(1)]} AS {CAST_TYPES.get(match.group(2).lower(), 'TEXT')})")
+        position = match.end()
+    pieces.append(sql[position:])
+    return ''.join(pieces)
+
+
+def _rewrite_types(sql):
+    blanked = blank_literals(sql)
+    for pattern, replacement in SQLITE_TYPES:
+        pieces, position = [], 0
+        for match in pattern.finditer(blanked):
+            pieces.append(sql[position:match.start()])
+            pieces.append(replacement.ljust(match.end() - match.start()))
+            position = match.end()
+        pieces.append(sql[position:])
+        sql = ''.join(pieces)
+        blanked = blank_literals(sql)
+    return sql
+
+
+def translate_statement(sql):
+    """SQLite statements for one Snowflake statement, or (None, reason) when it has no local equivalent"""
+    code = blank_literals(sql)
+    skipped = SKIPPED_PATTERN.match(code)
+    if skipped:
+        return None, f"{' '.join(skipped.group(0).split())} is Snowflake-only"
+
+    statements = []
+    replace = CREATE_OR_REPLACE_PATTERN.match(code)
+    if replace:
+        kind, name = replace.group(2).upper(), sql[replace.start(3):replace.end(3)]
+        statements.append(f"DROP {kind} IF EXISTS {name}")
+        sql = f"{replace.group(1)}CREATE {kind} {name}" + sql[replace.end():]
+    add_column = ADD_COLUMN_PATTERN.match(code)
+    if add_column and add_column.group(2):
+        sql = sql[:add_column.start(2)] + sql[add_column.end(2):]
+    if add_column or TABLE_DEFINITION_PATTERN.match(blank_literals(sql)):
+        sql = _rewrite_types(sql)
+
+    sql = CORTEX_PREFIX_PATTERN.sub('', sql)
+    sql = _rewrite_paths(sql)
+    sql = _rewrite_arrays(sql)
+    sql = _rewrite_concat(sql)
+    sql = _rewrite_casts(sql)
+    statements.append(sql.strip())
+    return statements, None
+
+
+def translate_file(path):
+    """(original, translated statements or None, skip reason) for each statement in a SQL file"""
+    with open(path) as f:
+        sql = f.read()
+    return [(sql[start:end].strip(),) + translate_statement(sql[start:end]) for start, end in split_statements(sql)]
+
+
+def _create_table_sql(table):
+    """CREATE TABLE for a generated table that snowflake_setup.sql doesn't define, from table_schema"""
+    columns = [f"    {name} {COLUMN_TYPES[sql_type]}" for name, sql_type in TABLE_COLUMNS[table]]
+    columns += [f"    FOREIGN KEY (ticket_id) REFERENCES {SNOWFLAKE_TABLES[parent]}(ticket_id)"
+                for parent in TABLE_PARENTS[table] if parent == 'tickets']
+    return f"CREATE TABLE {SNOWFLAKE_TABLES[table]} (\n" + ",\n".join(columns) + "\n)"
+
+
+def create_schema(conn, tables):
+    """The bronze tables from snowflake_setup.sql (plus any other generated tables), translated to SQLite"""
+    defined = set()
+    for _, statements, _ in translate_file(SETUP_SQL):
+        if statements and re.match(r'\s*CREATE\s+TABLE', statements[-1], re.IGNORECASE):
+            for statement in statements:
+                conn.execute(statement)
+            defined.add(re.match(r'\s*CREATE\s+TABLE\s+(\w+)', statements[-1], re.IGNORECASE).group(1).upper())
+    for table in tables:
+        if SNOWFLAKE_TABLES[table] not in defined:
+            conn.execute(f"DROP TABLE IF EXISTS {SNOWFLAKE_TABLES[table]}")
+            conn.execute(_create_table_sql(table))
+
+
+def create_foreign_key_indexes(conn):
+    """An index on every foreign key column, so joins from child to parent tables don't scan"""
+    created = []
+    tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+    for table in tables:
+        for row in conn.execute(f"PRAGMA foreign_key_list({table})").fetchall():
+            column = row[3]
+            primary_key = [info[1] for info in conn.execute(f"PRAGMA table_info({table})") if info[5]]
+            if primary_key == [column]:
+                continue  # already the primary key
+            name = f"idx_{table.lower()}_{column}"
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table}({column})")
+            created.append(name)
+    return created
+
+
+def _converters(table):
+    def integer(value):
+        return int(value)
+
+    def number(value):
+        return float(value)
+
+    def boolean(value):
+        return 1 if value in ('True', 'true', '1') else 0
+
+    by_type = {'INTEGER': integer, 'DECIMAL': number, 'FLOAT': number, 'BOOLEAN': boolean}
+    return [(name, by_type.get(sql_type, str)) for name, sql_type in TABLE_COLUMNS[table]]
+
+
+def load_table(conn, table, path, batch_size=LOAD_BATCH_SIZE):
+    """Bulk-load a generated CSV: typed rows, executemany in batches, one transaction per table"""
+    converters = _converters(table)
+    columns = [name for name, _ in converters]
+    insert = (f"INSERT INTO {SNOWFLAKE_TABLES[table]} ({', '.join(columns)}) "
+              f"VALUES ({', '.join('?' for _ in columns)})")
+    rows = 0
+    with conn:
+        for batch in iter_batches(iter_csv_table(path), batch_size):
+            conn.executemany(insert, [tuple(None if row[name] == '' else convert(row[name]) for name, convert in converters)
+                                      for row in batch])
+            rows += len(batch)
+    return rows
+
+
+def load_warehouse(data_dir=None, database=None, enriched_path=None, verbose=True):
+    """Create the bronze schema in a SQLite file and load the generated CSVs into it
+
+    The enriched transcripts from offline_cortex.py are loaded into
+    ENRICHED_CALL_TRANSCRIPTS when they exist. Foreign keys are indexed after
+    the load and checked once at the end rather than row by row.
+    """
+    if data_dir is None:
+        data_dir = default_data_dir()
+    database = database or os.path.join(data_dir, DATABASE_FILE)
+    files = {table: os.path.join(data_dir, file) for table, file in TABLE_FILES.items()}
+    enriched_path = enriched_path or os.path.join(data_dir, ENRICHED_FILE)
+    if os.path.exists(enriched_path):
+        files['enriched_call_transcripts'] = enriched_path
+
+    if os.path.exists(database):
+        os.remove(database)
+    conn = sqlite3.connect(database)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    create_schema(conn, files)
+
+    started = time.perf_counter()
+    for table in load_order(list(files)):
+        table_started = time.perf_counter()
+        rows = load_table(conn, table, files[table])
+        elapsed = time.perf_counter() - table_started
+        if verbose:
+            print(f"  {SNOWFLAKE_TABLES[table]}: {rows} rows in {elapsed:.2f}s ({rows / elapsed if elapsed else 0:,.0f} rows/sec)")
+    indexes = create_foreign_key_indexes(conn)
+    violations = conn.execute("PRAGMA foreign_key_check").fetchall()
+    conn.commit()
+
+    if verbose:
+        print(f"Loaded {len(files)} tables into {database} in {time.perf_counter() - started:.2f}s "
+              f"({len(indexes)} foreign key indexes)")
+        if violations:
+            print(f"❌ {len(violations)} rows reference missing parents, e.g. {violations[0]}")
+        else:
+            print("✅ Every foreign key resolves")
+    return conn
+
+
+def _has_column(conn, table, column):
+    return any(info[1].lower() == column.lower() for info in conn.execute(f"PRAGMA table_info({table})"))
+
+
+def run_file(conn, path, show=0):
+    """Translate and execute each statement of a Snowflake SQL file, reporting rows and time per statement
+
+    Returns (line, rows, seconds) per statement run; a statement SQLite rejects
+    is reported with its error and counted as a failure rather than stopping the file.
+    """
+    print(f"📁 {os.path.normpath(path)}")
+    with open(path) as f:
+        sql = f.read()
+    blanked = blank_literals(sql)
+    results, failures = [], 0
+    for start, end in split_statements(sql):
+        line = sql.count('\n', 0, start + len(blanked[start:end]) - len(blanked[start:end].lstrip())) + 1
+        statements, reason = translate_statement(sql[start:end])
+        if statements is None:
+            print(f"  line {line}: skipped ({reason})")
+            continue
+        add_column = ADD_COLUMN_PATTERN.match(blanked[start:end])
+        if add_column and add_column.group(2) and _has_column(conn, add_column.group(1), add_column.group(3)):
+            print(f"  line {line}: skipped ({add_column.group(1)}.{add_column.group(3)} already exists)")
+            continue
+        started = time.perf_counter()
+        try:
+            for statement in statements:
+                cursor = conn.execute(statement)
+            rows = cursor.fetchall()
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"  ❌ line {line}: {e}")
+            failures += 1
+            continue
+        elapsed = time.perf_counter() - started
+        kind = 'SELECT' if cursor.description else ' '.join(re.sub(r'\bIF\s+NOT\s+EXISTS\b', '', blank_literals(statements[-1]), flags=re.IGNORECASE).split()[:3])
+        print(f"  line {line}: {kind}, {len(rows)} rows in {elapsed:.2f}s")
+        for row in rows[:show]:
+            print(f"    {row}")
+        results.append((line, rows, elapsed))
+    return results, failures
+
+
+def main():
+    """Command line interface"""
+    parser = argparse.ArgumentParser(description="Load the generated data into a local SQLite warehouse and run the project's SQL against it")
+    parser.add_argument('--data-dir', default=None, help="Directory holding the generated CSVs (defaults to data/)")
+    parser.add_argument('--database', default=None, help=f"SQLite file (defaults to {DATABASE_FILE} in the data directory)")
+    parser.add_argument('--load', action='store_true', help="(Re)create the database and load the CSVs")
+    parser.add_argument('--run', nargs='*', default=None, metavar='SQL',
+                        help="Snowflake SQL files to translate and run (defaults to ai_sql.sql and cortex_search.sql)")
+    parser.add_argument('--classifier', default=None,
+                        help=f"Classifier for AI_CLASSIFY (defaults to {MODEL_FILE} in the data directory, if present)")
+    parser.add_argument('--cache', default=None,
+                        help=f"On-disk store for offline Cortex results (defaults to {OFFLINE_CACHE_FILE} in the data directory)")
+    parser.add_argument('--no-cache', action='store_true', help="Memoize within this run only")
+    parser.add_argument('--show', type=int, default=0, help="Print the first N rows of each query")
+    parser.add_argument('--translate', default=None, metavar='SQL', help="Print the SQLite translation of a file and exit")
+    args = parser.parse_args()
+
+    if args.translate:
+        for original, statements, reason in translate_file(args.translate):
+            print(f"-- skipped: {reason}" if statements is None else ';\n'.join(statements) + ';\n')
+        return
+
+    data_dir = args.data_dir or default_data_dir()
+    database = args.database or os.path.join(data_dir, DATABASE_FILE)
+    conn = load_warehouse(data_dir, database) if args.load else sqlite3.connect(database)
+    if args.run is not None:
+        cache = None if args.no_cache else open_offline_cache(data_dir, args.cache)
+        functions = register_cortex_functions(conn, args.classifier or os.path.join(data_dir, MODEL_FILE), cache)
+        paths = args.run or [os.path.join(QUERIES_DIR, 'ai_sql.sql'), os.path.join(QUERIES_DIR, 'cortex_search.sql')]
+        failures = sum(run_file(conn, path, args.show)[1] for path in paths)
+        if failures:
+            print(f"❌ {failures} statements failed")
+        report_hit_rates(functions)
+        if cache is not None:
+            print(f"Saved {cache.save()} new results to {cache.path} ({len(cache)} cached)")
+    conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+import argparse
+import math
+import multiprocessing
+import os
+import re
+import time
+from collections import Counter
+from itertools import repeat
+
+from columnar import np, require_numpy
+from conversation_classifier import load_classifier
+from table_io import OUTPUT_EXTENSIONS, default_data_dir, iter_batches, iter_csv_table, open_table_sink
+from text_tokens import TEXT_SEPARATOR, batch_tokens, tokens
+
+ENRICHED_FILE = 'enriched_call_transcripts.csv'
+
+# Word weights for the lexicon sentiment score; negative words are what support calls
+# complain about, positive ones how they end when things go well
+SENTIMENT_LEXICON = {
+    # positive
+    'thank': 2.0, 'thanks': 2.0, 'appreciate': 2.0, 'appreciated': 2.0, 'great': 2.5, 'excellent': 3.0,
+    'perfect': 3.0, 'wonderful': 3.0, 'fantastic': 3.0, 'amazing': 3.0, 'helpful': 2.5, 'happy': 2.5,
+    'glad': 2.0, 'pleased': 2.0, 'satisfied': 2.0, 'resolved': 2.0, 'fixed': 1.5, 'works': 1.0,
+    'working': 1.0, 'easy': 1.5, 'clear': 1.0, 'quick': 1.0, 'quickly': 1.0, 'smooth': 1.5,
+    'smoothly': 1.5, 'good': 1.5, 'better': 1.0, 'best': 2.0, 'love': 3.0, 'relieved': 2.0,
+    'confident': 1.5, 'success': 2.0, 'successful': 2.0, 'successfully': 2.0, 'solved': 2.0,
+    'absolutely': 1.0, 'exactly': 1.0, 'sure': 0.5, 'welcome': 1.0, 'priority': 0.5,
+    # negative
+    'problem': -1.5, 'problems': -1.5, 'issue': -1.0, 'issues': -1.0, 'error': -2.0, 'errors': -2.0,
+    'fail': -2.0, 'failed': -2.0, 'failing': -2.0, 'failure': -2.0, 'broken': -2.5, 'wrong': -2.0,
+    'trouble': -1.5, 'difficult': -1.5, 'confused': -1.5, 'confusing': -1.5, 'frustrated': -3.0,
+    'frustrating': -3.0, 'annoyed': -2.5, 'angry': -3.0, 'upset': -2.5, 'disappointed': -2.5,
+    'unacceptable': -3.0, 'terrible': -3.0, 'awful': -3.0, 'bad': -2.0, 'worse': -2.5, 'worst': -3.0,
+    'slow': -1.5, 'delay': -1.5, 'delayed': -1.5, 'stuck': -2.0, 'missing': -1.5, 'lost': -2.0,
+    'duplicate': -1.5, 'declined': -2.0, 'overcharged': -2.5, 'concern': -1.0, 'concerned': -1.5,
+    'worried': -1.5, 'urgent': -1.0, 'unable': -1.5, 'cannot': -1.0, 'risk': -1.0, 'complaint': -2.5,
+    'crash': -2.5, 'crashed': -2.5, 'incorrect': -2.0, 'problematic': -2.0, 'again': -0.5
+}
+
+# A negator up to two words before a lexicon word flips and damps it ("not working", "never resolved")
+NEGATORS = frozenset(['not', 'no', 'never', 'nothing', 'neither', 'nor', 'without', "isn't", "wasn't", "aren't",
+                      "don't", "doesn't", "didn't", "can't", "couldn't", "won't", "wouldn't", "haven't", "hasn't"])
+NEGATION_FACTOR = -0.5
+
+# Scores are raw / sqrt(raw^2 + alpha), which maps any sum into (-1, 1)
+NORMALIZATION_ALPHA = 15.0
+
+# Vocabulary ids for batch scoring: 0 is any other word, then lexicon words, negators and the separator
+_VOCABULARY = {word: i for i, word in enumerate(sorted(set(SENTIMENT_LEXICON) | NEGATORS) + [TEXT_SEPARATOR], start=1)}
+
+SPEAKERS = ('Agent (', 'Customer (')
+SENTENCE_PATTERN = re.compile(r'(?<=[.!?])\s+')
+SUMMARY_SENTENCES = 3
+
+STOPWORDS = frozenset("""
+a about after again all also am an and any are as at be because been before being both but by can could
+did do does doing for from had has have having he her here hers him his how i i'm i'll i've if in into is it
+it's its just let let's me more most my no nor not now of off on once only or other our ours out over own
+same she should so some such than that that's the their theirs them then there these they this those
+through to too under until up us very was we we're we'll we've were what when where which while who whom
+why will with would you you're you'll your yours
+""".split())
+
+
+def _vocabulary_tables():
+    weights = np.zeros(len(_VOCABULARY) + 1)
+    negators = np.zeros(len(_VOCABULARY) + 1, dtype=bool)
+    for word, i in _VOCABULARY.items():
+        weights[i] = SENTIMENT_LEXICON.get(word, 0.0)
+        negators[i] = word in NEGATORS
+    return weights, negators
+
+
+def _normalize(raw):
+    return raw / math.sqrt(raw * raw + NORMALIZATION_ALPHA)
+
+
+def sentiment(text):
+    """Lexicon sentiment of a text in [-1, 1], like SNOWFLAKE.CORTEX.SENTIMENT"""
+    words = tokens(text)
+    raw = 0.0
+    for i, word in enumerate(words):
+        weight = SENTIMENT_LEXICON.get(word, 0.0)
+        if weight and (i >= 1 and words[i - 1] in NEGATORS or i >= 2 and words[i - 2] in NEGATORS):
+            weight *= NEGATION_FACTOR
+        raw += weight
+    return round(_normalize(raw), 4)
+
+
+def sentiment_scores(texts):
+    """sentiment() for a batch of texts, with weights and negation applied as array operations
+
+    The whole batch is tokenized in one pass, each word is looked up once to
+    get a vocabulary id, and weights, negation and the per-text sums (one
+    bincount) are array operations, so there is no Python loop per token.
+    Results are identical to sentiment().
+    """
+    require_numpy()
+    ids = np.array(list(map(_VOCABULARY.get, batch_tokens(texts), repeat(0))), dtype=np.int64)
+    weight_table, negator_table = _vocabulary_tables()
+    weights = weight_table[ids]
+    negator = negator_table[ids]
+    separator = ids == _VOCABULARY[TEXT_SEPARATOR]
+
+    # Text each token belongs to; negation never reaches back into the previous text
+    row = np.cumsum(separator)
+    negated = np.zeros(len(ids), dtype=bool)
+    negated[1:] |= negator[:-1] & (row[:-1] == row[1:])
+    negated[2:] |= negator[:-2] & (row[:-2] == row[2:])
+    weights = np.where(negated & (weights != 0), weights * NEGATION_FACTOR, weights)
+
+    raw = np.bincount(row, weights=weights, minlength=len(texts))[:len(texts)]
+    return [round(float(score), 4) for score in raw / np.sqrt(raw * raw + NORMALIZATION_ALPHA)]
+
+
+def sentiment_category(score):
+    """Same thresholds as the CASE in transcripts_enriched.sql"""
+    if score >= 0.1:
+        return 'Positive'
+    if score <= -0.1:
+        return 'Negative'
+    return 'Neutral'
+
+
+def transcript_sentences(text):
+    """(speaker, sentence) pairs in order; speaker is '' for untagged text
+
+    Turns are separated by a literal "\\n\\n" in generated transcripts (real
+    newlines work too) and start with "Agent (Name): " or "Customer (Name): ".
+    """
+    sentences = []
+    for turn in text.replace('\\n', '\n').split('\n'):
+        speaker = ''
+        if turn.startswith(SPEAKERS):
+            close = turn.find('): ')
+            if close != -1:
+                speaker = turn[:turn.index(' ')]
+                turn = turn[close + 3:]
+        sentences.extend((speaker, sentence) for sentence in SENTENCE_PATTERN.split(turn.strip()) if sentence)
+    return sentences
+
+
+def summarize(text, max_sentences=SUMMARY_SENTENCES):
+    """Extractive summary: the customer's first sentence plus the highest-scoring others, in call order
+
+    Sentences score by the average transcript-wide frequency of their content
+    words, so the ones about what the call kept coming back to win.
+    """
+    sentences = transcript_sentences(text)
+    if not sentences:
+        return ''
+    content = [[word for word in tokens(sentence) if word not in STOPWORDS] for _, sentence in sentences]
+    frequency = Counter(word for words in content for word in words)
+    scores = [sum(frequency[word] for word in words) / math.sqrt(len(words)) if words else 0.0 for words in content]
+
+    # The first customer sentence usually states the problem, so it is always kept;
+    # anything before it is greetings
+    first = next((i for i, (speaker, _) in enumerate(sentences) if speaker == 'Customer'), 0)
+    chosen, seen = {first}, {sentences[first][1]}
+    for i in sorted(range(first + 1, len(sentences)), key=lambda i: (-scores[i], i)):
+        if len(chosen) >= max_sentences:
+            break
+        # Repeated lines (customers do say the same thing twice) are only kept once
+        if sentences[i][1] not in seen:
+            chosen.add(i)
+            seen.add(sentences[i][1])
+    return ' '.join(f"{speaker}: {sentence}" if speaker else sentence
+                    for speaker, sentence in (sentences[i] for i in sorted(chosen)))
+
+
+def enriched_row(transcript, score, summary, category=''):
+    """ENRICHED_CALL_TRANSCRIPTS row for a transcript, its sentiment score, summary and category"""
+    text = transcript['transcript_text']
+    duration = int(transcript['call_duration'])
+    return {
+        'transcript_id': transcript['transcript_id'],
+        'ticket_id': transcript['ticket_id'],
+        'call_duration': duration,
+        'call_duration_minutes': round(duration / 60.0, 1),
+        'transcript_text': text,
+        'call_date': transcript['call_date'],
+        'agent_name': transcript['agent_name'],
+        'customer_satisfaction': transcript['customer_satisfaction'],
+        'resolution_provided': transcript['resolution_provided'],
+        'follow_up_needed': transcript['follow_up_needed'],
+        'sentiment_score': score,
+        'sentiment_category': sentiment_category(score),
+        'conversation_category': category,
+        'conversation_summary': summary,
+        'original_text_length': len(text),
+        'summary_length': len(summary),
+        'compression_ratio': round(len(summary) * 100.0 / len(text), 1) if text else 0.0
+    }
+
+
+def enrich_batch(batch, engine='python', classifier=None):
+    """Enriched rows for a batch of transcripts (also the unit of work for worker processes)
+
+    `classifier` is the path of a saved conversation classifier; without one
+    conversation_category is left blank.
+    """
+    texts = [transcript['transcript_text'] for transcript in batch]
+    scores = sentiment_scores(texts) if engine == 'numpy' else [sentiment(text) for text in texts]
+    categories = load_classifier(classifier).predict(texts) if classifier else repeat('')
+    return [enriched_row(transcript, score, summarize(text), category)
+            for transcript, score, text, category in zip(batch, scores, texts, categories)]
+
+
+def _enrich_work(item):
+    return enrich_batch(*item)
+
+
+def iter_enriched(transcripts, batch_size=1000, workers=None, engine='python', classifier=None):
+    """Yield batches of enriched rows in transcript order, serially or across a process pool"""
+    batches = iter_batches(transcripts, batch_size)
+    if workers and workers > 1:
+        # Hand the pool a bounded window of batches so it can't read the whole file ahead
+        with multiprocessing.Pool(workers) as pool:
+            for window in iter_batches(batches, workers * 2):
+                yield from pool.imap(_enrich_work, zip(window, repeat(engine), repeat(classifier)))
+    else:
+        for batch in batches:
+            yield enrich_batch(batch, engine, classifier)
+
+
+def enrich_transcripts(data_dir=None, transcripts_path=None, output_path=None, batch_size=1000, workers=None,
+                       engine='python', output_format='csv', classifier=None, verbose=True):
+    """Write ENRICHED_CALL_TRANSCRIPTS locally from call_transcripts.csv, without Cortex
+
+    Rows are streamed through in batches, so memory depends on the batch size
+    rather than the number of transcripts. conversation_category is filled by
+    the classifier saved at `classifier` (see conversation_classifier.py), if
+    given. Returns (rows written, seconds).
+    """
+    if data_dir is None:
+        data_dir = default_data_dir()
+    if engine == 'numpy':
+        require_numpy()
+    transcripts_path = transcripts_path or os.path.join(data_dir, 'call_transcripts.csv')
+    output_path = output_path or os.path.join(data_dir, os.path.splitext(ENRICHED_FILE)[0] + OUTPUT_EXTENSIONS[output_format])
+
+    started = time.perf_counter()
+    with open_table_sink(output_path, 'enriched_call_transcripts', output_format) as sink:
+        for rows in iter_enriched(iter_csv_table(transcripts_path), batch_size, workers, engine, classifier):
+            sink.write_rows(rows)
+    elapsed = time.perf_counter() - started
+
+    if verbose:
+        rate = sink.rows_written / elapsed if elapsed else 0
+        print(f"Enriched {sink.rows_written} transcripts in {elapsed:.2f}s ({rate:,.0f} rows/sec) -> {output_path}")
+    return sink.rows_written, elapsed
+
+
+def main():
+    """Command line interface"""
+    parser = argparse.ArgumentParser(description="Build ENRICHED_CALL_TRANSCRIPTS locally with stand-ins for Cortex SENTIMENT, SUMMARIZE and AI_CLASSIFY")
+    parser.add_argument('--data-dir', default=None, help="Directory holding call_transcripts.csv (defaults to data/)")
+    parser.add_argument('--transcripts', default=None, help="Transcripts CSV (defaults to call_transcripts.csv in the data directory)")
+    parser.add_argument('--output', default=None, help=f"Output file (defaults to {ENRICHED_FILE} in the data directory)")
+    parser.add_argument('--batch-size', type=int, default=1000, help="Transcripts scored per batch")
+    parser.add_argument('--workers', type=int, default=None, help="Processes to enrich batches with (defaults to serial)")
+    parser.add_argument('--engine', choices=['python', 'numpy'], default='python',
+                        help="Score sentiment one text at a time, or a batch at a time as array operations (requires numpy)")
+    parser.add_argument('--format', choices=sorted(OUTPUT_EXTENSIONS), default='csv',
+                        help="Output format (parquet requires pyarrow)")
+    parser.add_argument('--classifier', default=None, metavar='MODEL',
+                        help="Saved conversation classifier to fill conversation_category with (see conversation_classifier.py)")
+    args = parser.parse_args()
+
+    enrich_transcripts(data_dir=args.data_dir, transcripts_path=args.transcripts, output_path=args.output,
+                       batch_size=args.batch_size, workers=args.workers, engine=args.engine, output_format=args.format,
+                       classifier=args.classifier)
+
+if __name__ == "__main__":
+    main()
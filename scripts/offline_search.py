@@ -0,0 +1,401 @@
+import argparse
+import bisect
+import json
+import math
+import os
+import time
+
+from columnar import np, require_numpy
+from offline_cortex import ENRICHED_FILE
+from table_io import default_data_dir, iter_batches, iter_csv_table
+from text_tokens import TEXT_SEPARATOR, batch_tokens, tokens
+
+# The search services in cortex_search.sql: the column each one searches and the attributes it can filter on
+SEARCH_SERVICES = {
+    'ZENDESK_CONVERSATION_SEARCH': {
+        'on': 'conversation_summary',
+        'attributes': [
+            'transcript_id', 'ticket_id', 'call_date', 'sentiment_category', 'conversation_category',
+            'customer_satisfaction', 'resolution_provided', 'follow_up_needed', 'agent_name', 'organization_name',
+            'organization_type', 'size_category', 'subscription_tier', 'support_tier', 'monthly_revenue', 'priority',
+            'status', 'ticket_type', 'via_channel', 'employee_role', 'employee_department', 'is_primary_contact',
+            'is_active', 'first_resolution_time', 'sla_status', 'satisfaction_level', 'customer_value_tier',
+            'call_duration_category', 'customer_profile', 'agent_profile', 'ticket_profile'
+        ]
+    },
+    'ZENDESK_TRANSCRIPT_SEARCH': {
+        'on': 'transcript_text',
+        'attributes': [
+            'transcript_id', 'ticket_id', 'conversation_summary', 'sentiment_category', 'conversation_category',
+            'agent_name', 'organization_name', 'customer_satisfaction'
+        ]
+    }
+}
+
+# Attributes compared as numbers (@gte/@lte); everything else is compared as text
+NUMERIC_ATTRIBUTES = {'transcript_id', 'ticket_id', 'customer_satisfaction', 'monthly_revenue', 'first_resolution_time'}
+
+# Attributes with at most this many distinct values get one bitmap per value; the rest a sorted index
+BITMAP_MAX_VALUES = 256
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Example searches for --benchmark: the filtered searches in cortex_search.sql, and SI.md's transcript questions
+BENCHMARK_QUERIES = {
+    'ZENDESK_CONVERSATION_SEARCH': [
+        ('payment processing issues', None),
+        ('integration problems', {'AND': [{'@eq': {'subscription_tier': 'premium'}}, {'@eq': {'sentiment_category': 'Negative'}}]}),
+        ('training and education requests', {'AND': [{'@eq': {'organization_type': 'school'}}, {'@eq': {'sla_status': 'SLA_Met'}},
+                                                     {'@gte': {'customer_satisfaction': 4}}]}),
+        ('customer concerns dissatisfaction', {'@eq': {'customer_value_tier': 'High_Value'}}),
+        ('quick resolution excellent service', {'AND': [{'@eq': {'call_duration_category': 'Quick_Call'}},
+                                                        {'@eq': {'resolution_provided': 'Yes'}}]}),
+        ('feature request enhancement improvement', {'@eq': {'conversation_category': 'Feature Requests and Enhancements'}}),
+        ('urgent critical immediate', {'@eq': {'sla_status': 'SLA_Missed'}})
+    ],
+    'ZENDESK_TRANSCRIPT_SEARCH': [
+        ('refund policy cancellation request', None),
+        ('excellent agent responses to technical questions', {'@gte': {'customer_satisfaction': 4}}),
+        ('data privacy security concerns', None),
+        ('customer feedback about specific features', {'@eq': {'conversation_category': 'Feature Requests and Enhancements'}}),
+        ('speak to a manager', {'AND': [{'@eq': {'sentiment_category': 'Negative'}}, {'@lte': {'customer_satisfaction': 2}}]})
+    ]
+}
+
+
+def _yes_no(value):
+    return 'Yes' if value in ('True', 'true', '1') else 'No'
+
+
+def _number(value):
+    if value in ('', None):
+        return None
+    number = float(value)
+    return int(number) if number.is_integer() and '.' not in value else number
+
+
+def iter_search_view(data_dir=None, enriched_path=None):
+    """Rows of CORTEX_SEARCH_ENRICHED_VIEW, joined locally from the generated CSVs
+
+    Customers, employees, tickets and metrics are held in memory for the joins;
+    the enriched transcripts (see offline_cortex.py) are streamed.
+    """
+    if data_dir is None:
+        data_dir = default_data_dir()
+    enriched_path = enriched_path or os.path.join(data_dir, ENRICHED_FILE)
+    customers = {row['customer_id']: row for row in iter_csv_table(os.path.join(data_dir, 'zendesk_customers.csv'))}
+    employees = {row['employee_id']: row for row in iter_csv_table(os.path.join(data_dir, 'zendesk_employees.csv'))}
+    tickets = {row['ticket_id']: row for row in iter_csv_table(os.path.join(data_dir, 'zendesk_tickets.csv'))}
+    metrics = {row['ticket_id']: row for row in iter_csv_table(os.path.join(data_dir, 'ticket_metrics.csv'))}
+
+    for ect in iter_csv_table(enriched_path):
+        t = tickets.get(ect['ticket_id'])
+        c = customers.get(t['customer_id']) if t else None
+        e = employees.get(t['employee_id']) if t else None
+        if c is None or e is None:
+            continue  # INNER JOINs
+        tm = metrics.get(ect['ticket_id'], {})
+        satisfaction = int(ect['customer_satisfaction'])
+        revenue = float(c['monthly_revenue'])
+        minutes = float(ect['call_duration_minutes'])
+        first_resolution = tm.get('first_resolution_time', '')
+        yield {
+            'conversation_summary': ect['conversation_summary'],
+            'transcript_text': ect['transcript_text'],
+            'transcript_id': ect['transcript_id'],
+            'ticket_id': ect['ticket_id'],
+            'call_date': ect['call_date'],
+            'call_duration': ect['call_duration'],
+            'call_duration_minutes': ect['call_duration_minutes'],
+            'sentiment_score': ect['sentiment_score'],
+            'sentiment_category': ect['sentiment_category'],
+            'conversation_category': ect['conversation_category'],
+            'customer_satisfaction': ect['customer_satisfaction'],
+            'resolution_provided': _yes_no(ect['resolution_provided']),
+            'follow_up_needed': _yes_no(ect['follow_up_needed']),
+            'agent_name': ect['agent_name'],
+            'customer_id': c['customer_id'],
+            'organization_name': c['organization_name'],
+            'organization_type': c['organization_type'],
+            'organization_subtype': c['organization_subtype'],
+            'size_category': c['size_category'],
+            'subscription_tier': c['subscription_tier'],
+            'support_tier': c['support_tier'],
+            'monthly_revenue': c['monthly_revenue'],
+            'employee_count': c['employee_count'],
+            'integration_count': c['integration_count'],
+            'priority': t['priority'],
+            'status': t['status'],
+            'ticket_type': t['type'],
+            'via_channel': t['via_channel'],
+            'ticket_created_at': t['created_at'],
+            'ticket_updated_at': t['updated_at'],
+            'employee_first_name': e['first_name'],
+            'employee_last_name': e['last_name'],
+            'employee_email': e['email'],
+            'employee_title': e['title'],
+            'employee_role': e['role'],
+            'employee_department': e['department'],
+            'is_primary_contact': _yes_no(e['is_primary_contact']),
+            'is_active': _yes_no(e['is_active']),
+            'first_resolution_time': first_resolution,
+            'full_resolution_time': tm.get('full_resolution_time', ''),
+            'agent_work_time': tm.get('agent_work_time', ''),
+            'requester_wait_time': tm.get('requester_wait_time', ''),
+            'reply_time': tm.get('reply_time', ''),
+            'reopens': tm.get('reopens', ''),
+            'replies': tm.get('replies', ''),
+            'sla_status': 'SLA_Met' if first_resolution != '' and int(first_resolution) <= 24 else 'SLA_Missed',
+            'satisfaction_level': ('High_Satisfaction' if satisfaction >= 4 else
+                                   'Medium_Satisfaction' if satisfaction >= 3 else 'Low_Satisfaction'),
+            'customer_value_tier': 'High_Value' if revenue >= 1000 else 'Medium_Value' if revenue >= 500 else 'Low_Value',
+            'call_duration_category': ('Quick_Call' if minutes <= 5 else
+                                       'Standard_Call' if minutes <= 20 else 'Extended_Call'),
+            'customer_profile': f"{c['organization_name']} - {c['organization_type']} - {c['size_category']}",
+            'agent_profile': f"{ect['agent_name']} - {e['department']} - {e['role']}",
+            'ticket_profile': f"{t['type']} - {t['priority']} - {t['via_channel']}"
+        }
+
+
+class _TermIds(dict):
+    """Term id of each word, assigned in order of first sight (the separator is -1)"""
+
+    def __init__(self):
+        super().__init__({TEXT_SEPARATOR: -1})
+
+    def __missing__(self, word):
+        value = self[word] = len(self) - 1
+        return value
+
+
+class SearchIndex:
+    """BM25 index over one search service's column, with bitmap and sorted indexes for its attributes
+
+    Postings are stored term by term in two flat arrays (uint32 document
+    numbers, uint16 term frequencies) with an offset per term. Each low-
+    cardinality attribute value is a bitmap (a Python int, bit i for document
+    i), so filters combine with & | ~; numeric and high-cardinality attributes
+    keep documents sorted by value (text as ranks into its sorted distinct
+    values) and turn ranges into bitmaps by bisection.
+    """
+
+    def __init__(self, service, rows, batch_size=10000):
+        require_numpy()
+        self.service = service
+        self.on = SEARCH_SERVICES[service]['on']
+        self.attributes = SEARCH_SERVICES[service]['attributes']
+        self.columns = {name: [] for name in [self.on] + self.attributes}
+
+        term_ids = _TermIds()
+        terms, documents, frequencies, lengths = [], [], [], []
+        count = 0
+        for batch in iter_batches(rows, batch_size):
+            for row in batch:
+                for name, values in self.columns.items():
+                    values.append(_number(row[name]) if name in NUMERIC_ATTRIBUTES else row[name])
+            ids = np.fromiter(map(term_ids.__getitem__, batch_tokens([row[self.on] for row in batch])), dtype=np.int64)
+            separator = ids == -1
+            local = np.cumsum(separator)[~separator]
+            ids = ids[~separator]
+            lengths.append(np.bincount(local, minlength=len(batch)))
+
+            # One posting per (term, document) with its count
+            keys, counts = np.unique(ids * len(batch) + local, return_counts=True)
+            terms.append(keys // len(batch))
+            documents.append(keys % len(batch) + count)
+            frequencies.append(counts)
+            count += len(batch)
+
+        self.count = count
+        self.vocabulary = {word: term for word, term in term_ids.items() if term >= 0}
+        terms = np.concatenate(terms) if terms else np.zeros(0, dtype=np.int64)
+        documents = np.concatenate(documents) if documents else np.zeros(0, dtype=np.int64)
+        frequencies = np.concatenate(frequencies) if frequencies else np.zeros(0, dtype=np.int64)
+        order = np.lexsort((documents, terms))
+        self.postings = documents[order].astype(np.uint32)
+        self.frequencies = np.minimum(frequencies[order], np.iinfo(np.uint16).max).astype(np.uint16)
+        document_frequency = np.bincount(terms, minlength=len(self.vocabulary))
+        self.offsets = np.concatenate([[0], np.cumsum(document_frequency)])
+        self.idf = np.log(1 + (count - document_frequency + 0.5) / (document_frequency + 0.5)).astype(np.float32)
+        self.lengths = np.concatenate(lengths).astype(np.float32) if lengths else np.zeros(0, dtype=np.float32)
+        self.average_length = float(self.lengths.mean()) if count else 0.0
+
+        self.all_documents = (1 << count) - 1
+        self.bitmaps, self.sorted = {}, {}
+        for name in self.attributes:
+            self._index_attribute(name)
+
+    def _bitmap(self, documents):
+        mask = np.zeros(self.count, dtype=bool)
+        mask[documents] = True
+        return int.from_bytes(np.packbits(mask, bitorder='little').tobytes(), 'little')
+
+    def _mask(self, bitmap):
+        packed = np.frombuffer(bitmap.to_bytes((self.count + 7) // 8, 'little'), dtype=np.uint8)
+        return np.unpackbits(packed, bitorder='little')[:self.count].astype(bool)
+
+    def _index_attribute(self, name):
+        values = self.columns[name]
+        distinct = {}
+        codes = np.fromiter((distinct.setdefault(value, len(distinct)) for value in values), dtype=np.int64, count=self.count)
+        if name not in NUMERIC_ATTRIBUTES and len(distinct) <= BITMAP_MAX_VALUES:
+            order = np.argsort(codes, kind='stable')
+            bounds = np.searchsorted(codes[order], np.arange(len(distinct) + 1))
+            self.bitmaps[name] = {value: self._bitmap(order[bounds[code]:bounds[code + 1]]) for value, code in distinct.items()}
+            return
+        if name in NUMERIC_ATTRIBUTES:
+            keys = np.array([math.nan if value is None else value for value in values], dtype=np.float64)
+            ranked = None
+        else:
+            # Dictionary-encoded: each document keeps the rank of its value among the sorted distinct
+            # values (which are the strings already in self.columns), not a fixed-width copy of it
+            ranked = sorted(distinct)
+            rank_of = {value: rank for rank, value in enumerate(ranked)}
+            keys = np.array([rank_of[value] for value in distinct], dtype=np.uint32)[codes]
+        order = np.argsort(keys, kind='stable').astype(np.uint32)
+        self.sorted[name] = (keys[order], order, ranked)
+
+    def _compare(self, operator, name, value):
+        """Bitmap of the documents whose attribute passes @eq, @gte or @lte"""
+        if name not in self.bitmaps and name not in self.sorted:
+            raise ValueError(f"{name} is not an attribute of {self.service}")
+        if name in self.bitmaps:
+            values = self.bitmaps[name]
+            if operator == '@eq':
+                return values.get(value if isinstance(value, str) else str(value), 0)
+            passes = (lambda v: v >= value) if operator == '@gte' else (lambda v: v <= value)
+            bitmap = 0
+            for candidate, bits in values.items():
+                if passes(candidate):
+                    bitmap |= bits
+            return bitmap
+        keys, order, ranked = self.sorted[name]
+        if ranked is not None:
+            # Ranks in [first, last) hold the matching values; bisect the distinct values, then the ranks
+            value = str(value)
+            first = bisect.bisect_left(ranked, value) if operator in ('@eq', '@gte') else 0
+            last = bisect.bisect_right(ranked, value) if operator in ('@eq', '@lte') else len(ranked)
+            return self._bitmap(order[np.searchsorted(keys, first, side='left'):np.searchsorted(keys, last, side='left')])
+        value = float(value)
+        low = np.searchsorted(keys, value, side='left') if operator in ('@eq', '@gte') else 0
+        high = np.searchsorted(keys, value, side='right') if operator in ('@eq', '@lte') else len(keys)
+        if operator == '@gte':
+            high = np.searchsorted(keys, math.inf, side='right')  # NaN (NULL) sorts last and never matches
+        return self._bitmap(order[low:high])
+
+    def filter_bitmap(self, spec):
+        """Bitmap of the documents matching a Cortex Search filter (@eq, @gte, @lte, AND, OR, NOT)"""
+        if not spec:
+            return self.all_documents
+        (operator, argument), = spec.items()
+        if operator == 'AND':
+            bitmap = self.all_documents
+            for clause in argument:
+                bitmap &= self.filter_bitmap(clause)
+            return bitmap
+        if operator == 'OR':
+            bitmap = 0
+            for clause in argument:
+                bitmap |= self.filter_bitmap(clause)
+            return bitmap
+        if operator == 'NOT':
+            return self.all_documents & ~self.filter_bitmap(argument)
+        if operator in ('@eq', '@gte', '@lte'):
+            (name, value), = argument.items()
+            return self._compare(operator, name, value)
+        raise ValueError(f"Unsupported filter operator: {operator}")
+
+    def search(self, query, columns=None, filter=None, limit=10):
+        """Top `limit` documents by BM25 as result dicts, like the "results" of SEARCH_PREVIEW"""
+        columns = columns or [self.on]
+        terms = [self.vocabulary[word] for word in dict.fromkeys(tokens(query)) if word in self.vocabulary]
+        if terms:
+            slices = [slice(self.offsets[term], self.offsets[term + 1]) for term in terms]
+            documents = np.concatenate([self.postings[s] for s in slices])
+            frequencies = np.concatenate([self.frequencies[s] for s in slices]).astype(np.float32)
+            idf = np.repeat(self.idf[terms], [s.stop - s.start for s in slices])
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * self.lengths[documents] / self.average_length)
+            candidates, position = np.unique(documents, return_inverse=True)
+            scores = np.bincount(position, weights=idf * frequencies * (BM25_K1 + 1) / (frequencies + norm))
+        else:
+            candidates, scores = np.zeros(0, dtype=np.uint32), np.zeros(0)
+
+        if filter:
+            bitmap = self.filter_bitmap(filter)
+            keep = self._mask(bitmap)[candidates]
+            candidates, scores = candidates[keep], scores[keep]
+            if not terms:
+                candidates = np.flatnonzero(self._mask(bitmap))[:limit]
+                scores = np.zeros(len(candidates))
+
+        # Highest scores first, ties in document order
+        if len(candidates) > limit:
+            threshold = np.partition(scores, len(scores) - limit)[len(scores) - limit]
+            top = scores >= threshold
+            candidates, scores = candidates[top], scores[top]
+        ranked = np.lexsort((candidates, -scores))[:limit]
+        return [dict({name: self.columns[name][document] for name in columns},
+                     **{'@scores': {'text_match': round(float(score), 4)}})
+                for document, score in zip(candidates[ranked].tolist(), scores[ranked].tolist())]
+
+    def postings_bytes(self):
+        return self.postings.nbytes + self.frequencies.nbytes + self.offsets.nbytes
+
+
+def search_preview(index, query, options='{}'):
+    """JSON like SNOWFLAKE.CORTEX.SEARCH_PREVIEW(service, query, options) for a local index"""
+    options = json.loads(options) if isinstance(options, str) else options
+    results = index.search(query, options.get('columns'), options.get('filter'), options.get('limit', 10))
+    return json.dumps({'results': results})
+
+
+def build_index(service='ZENDESK_CONVERSATION_SEARCH', data_dir=None, enriched_path=None, verbose=True):
+    started = time.perf_counter()
+    index = SearchIndex(service, iter_search_view(data_dir, enriched_path))
+    elapsed = time.perf_counter() - started
+    if verbose:
+        bitmap_bytes = sum((bits.bit_length() + 7) // 8 for values in index.bitmaps.values() for bits in values.values())
+        print(f"Indexed {index.count} documents ({len(index.vocabulary)} terms, {len(index.postings)} postings) "
+              f"for {service} in {elapsed:.2f}s")
+        print(f"  Postings: {index.postings_bytes() / 1024 / 1024:.1f} MB, "
+              f"attribute bitmaps: {bitmap_bytes / 1024 / 1024:.1f} MB for {len(index.bitmaps)} attributes, "
+              f"sorted indexes for {len(index.sorted)}")
+    return index
+
+
+def benchmark(index, repeat=20):
+    """Latency of the service's example searches"""
+    latencies = []
+    for _ in range(repeat):
+        for query, filter in BENCHMARK_QUERIES[index.service]:
+            started = time.perf_counter()
+            index.search(query, filter=filter, limit=10)
+            latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    print(f"\n⏱ {len(latencies)} searches: P50 {latencies[len(latencies) // 2]:.2f} ms, "
+          f"P95 {latencies[int(len(latencies) * 0.95)]:.2f} ms, max {latencies[-1]:.2f} ms")
+
+
+def main():
+    """Command line interface"""
+    parser = argparse.ArgumentParser(description="Search the generated data locally with BM25, mirroring the Cortex Search services")
+    parser.add_argument('query', nargs='?', default=None, help="Search text")
+    parser.add_argument('--service', choices=sorted(SEARCH_SERVICES), default='ZENDESK_CONVERSATION_SEARCH',
+                        help="Search service to mirror")
+    parser.add_argument('--data-dir', default=None, help="Directory holding the generated CSVs (defaults to data/)")
+    parser.add_argument('--enriched', default=None,
+                        help=f"Enriched transcripts from offline_cortex.py (defaults to {ENRICHED_FILE} in the data directory)")
+    parser.add_argument('--options', default='{}',
+                        help='SEARCH_PREVIEW options, e.g. \'{"filter": {"@eq": {"sentiment_category": "Negative"}}, "limit": 5}\'')
+    parser.add_argument('--benchmark', action='store_true', help="Time example searches from cortex_search.sql and SI.md")
+    args = parser.parse_args()
+
+    index = build_index(args.service, args.data_dir, args.enriched)
+    if args.query is not None:
+        print(json.dumps(json.loads(search_preview(index, args.query, args.options)), indent=2))
+    if args.benchmark:
+        benchmark(index)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import json
+import math
+import os
+
+
+class QuantileSketch:
+    """Approximate quantiles of non-negative values with bounded relative error
+
+    Values are counted in logarithmic buckets (each bucket spans a factor of
+    gamma), so any quantile is within `relative_accuracy` of the true value and
+    memory grows with the range of the data, not the number of values.
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value):
+        self.count += 1
+        if value <= 0:
+            self.zero_count += 1
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+
+    def quantile(self, q):
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+
+class RunningStats:
+    """Count, mean, variance (Welford), min and max, plus optional quantiles"""
+
+    def __init__(self, quantiles=False):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = None
+        self.max = None
+        self.sketch = QuantileSketch() if quantiles else None
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        if self.sketch is not None:
+            self.sketch.add(value)
+
+    @property
+    def variance(self):
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self):
+        return math.sqrt(self.variance)
+
+    def quantile(self, q):
+        return self.sketch.quantile(q) if self.sketch is not None else None
+
+    def to_dict(self):
+        result = {
+            'count': self.count,
+            'mean': round(self.mean, 4),
+            'stddev': round(self.stddev, 4),
+            'min': self.min,
+            'max': self.max
+        }
+        if self.sketch is not None and self.count:
+            result['p50'] = round(self.quantile(0.5), 2)
+            result['p95'] = round(self.quantile(0.95), 2)
+        return result
+
+
+class OnlineSummary:
+    """Single-pass summary of a stream of rows
+
+    counts:    fields whose values are tallied
+    numeric:   fields tracked with RunningStats (None values are skipped)
+    quantiles: subset of numeric fields that also get P50/P95
+    grouped:   (value_field, group_field) pairs tracked with RunningStats per group
+
+    Fields are read from the row, or from keyword arguments passed to add() for
+    values derived outside the row (an org type, a text length, a flag).
+    """
+
+    def __init__(self, table, counts=(), numeric=(), quantiles=(), grouped=()):
+        self.table = table
+        self.count = 0
+        self.counts = {field: {} for field in counts}
+        self.numeric = {field: RunningStats(quantiles=field in quantiles) for field in numeric}
+        self.grouped = {(field, by): {} for field, by in grouped}
+
+    def add(self, row, **derived):
+        self.count += 1
+
+        def value(field):
+            return derived[field] if field in derived else row[field]
+
+        for field, tally in self.counts.items():
+            key = value(field)
+            tally[key] = tally.get(key, 0) + 1
+        for field, stats in self.numeric.items():
+            x = value(field)
+            if x is not None:
+                stats.add(x)
+        for (field, by), groups in self.grouped.items():
+            x = value(field)
+            if x is None:
+                continue
+            key = value(by)
+            if key not in groups:
+                groups[key] = RunningStats()
+            groups[key].add(x)
+
+    def tally(self, field, key=True):
+        """How many rows had `field == key`"""
+        return self.counts[field].get(key, 0)
+
+    def to_dict(self):
+        return {
+            'table': self.table,
+            'rows': self.count,
+            'counts': {field: {str(key): n for key, n in tally.items()} for field, tally in self.counts.items()},
+            'numeric': {field: stats.to_dict() for field, stats in self.numeric.items()},
+            'grouped': {f'{field}_by_{by}': {str(key): stats.to_dict() for key, stats in groups.items()}
+                        for (field, by), groups in self.grouped.items()}
+        }
+
+    def write_json(self, csv_path):
+        """Write the summary next to its CSV as <name>.summary.json"""
+        path = summary_path(csv_path)
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return path
+
+
+def summary_path(csv_path):
+    return os.path.splitext(csv_path)[0] + '.summary.json'
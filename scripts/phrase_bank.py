@@ -0,0 +1,739 @@
+import functools
+import string
+
+# Shared text for the ticket and call transcript generators. The tables below are
+# plain literals; ticket_phrases() and call_phrases() freeze them into tuples and
+# pre-parse every template the first time a generator asks for them.
+
+# =====================================================================================
+# TEMPLATE COMPILATION
+# =====================================================================================
+
+_formatter = string.Formatter()
+
+
+def compile_template(text):
+    """Split a str.format-style template into (literal, slot) segments (slot is None at the end)"""
+    return tuple((literal, field or None) for literal, field, _, _ in _formatter.parse(text))
+
+
+def render(template, values):
+    """Fill a compiled template; values is any mapping, looked up once per slot"""
+    parts = []
+    for literal, slot in template:
+        parts.append(literal)
+        if slot is not None:
+            parts.append(values[slot])
+    return ''.join(parts)
+
+
+def freeze(value):
+    """Recursively turn lists into tuples so the bank can be shared safely"""
+    if isinstance(value, dict):
+        return {key: freeze(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def compile_all(value):
+    """Compile every string in a (frozen) nested structure"""
+    if isinstance(value, dict):
+        return {key: compile_all(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return tuple(compile_all(item) for item in value)
+    return compile_template(value)
+
+
+class SlotValues(dict):
+    """Mapping whose values are produced on first lookup by resolve(name)
+
+    Rendering a template through one of these only computes the slots that
+    template actually uses.
+    """
+
+    def __missing__(self, name):
+        value = self[name] = self.resolve(name)
+        return value
+
+    def resolve(self, name):
+        raise KeyError(name)
+
+# =====================================================================================
+# TICKET DESCRIPTIONS
+# =====================================================================================
+
+# Description templates by category with multiple variations
+description_patterns = {
+    'payment_processing': {
+        'urgent_patterns': [
+            "URGENT: {issue} - This is severely impacting our {org_activity} and we need immediate assistance.",
+            "Critical issue with {issue}. We have {impact_scale} affected and need emergency support.",
+            "Emergency: {issue} is preventing all donation processing. Please prioritize this ticket.",
+            "PRIORITY: {issue} - Our {seasonal_context} is at risk. Immediate help needed."
+        ],
+        'normal_patterns': [
+            "We're experiencing {issue} which started {timeframe}. This is affecting our {workflow_area}.",
+            "Hello Support, {issue} and we need guidance on resolution. {additional_context}",
+            "Support needed for {issue}. We've attempted {troubleshooting_attempted} but need expert help.",
+            "Hi team, {issue} is causing delays in our {business_process}. Can you assist?",
+            "Good {time_greeting}, we have {issue} that needs attention. {impact_description}"
+        ],
+        'detailed_patterns': [
+            "We are encountering {issue} in our system. Background: {background_context}. The issue manifests as {specific_symptoms}. We have tried {troubleshooting_attempted} without success. Please advise on next steps.",
+            "Reporting {issue} that began {timeframe}. Environment details: {environment_details}. Impact assessment: {impact_description}. Looking for both immediate resolution and preventive measures.",
+            "Technical issue report: {issue}. This affects {affected_users} users across our {org_structure}. Error patterns: {error_details}. Please provide detailed troubleshooting steps."
+        ]
+    },
+    'setup': {
+        'getting_started': [
+            "New to your platform and need help with {issue}. We're a {org_description} looking to {goal_description}.",
+            "Just signed up and working on {issue}. Our team includes {team_description} and we want to ensure proper setup.",
+            "Beginning our implementation and need guidance on {issue}. Timeline: {timeline_context}."
+        ],
+        'configuration': [
+            "Configuration assistance needed for {issue}. Our specific requirements: {requirements_context}.",
+            "Setup help required: {issue}. We have {technical_context} and need customization guidance.",
+            "Implementation support for {issue}. Organization specifics: {org_specifics}."
+        ]
+    },
+    'training': {
+        'team_training': [
+            "Training request for {issue}. We have {team_size} {team_type} who need to learn the system.",
+            "Educational support needed: {issue}. Our staff includes {staff_description} with varying technical comfort levels.",
+            "Workshop request for {issue}. We'd like to schedule training for our {department} team."
+        ],
+        'individual_help': [
+            "Personal assistance with {issue}. I'm {requester_role} and need to understand {learning_goal}.",
+            "One-on-one help needed for {issue}. My background: {background} and I'm trying to {objective}.",
+            "Individual training on {issue}. I handle {responsibilities} and need to get up to speed quickly."
+        ]
+    },
+    'integration': {
+        'technical': [
+            "Integration issue: {issue}. Technical details: {tech_specs}. Error logs: {error_context}.",
+            "API/sync problem with {issue}. Our setup: {integration_setup}. Need technical assistance.",
+            "Connection failure: {issue}. System details: {system_details}. Requires engineering support."
+        ],
+        'business': [
+            "Data sync issue with {issue} affecting our {business_workflow}. Need business continuity solution.",
+            "Integration problem: {issue} is disrupting our {operational_process}. Please prioritize.",
+            "Workflow interruption due to {issue}. This impacts {business_impact}. Need rapid resolution."
+        ]
+    },
+    'billing': {
+        'inquiry': [
+            "Billing inquiry about {issue}. Our account details: {account_context}. Need clarification.",
+            "Question regarding {issue}. We're reviewing our {billing_context} and need information.",
+            "Account question: {issue}. Looking for details about {billing_aspect}."
+        ],
+        'dispute': [
+            "Billing concern: {issue}. This appears incorrect based on our {expectation_context}.",
+            "Invoice discrepancy: {issue}. Need review of charges for {billing_period}.",
+            "Billing issue requiring attention: {issue}. Please investigate and advise."
+        ]
+    },
+    'feature_request': {
+        'enhancement': [
+            "Feature enhancement idea: {issue}. This would help us {benefit_description}.",
+            "Product suggestion: {issue}. Our use case: {use_case_description}.",
+            "Feature request for {issue}. This would improve our {improvement_area}."
+        ],
+        'new_functionality': [
+            "New feature request: {issue}. We need this capability to {capability_need}.",
+            "Product enhancement: {issue} would enable us to {enablement_goal}.",
+            "Functionality request: {issue} to support our {support_need}."
+        ]
+    },
+    'bug_report': {
+        'technical': [
+            "Bug report: {issue}. Steps to reproduce: {reproduction_steps}. Expected vs actual behavior: {behavior_description}.",
+            "System error: {issue}. Error details: {error_details}. Environment: {environment_info}.",
+            "Technical malfunction: {issue}. This occurs when {trigger_condition}. Screenshots attached."
+        ],
+        'user_impact': [
+            "User-facing issue: {issue} is preventing {user_goal}. Multiple users affected.",
+            "Workflow disruption: {issue} blocks normal operations. Urgent user experience fix needed.",
+            "Customer impact: {issue} affects {customer_interaction}. Please prioritize resolution."
+        ]
+    }
+}
+
+# Slots drawn from a per-org-type list (org types without a list use 'nonprofit')
+description_org_vocabulary = {
+    'org_activity': {
+        'faith': ['worship services', 'tithing campaign', 'building fund drive', 'holiday giving', 'stewardship program'],
+        'school': ['tuition collection', 'fundraising event', 'enrollment period', 'payment processing', 'family billing'],
+        'nonprofit': ['fundraising campaign', 'donor outreach', 'grant application', 'donation drive', 'annual campaign'],
+        'childcare': ['tuition payments', 'family billing', 'enrollment process', 'payment collection', 'fee processing'],
+        'community_ed': ['course enrollment', 'program registration', 'membership billing', 'class payments', 'workshop fees']
+    },
+    'seasonal_context': {
+        'faith': ['Christmas giving season', 'Easter campaign', 'year-end stewardship', 'Thanksgiving appeal', 'Lenten giving'],
+        'school': ['back-to-school enrollment', 'spring fundraiser', 'graduation season', 'winter break processing', 'summer camp registration'],
+        'nonprofit': ['annual gala', 'giving season', 'grant deadline period', 'awareness month campaign', 'year-end drive'],
+        'childcare': ['enrollment period', 'summer program', 'holiday break billing', 'new year registration', 'spring enrollment'],
+        'community_ed': ['course registration', 'workshop season', 'membership renewal', 'program launch', 'community outreach']
+    },
+    'business_process': {
+        'faith': ['Sunday giving collection', 'online tithing', 'building fund donations', 'memorial gifts', 'pledge payments'],
+        'school': ['tuition processing', 'lunch payments', 'activity fees', 'fundraiser collections', 'parent payments'],
+        'nonprofit': ['donor management', 'fundraising operations', 'grant tracking', 'volunteer coordination', 'membership billing'],
+        'childcare': ['parent billing', 'enrollment payments', 'program fees', 'extended care charges', 'supply fees'],
+        'community_ed': ['class registrations', 'workshop payments', 'membership processing', 'program enrollments', 'facility rentals']
+    }
+}
+
+# Impact scale by size category (unknown sizes use 'medium')
+description_impact_scales = {
+    'small': ['several families', '10-15 users', 'multiple members', 'our core team'],
+    'medium': ['dozens of families', '50+ users', 'significant portion of members', 'multiple departments'],
+    'large': ['hundreds of families', '200+ users', 'majority of our community', 'entire organization']
+}
+
+# Slots drawn from a single list
+description_choices = {
+    'troubleshooting_attempted': [
+        'basic troubleshooting steps', 'restarting our browser', 'clearing cache and cookies',
+        'checking with our IT person', 'reviewing documentation', 'testing different browsers',
+        'verifying our internet connection', 'checking account permissions', 'consulting with team members'
+    ],
+    'timeframe': [
+        'yesterday morning', 'two days ago', 'earlier this week', 'last Friday',
+        'over the weekend', 'this morning', 'after our last update', 'since Tuesday',
+        'beginning of this week', 'late last week'
+    ],
+    'time_greeting': ['morning', 'afternoon', 'day'],
+    'platform': ['Windows', 'Mac', 'mixed platform'],
+    'operations_model': ['centralized', 'distributed', 'hybrid'],
+    'technical_level': ['basic', 'intermediate', 'advanced'],
+    'team_size': ['5-8', '10-12', '15-20', '20+'],
+    'team_type': ['staff members', 'volunteers', 'administrators', 'coordinators'],
+    'staff_spread': ['multiple departments', 'different locations', 'various roles'],
+    'department': ['finance', 'administration', 'operations', 'outreach'],
+    'related_work': ['reporting', 'coordination', 'management'],
+    'connection_type': ['REST API', 'webhook integration', 'batch sync', 'real-time connection'],
+    'integration_product': ['QuickBooks Online', 'Salesforce', 'custom CRM', 'accounting software'],
+    'infrastructure': ['cloud-based', 'on-premise', 'hybrid'],
+    'billing_context': ['monthly charges', 'annual subscription', 'usage fees', 'service costs'],
+    'billing_aspect': ['subscription tier', 'usage calculations', 'discount application', 'payment timing'],
+    'expectation_basis': ['contract terms', 'initial agreement', 'previous billing', 'quoted pricing'],
+    'billing_period': ['this month', 'last quarter', 'annual billing', 'recent charges'],
+    'failure_mode': ['freezes', 'errors', 'crashes', 'times out']
+}
+
+# Slots built from other slots; every nested slot is drawn afresh
+description_composites = {
+    'workflow_area': "{business_process}",
+    'affected_users': "{impact_scale}",
+    'business_workflow': "{business_process}",
+    'operational_process': "{org_activity}",
+    'impact_description': "This affects {impact_scale} in our {org_activity}",
+    'additional_context': "We noticed this during our {business_process}",
+    'background_context': "We're a {org_description} that relies heavily on this functionality",
+    'specific_symptoms': "Users report issues when trying to {business_process_stem}",
+    'environment_details': "Our {size_category} {org_type} organization using {platform} systems",
+    'org_structure': "{org_type} with {operations_model} operations",
+    'goal_description': "streamline our {org_activity}",
+    'team_description': "{impact_scale} including {requester_role}s",
+    'timeline_context': "Planning to launch during {seasonal_context_lower}",
+    'requirements_context': "Support for {business_process} with {impact_scale}",
+    'technical_context': "{technical_level} technical capabilities",
+    'org_specifics': "We're a {org_description}",
+    'staff_description': "{impact_scale} across {staff_spread}",
+    'learning_goal': "effectively manage {business_process}",
+    'background': "I'm responsible for {org_activity}",
+    'objective': "optimize our {business_process}",
+    'responsibilities': "{org_activity} and related {related_work}",
+    'tech_specs': "Using {connection_type}",
+    'error_context': "Error occurs during {business_process}",
+    'integration_setup': "{integration_product} integration",
+    'system_details': "{size_title} organization with {infrastructure} infrastructure",
+    'business_impact': "our ability to {business_process}",
+    'account_context': "We're a {size_category} {org_type} organization",
+    'expectation_context': "our {expectation_basis}",
+    'benefit_description': "better serve our {impact_scale}",
+    'use_case_description': "We need to {business_process} more efficiently",
+    'improvement_area': "{org_activity} management",
+    'capability_need': "support our {seasonal_context_lower}",
+    'enablement_goal': "expand our {org_activity}",
+    'support_need': "growing {business_process} demands",
+    'reproduction_steps': "Occurs when accessing {business_process} during {seasonal_context_lower}",
+    'behavior_description': "Expected normal {business_process}, but system {failure_mode}",
+    'error_details': "Error appears during {business_process}",
+    'environment_info': "{size_title} {org_type} environment with {impact_scale}",
+    'trigger_condition': "users attempt {business_process}",
+    'user_goal': "completing {business_process}",
+    'customer_interaction': "our {impact_scale}"
+}
+
+# Organization descriptions by org type (and subtype for faith and school)
+description_org_descriptions = {
+    'faith': {
+        'church': "{size_title} congregation with active {seasonal_context_lower}",
+        'synagogue': "{size_title} Jewish community focused on {org_activity}",
+        'mosque': "{size_title} Islamic center managing {org_activity}"
+    },
+    'school': {
+        'elementary': "{size_title} elementary school handling {business_process}",
+        'middle': "{size_title} middle school with {impact_scale}",
+        'high': "{size_title} high school managing {business_process}"
+    },
+    'nonprofit': "{size_title} nonprofit organization focused on {org_activity}",
+    'childcare': "{size_title} childcare center with {impact_scale}",
+    'community_ed': "{size_title} community education program offering {business_process}",
+    'default': "{size_title} organization"
+}
+
+description_requester_roles = {
+    'admin': 'system administrator',
+    'finance': 'finance team member',
+    'volunteer': 'volunteer coordinator',
+    'pastor': 'pastoral staff',
+    'principal': 'school administrator',
+    'teacher': 'faculty member',
+    'director': 'program director'
+}
+
+
+@functools.lru_cache(maxsize=None)
+def ticket_phrases():
+    """Frozen, pre-parsed ticket description bank (built on first use)"""
+    return {
+        'patterns': compile_all(freeze(description_patterns)),
+        'org_vocabulary': freeze(description_org_vocabulary),
+        'impact_scales': freeze(description_impact_scales),
+        'choices': freeze(description_choices),
+        'composites': compile_all(freeze(description_composites)),
+        'org_descriptions': compile_all(freeze(description_org_descriptions)),
+        'requester_roles': dict(description_requester_roles)
+    }
+
+# =====================================================================================
+# CALL TRANSCRIPTS
+# =====================================================================================
+
+# 1. DYNAMIC CONVERSATION OPENINGS (50+ variations)
+conversation_openings = {
+    'agent_greetings': [
+        "Hi, this is {agent_name} with ZENDESK support. How can I help you today?",
+        "Thank you for calling ZENDESK, this is {agent_name}. What can I do for you?",
+        "Good {time_of_day}, you've reached ZENDESK customer service. This is {agent_name}.",
+        "Hello and welcome to ZENDESK support. My name is {agent_name}.",
+        "Thanks for contacting ZENDESK. This is {agent_name} speaking.",
+        "Hi there! {agent_name} here from ZENDESK support team.",
+        "Good {time_of_day}! This is {agent_name} with ZENDESK customer care.",
+        "Hello, {agent_name} from ZENDESK support. How may I assist you?",
+        "Thanks for calling in today. This is {agent_name}.",
+        "Hi, {agent_name} with ZENDESK. What brings you to us today?"
+    ],
+    'customer_openings': [
+        "Hi {agent_name}, I'm calling about {issue_brief}",
+        "Hello, I hope you can help me with {issue_brief}",
+        "Good {time_of_day}, we're having trouble with {issue_brief}",
+        "Hi there, I need assistance with {issue_brief}",
+        "Hello {agent_name}, I'm reaching out because {issue_brief}",
+        "Hi, I was hoping you could help us resolve {issue_brief}",
+        "Good {time_of_day}, we've been experiencing {issue_brief}",
+        "Hello, I'm calling to get help with {issue_brief}",
+        "Hi {agent_name}, we really need help with {issue_brief}",
+        "Good {time_of_day}, I'm calling about {issue_brief}"
+    ]
+}
+
+# 2. PROBLEM DESCRIPTION MODULES (100+ variations per category)
+problem_descriptions = {
+    'payment_issues': [
+        "our payment processing system isn't working correctly",
+        "duplicate charges appearing on our account",
+        "failed transactions that still show as pending",
+        "our card being declined even though it's valid",
+        "unexpected fees that weren't disclosed upfront",
+        "payment confirmations not being sent to donors",
+        "recurring donations stopping without explanation",
+        "our payment gateway timing out frequently",
+        "charges appearing for services we didn't use",
+        "bank deposit amounts not matching our records",
+        "payment failures during high-traffic periods",
+        "incorrect processing of refund requests",
+        "our donor payment methods being marked as invalid",
+        "transaction reports showing incomplete data",
+        "payment processing delays affecting our cash flow"
+    ],
+    'integration_issues': [
+        "our QuickBooks sync that stopped working last week",
+        "data not transferring properly to our CRM system",
+        "our website integration showing error messages",
+        "API connections timing out repeatedly",
+        "our donor management system not receiving updates",
+        "accounting software import failing with format errors",
+        "webhook notifications not being delivered",
+        "our membership database not syncing properly",
+        "third-party app connections being dropped",
+        "data mapping issues between systems",
+        "authentication errors with our integrations",
+        "our reporting tools not pulling current data",
+        "custom field mappings getting reset",
+        "integration performance being extremely slow",
+        "our backup systems not receiving data feeds"
+    ],
+    'training_needs': [
+        "learning how to set up recurring donation campaigns",
+        "understanding the new reporting dashboard features",
+        "training our volunteers on the donation processing system",
+        "getting our staff up to speed on the mobile app",
+        "learning best practices for donor communication",
+        "understanding how to customize our giving forms",
+        "training on the event management module",
+        "learning to generate custom financial reports",
+        "understanding security settings and user permissions",
+        "getting familiar with the bulk operations features",
+        "learning how to set up automated thank you messages",
+        "understanding the peer-to-peer fundraising tools",
+        "training on the pledge management system",
+        "learning to use the donor analytics features",
+        "getting help with campaign performance optimization"
+    ],
+    'feature_requests': [
+        "exploring options for text-to-give functionality",
+        "looking into mobile wallet payment options",
+        "investigating peer-to-peer fundraising capabilities",
+        "learning about advanced reporting features",
+        "exploring multi-location management tools",
+        "investigating custom branding options for our forms",
+        "looking into automated donor segmentation features",
+        "exploring integration options for our email platform",
+        "investigating compliance and audit trail features",
+        "learning about donor portal self-service options",
+        "exploring options for handling planned giving",
+        "investigating membership management capabilities",
+        "looking into volunteer hour tracking integration",
+        "exploring options for grant management features",
+        "investigating social media integration capabilities"
+    ],
+    'technical_problems': [
+        "our donation forms loading very slowly for users",
+        "error messages appearing during the checkout process",
+        "our dashboard not displaying current information",
+        "mobile app crashes when processing donations",
+        "security alerts that we don't understand",
+        "our admin panel being inaccessible intermittently",
+        "data export functions not working properly",
+        "email notifications not being delivered consistently",
+        "our custom domain setup having certificate issues",
+        "database connection errors affecting operations",
+        "our backup and recovery processes failing",
+        "performance issues during peak donation periods",
+        "our two-factor authentication not working correctly",
+        "browser compatibility issues with our donation pages",
+        "our scheduled reports not generating automatically"
+    ]
+}
+
+# 3. AGENT RESPONSE MODULES (75+ variations per situation)
+agent_responses = {
+    'empathy_acknowledgment': [
+        "I completely understand how frustrating that must be",
+        "I can definitely see why this would be concerning for you",
+        "That sounds really challenging, and I want to help resolve this",
+        "I appreciate you bringing this to our attention",
+        "I can imagine how disruptive this has been to your operations",
+        "That's definitely not the experience we want you to have",
+        "I understand the urgency of getting this resolved quickly",
+        "I can see why this would be impacting your donor relationships",
+        "That must be really stressful for your team to deal with",
+        "I appreciate your patience while we work through this together"
+    ],
+    'investigation_starts': [
+        "Let me pull up your account details right away",
+        "I'm going to investigate this thoroughly for you",
+        "Let me check what's happening in your system",
+        "I'll review your recent activity to understand the issue",
+        "Let me access your account and see what's going on",
+        "I'm going to dig into the technical details here",
+        "Let me examine your configuration settings",
+        "I'll check our system logs to identify the problem",
+        "Let me review your account history to find the cause",
+        "I'm going to run some diagnostics on your setup"
+    ],
+    'solution_presentation': [
+        "I found the issue and here's what I can do to fix it",
+        "I have a solution that should resolve this completely",
+        "I can implement a fix right now that will address this",
+        "I've identified the problem and have several options for you",
+        "I can resolve this immediately and prevent it from happening again",
+        "I have both a quick fix and a long-term solution for you",
+        "I can correct this issue and set up monitoring to prevent recurrence",
+        "I found exactly what's causing this and can fix it today",
+        "I have a comprehensive solution that addresses all aspects of this",
+        "I can implement changes that will solve this permanently"
+    ],
+    'process_explanation': [
+        "Let me walk you through exactly what I'm doing",
+        "I'll explain each step as I make these changes",
+        "Here's the process I'm following to resolve this",
+        "Let me show you what's happening behind the scenes",
+        "I'll break down the technical details for you",
+        "Let me explain why this happened and how we're fixing it",
+        "I'll walk you through the solution step by step",
+        "Here's what I'm implementing and why it will work",
+        "Let me explain the technical process for this fix",
+        "I'll describe what each change accomplishes"
+    ]
+}
+
+# 4. CONTEXTUAL ELEMENTS BY ORGANIZATION TYPE
+org_specific_context = {
+    'faith': {
+        'seasonal_refs': ['Christmas season', 'Easter giving', 'Thanksgiving appeals', 'year-end stewardship', 'Lenten giving'],
+        'terminology': ['congregation', 'stewardship', 'tithe', 'offering', 'ministry', 'fellowship', 'worship', 'pastor', 'deacon'],
+        'specific_needs': ['online giving during service', 'text-to-give for events', 'memorial donations', 'building fund campaigns']
+    },
+    'school': {
+        'seasonal_refs': ['back-to-school season', 'graduation time', 'winter break', 'spring fundraisers', 'summer enrollment'],
+        'terminology': ['tuition', 'enrollment', 'parent portal', 'student accounts', 'fundraiser', 'PTA', 'athletics', 'principal'],
+        'specific_needs': ['payment plans', 'family accounts', 'activity fees', 'lunch money', 'sports team fundraising']
+    },
+    'nonprofit': {
+        'seasonal_refs': ['annual campaign', 'giving season', 'grant deadlines', 'awareness month', 'fundraising gala'],
+        'terminology': ['donors', 'supporters', 'mission', 'impact', 'programs', 'volunteers', 'beneficiaries', 'board'],
+        'specific_needs': ['peer-to-peer campaigns', 'event ticketing', 'corporate partnerships', 'grant tracking']
+    }
+}
+
+# 5. DYNAMIC CONVERSATION BRANCHES
+conversation_branches = {
+    'technical_deep_dive': [
+        "Can you tell me more about when this first started happening?",
+        "Let me check if this is related to any recent system updates",
+        "I want to verify your current configuration settings",
+        "Let me review the error logs to pinpoint the exact cause"
+    ],
+    'process_clarification': [
+        "Just to make sure I understand correctly, you're seeing {specific_issue}?",
+        "Let me confirm the timeline - this started around {timeframe}?",
+        "To clarify, this is affecting your system specifically?",
+        "I want to verify that this is what you're experiencing"
+    ],
+    'solution_expansion': [
+        "I can also show you some additional features that might help",
+        "While we're working on this, let me mention some related improvements",
+        "I think you might benefit from some other capabilities we offer",
+        "This gives us a good opportunity to optimize your setup further"
+    ],
+    'follow_up_planning': [
+        "I'll monitor this for the next few days to ensure it's working properly",
+        "Let me schedule a follow-up to check how everything is performing",
+        "I want to make sure you're completely satisfied with this resolution",
+        "I'll send you some additional resources that might be helpful"
+    ]
+}
+
+
+# Extra conversation rounds for longer calls, by the topic the ticket description
+# points to. Topics without a round fall back to 'general'.
+call_topic_phrases = {
+    'payment': {
+        'troubleshooting_steps': [
+            "Let me check your payment gateway configuration and transaction logs.",
+            "I'm reviewing your merchant account settings and processing rules.",
+            "Let me examine the payment flow and identify where the transaction is failing.",
+            "I'm going to test your payment processing with our sandbox environment.",
+            "Let me verify your bank account details and ACH authorization settings."
+        ],
+        'customer_concerns': [
+            "Will our donors' payment information be secure during this process?",
+            "How will this affect our recurring donations and scheduled payments?",
+            "Should we notify our donors about potential payment delays?",
+            "What's the risk of losing transactions during the fix?",
+            "Can we set up backup payment processing while this is resolved?"
+        ],
+        'detailed_responses': [
+            "I can assure you all donor payment information remains completely secure. The issue is in the processing flow, not data storage. I'm implementing a fix that will restore normal payment processing within 2-4 hours.",
+            "Your recurring donations will be automatically retried once we resolve this. I'm setting up monitoring to ensure all scheduled payments process correctly going forward.",
+            "This appears to be related to recent banking regulations. I'm updating your payment processing rules to ensure full compliance with the new requirements.",
+            "I'm implementing additional validation checks to prevent payment failures and setting up real-time alerts for any processing issues."
+        ],
+        'complex_discussion': [
+            "Let me explain the payment processing architecture and how transactions flow through our system.",
+            "I want to show you different payment methods and redundancy options we can set up for your organization.",
+            "Let me walk you through our enterprise payment security protocols and compliance measures.",
+            "I'm going to coordinate with our payment processing team to implement enhanced fraud protection for your account."
+        ],
+        'clarification_questions': [
+            "How does this payment issue affect your donors' giving experience?",
+            "What's your typical transaction volume and timing patterns?",
+            "Are there any PCI compliance requirements we need to consider?",
+            "How do you handle failed payments and donor communication currently?"
+        ],
+        'detailed_explanations': [
+            "I'll implement a seamless retry system for failed payments and set up automated donor notifications with clear next steps.",
+            "Based on your volume, I'm setting up dedicated processing channels and real-time monitoring to ensure optimal performance.",
+            "I'll coordinate with our compliance team to ensure all PCI requirements are met and provide you with updated security documentation.",
+            "I'm creating an automated donor communication workflow that handles payment issues professionally while maintaining donor relationships."
+        ],
+        'escalation_content': [
+            "I'm bringing in our senior payment processing specialist to provide additional expertise on this complex financial integration.",
+            "Let me connect you with our merchant services team who can provide hands-on assistance with payment gateway optimization.",
+            "I'm scheduling a dedicated follow-up call with our compliance team to address the regulatory aspects of your payment processing.",
+            "Given the complexity of your payment volume, I'm arranging for our enterprise payment team to take over this case."
+        ],
+        'solution_planning': [
+            "I'm creating a comprehensive payment optimization plan with specific SLA targets, fraud prevention measures, and donor experience improvements.",
+            "Let me document all the payment gateway changes we've discussed and create a detailed implementation roadmap with rollback procedures.",
+            "I'll set up daily monitoring calls during the payment system transition to ensure zero transaction downtime.",
+            "I'm preparing a detailed payment processing specification document for your finance team and auditors to review."
+        ]
+    },
+    'integration': {
+        'troubleshooting_steps': [
+            "Let me check your API credentials and authentication tokens.",
+            "I'm reviewing the data sync logs to identify where the connection is breaking.",
+            "Let me test the webhook endpoints and verify the data mapping configuration.",
+            "I'm going to examine your integration settings and permission levels.",
+            "Let me validate the data format and check for any recent schema changes."
+        ],
+        'customer_concerns': [
+            "Will this affect our financial reporting and accounting records?",
+            "How current is our data and what might be missing?",
+            "Should we pause data entry until the sync is working again?",
+            "What's the risk of duplicate records when the sync resumes?",
+            "Can we manually export data as a backup while this is fixed?"
+        ],
+        'detailed_responses': [
+            "Your accounting data integrity is our top priority. I'm implementing a sync validation process that will ensure all transactions are properly matched between systems.",
+            "I can provide you with a data export covering the affected period. Once we restore the sync, I'll run a reconciliation to ensure nothing was missed.",
+            "This appears to be related to API version updates. I'm updating your integration to use the latest version with improved error handling and retry logic.",
+            "I'm setting up duplicate detection rules and will run a cleanup process to ensure your data remains accurate and consolidated."
+        ],
+        'complex_discussion': [
+            "Let me explain the data integration architecture and how information flows between your systems.",
+            "I want to show you different sync strategies and backup options for maintaining data consistency.",
+            "Let me walk you through our enterprise API security and rate limiting protocols.",
+            "I'm going to coordinate with our integration team to implement real-time monitoring and alerting for your data flows."
+        ],
+        'clarification_questions': [
+            "How critical is real-time data sync for your daily operations?",
+            "What's your data volume and how often do you need synchronization?",
+            "Are there any audit trail requirements for financial data transfers?",
+            "How do you currently handle data discrepancies between systems?"
+        ],
+        'detailed_explanations': [
+            "I'll set up near real-time sync with automated conflict resolution and detailed logging for audit purposes.",
+            "Based on your volume, I'm implementing batch processing with incremental updates to optimize performance while maintaining accuracy.",
+            "I'll create comprehensive audit trails that track every data change with timestamps and user attribution for compliance reporting.",
+            "I'm implementing automated data validation rules that will catch and resolve discrepancies before they impact your operations."
+        ],
+        'escalation_content': [
+            "I'm bringing in our senior integration architect to provide additional expertise on this complex data synchronization challenge.",
+            "Let me connect you with our API development team who can provide hands-on assistance with custom integration solutions.",
+            "I'm scheduling a dedicated follow-up call with our data engineering team to address the performance optimization aspects.",
+            "Given the complexity of your data environment, I'm arranging for our enterprise integration team to take over this case."
+        ],
+        'solution_planning': [
+            "I'm creating a comprehensive data integration plan with specific sync schedules, error handling protocols, and data validation checkpoints.",
+            "Let me document all the API changes we've discussed and create a detailed implementation roadmap with testing phases.",
+            "I'll set up automated monitoring and alert systems to track data flow health and catch any integration issues immediately.",
+            "I'm preparing a detailed technical integration specification document for your IT team and data administrators to review."
+        ]
+    },
+    'training': {
+        'troubleshooting_steps': [
+            "Let me set up a personalized training session tailored to your specific needs.",
+            "I'm going to walk you through each feature step-by-step with your actual data.",
+            "Let me create custom documentation that matches your organization's workflow.",
+            "I'm going to set up practice scenarios using your real use cases.",
+            "Let me schedule follow-up sessions to ensure you're comfortable with all features."
+        ],
+        'customer_concerns': [
+            "How long will it take our team to become proficient with the system?",
+            "What resources are available for ongoing training and support?",
+            "Can you provide training materials specific to our organization type?",
+            "How do we ensure all staff members get proper training?",
+            "What's the best way to train new staff members as we grow?"
+        ],
+        'detailed_responses': [
+            "I'll create a comprehensive training plan that covers both basic functions and advanced features specific to faith-based organizations. Most teams become proficient within 2-3 weeks.",
+            "I'm setting up access to our learning portal with role-based training modules. You'll also have direct access to our support team for any questions.",
+            "I'll provide customized quick-reference guides and video tutorials that show exactly how to handle your most common scenarios.",
+            "I'm scheduling a train-the-trainer session with your key staff so they can help onboard new team members efficiently."
+        ]
+    },
+    'general': {
+        'troubleshooting_steps': [
+            "Let me walk you through the diagnostic steps I'm running on your account.",
+            "I can see several configuration options that might be causing this issue.",
+            "Let me check your historical data to identify any patterns or changes.",
+            "I'm going to run a few tests to isolate the root cause of this problem.",
+            "Let me verify your current settings and compare them to our recommended configuration."
+        ],
+        'customer_concerns': [
+            "How long do you think this will take to resolve completely?",
+            "Will this affect any of our other systems or processes?",
+            "Can you explain what might have caused this issue in the first place?",
+            "Are there any preventive measures we should take to avoid this in the future?",
+            "What should I tell my team about this issue while we're working on it?"
+        ],
+        'detailed_responses': [
+            "That's a great question. Based on what I'm seeing, this typically takes about 24-48 hours to fully resolve. I'll monitor the implementation closely and keep you updated on progress.",
+            "I can assure you this won't impact your other systems. The issue is isolated to this specific module. Let me explain exactly what's happening and why it's contained.",
+            "This appears to be related to a recent platform update. I'm implementing additional safeguards to prevent similar issues in the future.",
+            "I'm setting up proactive monitoring alerts so we can catch any similar issues before they impact your users. This will give us much better visibility going forward."
+        ],
+        'complex_discussion': [
+            "Let me explain the technical architecture involved here so you understand why this is happening.",
+            "I want to show you a few different approaches we can take to solve this problem.",
+            "Let me walk you through our enterprise-level troubleshooting protocol for this type of issue.",
+            "I'm going to coordinate with our engineering team to implement a custom solution for your specific use case."
+        ],
+        'clarification_questions': [
+            "Can you help me understand how this fits into your overall workflow?",
+            "What's your timeline for implementing these changes?",
+            "Are there any compliance or security considerations I should be aware of?",
+            "How will this impact your users during the transition period?"
+        ],
+        'detailed_explanations': [
+            "Absolutely. Let me break down the implementation timeline and what you can expect at each stage.",
+            "Good point. I'll coordinate with our compliance team to ensure we meet all your regulatory requirements.",
+            "I'll create a detailed migration plan that minimizes any disruption to your users.",
+            "Let me set up a dedicated support channel for your team during this transition."
+        ],
+        'escalation_content': [
+            "I'm bringing in our senior technical specialist to provide additional expertise on this complex issue.",
+            "Let me connect you with our implementation team who can provide hands-on assistance with the setup.",
+            "I'm scheduling a dedicated follow-up call with our product team to address the feature enhancement aspects.",
+            "Given the complexity of your environment, I'm arranging for our enterprise support team to take over this case."
+        ],
+        'solution_planning': [
+            "I'm creating a comprehensive action plan with specific timelines, milestones, and success criteria.",
+            "Let me document all the configuration changes we've discussed and create a detailed implementation roadmap.",
+            "I'll set up regular check-in calls to monitor progress and address any questions that come up.",
+            "I'm preparing a detailed technical specification document for your IT team to review."
+        ]
+    }
+}
+
+# Call phrase lists that are str.format templates
+call_templates = {
+    ('conversation_openings', 'agent_greetings'),
+    ('conversation_openings', 'customer_openings'),
+    ('conversation_branches', 'process_clarification')
+}
+
+
+@functools.lru_cache(maxsize=None)
+def call_phrases():
+    """Frozen call transcript bank with its templates pre-parsed (built on first use)"""
+    bank = freeze({
+        'conversation_openings': conversation_openings,
+        'problem_descriptions': problem_descriptions,
+        'agent_responses': agent_responses,
+        'org_specific_context': org_specific_context,
+        'conversation_branches': conversation_branches
+    })
+    for group, name in call_templates:
+        bank[group][name] = compile_all(bank[group][name])
+    topics = freeze(call_topic_phrases)
+    general = topics['general']
+    bank['call_topics'] = {topic: {**general, **phrases} for topic, phrases in topics.items()}
+    return bank
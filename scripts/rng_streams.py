@@ -0,0 +1,25 @@
+import hashlib
+import random
+
+
+def resolve_seed(seed=None):
+    """Return the given global seed, or pick a fresh one so the run can still be reproduced"""
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(63)
+        print(f"Using random seed {seed} (pass --seed {seed} to reproduce this run)")
+    return seed
+
+
+def derive_seed(global_seed, entity_id, stage):
+    """Derive a 64-bit seed from (global_seed, entity_id, stage)
+
+    The hash only depends on its three inputs, so an entity's stream is the same
+    no matter which worker generates it or what was generated before it.
+    """
+    key = f'{global_seed}\x1f{stage}\x1f{entity_id}'.encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'big')
+
+
+def entity_rng(global_seed, entity_id, stage):
+    """Independent random.Random stream for one entity in one generation stage"""
+    return random.Random(derive_seed(global_seed, entity_id, stage))
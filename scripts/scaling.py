@@ -0,0 +1,31 @@
+# Scale factor 1 reproduces the original dataset: 1,000 customers split across
+# organization types, which in turn drives ~4k employees, ~20k tickets and
+# ~13.5k call transcripts. Every downstream table is derived per customer, so
+# scaling the customer targets scales the whole chain proportionally.
+BASE_ORG_TYPE_TARGETS = {
+    'faith': 640,
+    'school': 200,
+    'nonprofit': 100,
+    'childcare': 40,
+    'community_ed': 20
+}
+
+MAX_EMPLOYEES_PER_CUSTOMER = 5
+
+
+def scaled_org_type_targets(scale_factor=1):
+    """Return the customer count per organization type for a scale factor"""
+    if scale_factor <= 0:
+        raise ValueError(f"scale_factor must be positive, got {scale_factor}")
+    return {org_type: max(1, int(round(count * scale_factor)))
+            for org_type, count in BASE_ORG_TYPE_TARGETS.items()}
+
+
+def scaled_customer_count(scale_factor=1):
+    """Return the total number of customers for a scale factor"""
+    return sum(scaled_org_type_targets(scale_factor).values())
+
+
+def id_width(max_id):
+    """Zero-padding width for sequential IDs, never narrower than the original 4 digits"""
+    return max(4, len(str(max_id)))
@@ -0,0 +1,254 @@
+import argparse
+import functools
+import json
+import math
+import os
+import time
+
+from columnar import np, require_numpy
+from conversation_classifier import FEATURE_BITS, hashed_features
+from offline_cortex import ENRICHED_FILE
+from table_io import default_data_dir, iter_batches, iter_csv_table
+
+# Columns that can be embedded, and the file each is read from
+SOURCES = {
+    'transcript_text': 'call_transcripts.csv',
+    'conversation_summary': ENRICHED_FILE
+}
+
+DIMENSIONS = 256
+
+# Each hashed n-gram is spread over this many dimensions with random signs (a sparse random projection)
+PROJECTION_NONZEROS = 4
+PROJECTION_SEED = 20241120
+
+# IVF lists: about sqrt(N) k-means centroids, trained on a sample of the vectors
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE_PER_LIST = 64
+DEFAULT_NPROBE = 8
+
+# Below this many vectors a query just scans them all
+BRUTE_FORCE_MAX = 2000
+
+VECTORS_FILE = 'vectors.f32'
+IDS_FILE = 'ids.npy'
+IDF_FILE = 'idf.npy'
+IVF_FILE = 'ivf.npz'
+META_FILE = 'meta.json'
+
+
+@functools.lru_cache(maxsize=None)
+def _projection(bits, dimensions):
+    """Target dimensions and signs for every hash bucket, the same on every run"""
+    rng = np.random.default_rng(PROJECTION_SEED)
+    targets = rng.integers(0, dimensions, size=(1 << bits, PROJECTION_NONZEROS), dtype=np.int32)
+    signs = rng.choice(np.array([-1.0, 1.0], dtype=np.float32), size=(1 << bits, PROJECTION_NONZEROS))
+    return targets, signs
+
+
+def embed(texts, idf, dimensions=DIMENSIONS, bits=FEATURE_BITS):
+    """Unit-length float32 vectors for a batch of texts: hashed TF-IDF n-grams, randomly projected"""
+    require_numpy()
+    rows, columns, values = hashed_features(texts, bits)
+    targets, signs = _projection(bits, dimensions)
+    weights = (values * idf[columns])[:, None] * signs[columns]
+    keys = rows[:, None] * dimensions + targets[columns]
+    vectors = np.bincount(keys.ravel(), weights=weights.ravel(), minlength=len(texts) * dimensions)
+    vectors = vectors.reshape(len(texts), dimensions).astype(np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def index_dir(data_dir, column):
+    return os.path.join(data_dir, f'semantic_index_{column}')
+
+
+def _texts(path, column, batch_size):
+    """(ids, texts) batches from the source CSV"""
+    for batch in iter_batches(iter_csv_table(path), batch_size):
+        yield [int(row['transcript_id']) for row in batch], [row[column] for row in batch]
+
+
+def kmeans(vectors, lists, rng, iterations=KMEANS_ITERATIONS):
+    """Spherical k-means: unit-length centroids that maximize cosine similarity to their members"""
+    centroids = vectors[rng.choice(len(vectors), size=lists, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = (vectors @ centroids.T).argmax(axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, vectors)
+        empty = np.bincount(assignment, minlength=lists) == 0
+        sums[empty] = vectors[rng.choice(len(vectors), size=int(empty.sum()))]  # restart empty lists
+        centroids = sums / np.maximum(np.linalg.norm(sums, axis=1, keepdims=True), 1e-12)
+    return centroids.astype(np.float32)
+
+
+class SemanticIndex:
+    """Embedded texts in a memory-mapped float32 matrix, searched through IVF lists or exhaustively"""
+
+    def __init__(self, directory):
+        require_numpy()
+        with open(os.path.join(directory, META_FILE)) as f:
+            self.meta = json.load(f)
+        self.directory = directory
+        self.vectors = np.memmap(os.path.join(directory, VECTORS_FILE), dtype=np.float32, mode='r',
+                                 shape=(self.meta['count'], self.meta['dimensions']))
+        self.ids = np.load(os.path.join(directory, IDS_FILE))
+        self.idf = np.load(os.path.join(directory, IDF_FILE))
+        with np.load(os.path.join(directory, IVF_FILE)) as ivf:
+            self.centroids, self.list_members, self.list_offsets = ivf['centroids'], ivf['members'], ivf['offsets']
+
+    def embed(self, texts):
+        return embed(texts, self.idf, self.meta['dimensions'], self.meta['bits'])
+
+    def exact_search(self, query_vector, k=10, block_rows=65536):
+        """Top k by cosine similarity over every vector, a block of the matrix at a time"""
+        scores = np.concatenate([self.vectors[start:start + block_rows] @ query_vector
+                                 for start in range(0, len(self.vectors), block_rows)])
+        return self._top(np.arange(len(scores)), scores, k)
+
+    def search_vector(self, query_vector, k=10, nprobe=DEFAULT_NPROBE):
+        """Top k by cosine similarity among the members of the nprobe closest IVF lists"""
+        if len(self.vectors) <= BRUTE_FORCE_MAX or nprobe >= len(self.centroids):
+            return self.exact_search(query_vector, k)
+        probe = np.argpartition(-(self.centroids @ query_vector), nprobe - 1)[:nprobe]
+        candidates = np.sort(np.concatenate([self.list_members[self.list_offsets[i]:self.list_offsets[i + 1]]
+                                             for i in probe]))
+        return self._top(candidates, self.vectors[candidates] @ query_vector, k)
+
+    def _top(self, rows, scores, k):
+        if len(rows) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            rows, scores = rows[top], scores[top]
+        order = np.lexsort((rows, -scores))
+        return [(int(self.ids[row]), round(float(score), 4)) for row, score in zip(rows[order], scores[order])]
+
+    def search(self, query, k=10, nprobe=DEFAULT_NPROBE):
+        """(transcript_id, similarity) for the k texts closest to the query"""
+        return self.search_vector(self.embed([query])[0], k, nprobe)
+
+
+def build_index(data_dir=None, column='transcript_text', source_path=None, dimensions=DIMENSIONS, bits=FEATURE_BITS,
+                batch_size=2000, seed=0, verbose=True):
+    """Embed every text into a memory-mapped matrix and train IVF lists over it
+
+    The source is read twice, once for the n-gram document frequencies and once
+    to write the vectors, so memory stays flat however many texts there are
+    (only the k-means sample is held in memory).
+    """
+    if data_dir is None:
+        data_dir = default_data_dir()
+    require_numpy()
+    source_path = source_path or os.path.join(data_dir, SOURCES[column])
+    directory = index_dir(data_dir, column)
+    os.makedirs(directory, exist_ok=True)
+    started = time.perf_counter()
+
+    # Pass 1: document frequency of each hashed n-gram
+    document_frequency = np.zeros(1 << bits, dtype=np.int64)
+    count = 0
+    for _, texts in _texts(source_path, column, batch_size):
+        _, columns, _ = hashed_features(texts, bits)
+        document_frequency += np.bincount(columns, minlength=1 << bits)
+        count += len(texts)
+    idf = np.log((1 + count) / (1 + document_frequency)).astype(np.float32) + 1
+
+    # Pass 2: vectors, written straight into the memory-mapped file
+    vectors = np.memmap(os.path.join(directory, VECTORS_FILE), dtype=np.float32, mode='w+', shape=(max(count, 1), dimensions))
+    ids = np.zeros(count, dtype=np.int64)
+    position = 0
+    for batch_ids, texts in _texts(source_path, column, batch_size):
+        vectors[position:position + len(texts)] = embed(texts, idf, dimensions, bits)
+        ids[position:position + len(texts)] = batch_ids
+        position += len(texts)
+    vectors.flush()
+    embedded = time.perf_counter() - started
+
+    # IVF: k-means on a sample, then every vector goes to its closest centroid
+    rng = np.random.default_rng(seed)
+    lists = max(1, min(int(math.sqrt(count)), count))
+    sample = np.sort(rng.choice(count, size=min(count, lists * KMEANS_SAMPLE_PER_LIST), replace=False))
+    centroids = kmeans(np.asarray(vectors[sample]), lists, rng)
+    assignment = np.concatenate([(vectors[start:start + 65536] @ centroids.T).argmax(axis=1)
+                                 for start in range(0, count, 65536)])
+    members = np.argsort(assignment, kind='stable')
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(assignment, minlength=lists))])
+
+    np.save(os.path.join(directory, IDS_FILE), ids)
+    np.save(os.path.join(directory, IDF_FILE), idf)
+    np.savez(os.path.join(directory, IVF_FILE), centroids=centroids, members=members, offsets=offsets)
+    with open(os.path.join(directory, META_FILE), 'w') as f:
+        json.dump({'column': column, 'source': os.path.abspath(source_path), 'count': count, 'dimensions': dimensions,
+                   'bits': bits, 'lists': lists}, f, indent=2)
+
+    if verbose:
+        elapsed = time.perf_counter() - started
+        print(f"Embedded {count} {column} values into {dimensions} dimensions in {embedded:.2f}s "
+              f"({count / embedded if embedded else 0:,.0f} rows/sec)")
+        print(f"Trained {lists} IVF lists in {elapsed - embedded:.2f}s -> {directory} "
+              f"({count * dimensions * 4 / 1024 / 1024:.1f} MB of vectors)")
+    return SemanticIndex(directory)
+
+
+def evaluate(index, queries, k=10, nprobes=(1, 4, DEFAULT_NPROBE, 16)):
+    """Recall@k of IVF search against exact search, and latency of both, for each nprobe"""
+    vectors = index.embed(queries)
+    exact, exact_times = [], []
+    for vector in vectors:
+        started = time.perf_counter()
+        exact.append({transcript_id for transcript_id, _ in index.exact_search(vector, k)})
+        exact_times.append((time.perf_counter() - started) * 1000)
+
+    def percentiles(times):
+        times = sorted(times)
+        return times[len(times) // 2], times[min(len(times) - 1, int(len(times) * 0.95))]
+
+    print(f"\n📊 {len(queries)} queries, top {k}, {index.meta['count']} vectors in {len(index.centroids)} lists")
+    p50, p95 = percentiles(exact_times)
+    print(f"  exact: P50 {p50:.2f} ms, P95 {p95:.2f} ms")
+    for nprobe in nprobes:
+        hits, times = 0, []
+        for vector, truth in zip(vectors, exact):
+            started = time.perf_counter()
+            found = index.search_vector(vector, k, nprobe)
+            times.append((time.perf_counter() - started) * 1000)
+            hits += len(truth & {transcript_id for transcript_id, _ in found})
+        p50, p95 = percentiles(times)
+        recall = hits / sum(len(truth) for truth in exact) if exact else 0.0
+        print(f"  nprobe {nprobe}: recall@{k} {recall * 100:.1f}%, P50 {p50:.2f} ms, P95 {p95:.2f} ms")
+
+
+def sample_queries(index, count, seed=0):
+    """Texts from the indexed source, as stand-ins for user queries"""
+    rng = np.random.default_rng(seed)
+    wanted = set(rng.choice(index.ids, size=min(count, len(index.ids)), replace=False).tolist())
+    return [row[index.meta['column']] for row in iter_csv_table(index.meta['source'])
+            if int(row['transcript_id']) in wanted]
+
+
+def main():
+    """Command line interface"""
+    parser = argparse.ArgumentParser(description="Local semantic search over transcripts or summaries (hashed TF-IDF vectors with an IVF index)")
+    parser.add_argument('query', nargs='?', default=None, help="Text to find similar transcripts for")
+    parser.add_argument('--data-dir', default=None, help="Directory holding the generated data (defaults to data/)")
+    parser.add_argument('--column', choices=sorted(SOURCES), default='transcript_text', help="Column to embed and search")
+    parser.add_argument('--source', default=None, help="CSV to embed (defaults to the column's file in the data directory)")
+    parser.add_argument('--build', action='store_true', help="(Re)build the index before searching")
+    parser.add_argument('--k', type=int, default=10, help="Results per query")
+    parser.add_argument('--nprobe', type=int, default=DEFAULT_NPROBE, help="IVF lists to search (all lists = exact search)")
+    parser.add_argument('--evaluate', type=int, default=None, metavar='N',
+                        help="Measure recall and latency against exact search with N sampled texts as queries")
+    args = parser.parse_args()
+
+    data_dir = args.data_dir or default_data_dir()
+    if args.build:
+        index = build_index(data_dir, args.column, args.source)
+    else:
+        index = SemanticIndex(index_dir(data_dir, args.column))
+    if args.query is not None:
+        for transcript_id, similarity in index.search(args.query, args.k, args.nprobe):
+            print(f"  {transcript_id}: {similarity:.4f}")
+    if args.evaluate:
+        evaluate(index, sample_queries(index, args.evaluate), args.k)
+
+if __name__ == "__main__":
+    main()
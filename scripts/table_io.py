@@ -0,0 +1,290 @@
+import csv
+import gzip
+import hashlib
+import io
+import os
+from decimal import Decimal
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is only needed for Parquet output
+    pa = None
+    pq = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard is only needed for zstd-compressed part files
+    zstandard = None
+
+from table_schema import DECIMAL_PRECISION, DECIMAL_SCALE, LOW_CARDINALITY_COLUMNS, TABLE_COLUMNS
+from timestamps import SECONDS_PER_DAY, to_epoch
+
+# File extension of each output format
+OUTPUT_EXTENSIONS = {'csv': '.csv', 'parquet': '.parquet'}
+
+# File extension of each part-file compression
+COMPRESSION_EXTENSIONS = {'gzip': '.gz', 'zstd': '.zst'}
+
+
+def default_data_dir():
+    """Return the repository's data/ directory"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(script_dir, '..', 'data')
+
+
+def read_csv_table(path):
+    """Read a generated CSV table into a list of row dicts"""
+    with open(path, 'r') as f:
+        reader = csv.DictReader(f)
+        return list(reader)
+
+
+def iter_csv_table(path):
+    """Iterate a CSV table's rows one at a time without loading the whole file
+
+    The file is opened right away, so a missing table fails here rather than on
+    the first row.
+    """
+    f = open(path, 'r')
+
+    def rows():
+        with f:
+            yield from csv.DictReader(f)
+    return rows()
+
+
+def iter_batches(iterable, size):
+    """Yield lists of up to `size` items (a single list when size is None)"""
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if size is not None and len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def write_csv_table(path, rows):
+    """Write a list of row dicts to CSV using the first row's keys as the header"""
+    with open(path, 'w', newline='') as f:
+        if rows:
+            fieldnames = rows[0].keys()
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+class CsvTableSink:
+    """Append-only CSV writer that emits the header with the first batch of rows"""
+
+    def __init__(self, path):
+        self.path = path
+        self.rows_written = 0
+        self._file = open(path, 'w', newline='')
+        self._writer = None
+
+    def write_rows(self, rows):
+        if not rows:
+            return
+        if self._writer is None:
+            self._writer = csv.DictWriter(self._file, fieldnames=rows[0].keys())
+            self._writer.writeheader()
+        self._writer.writerows(rows)
+        self.rows_written += len(rows)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class _DigestFile:
+    """Binary output file that counts and SHA-256 hashes the bytes written to it"""
+
+    def __init__(self, path):
+        self._file = open(path, 'wb')
+        self.bytes = 0
+        self.sha256 = hashlib.sha256()
+
+    def write(self, data):
+        self._file.write(data)
+        self.bytes += len(data)
+        self.sha256.update(data)
+        return len(data)
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def require_zstandard():
+    if zstandard is None:
+        raise ImportError("zstd part files require zstandard (pip install zstandard)")
+
+
+def open_compressed_reader(path):
+    """Open a .gz/.zst/plain file for reading as text"""
+    if path.endswith(COMPRESSION_EXTENSIONS['gzip']):
+        return gzip.open(path, 'rt', newline='')
+    if path.endswith(COMPRESSION_EXTENSIONS['zstd']):
+        require_zstandard()
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True),
+                                newline='')
+    return open(path, 'r', newline='')
+
+
+class PartitionedCsvSink:
+    """Append-only CSV writer that splits a table into compressed part files
+
+    A new part is started once the current one reaches about target_bytes of
+    compressed output, and each part carries its own header so it can be loaded
+    on its own. `parts` records file name, row count, size and SHA-256 per part.
+    """
+
+    def __init__(self, path, target_bytes, compression='gzip'):
+        if compression == 'zstd':
+            require_zstandard()
+        self.path = path
+        self.target_bytes = target_bytes
+        self.compression = compression
+        self.rows_written = 0
+        self.parts = []
+        self._fieldnames = None
+        self._digest = None
+
+    def part_path(self, number):
+        base, extension = os.path.splitext(self.path)
+        return f'{base}_part{number:04d}{extension}{COMPRESSION_EXTENSIONS[self.compression]}'
+
+    def _open_part(self):
+        path = self.part_path(len(self.parts) + 1)
+        self._digest = _DigestFile(path)
+        if self.compression == 'zstd':
+            self._compressed = zstandard.ZstdCompressor(level=3).stream_writer(self._digest, closefd=False)
+        else:
+            # mtime=0 keeps the bytes (and so the checksum) identical across runs
+            self._compressed = gzip.GzipFile(fileobj=self._digest, mode='wb', compresslevel=6, mtime=0)
+        self._text = io.TextIOWrapper(self._compressed, encoding='utf-8', newline='')
+        self._writer = csv.DictWriter(self._text, fieldnames=self._fieldnames)
+        self._writer.writeheader()
+        self._part_rows = 0
+        self._part_path = path
+
+    def _close_part(self):
+        self._text.close()
+        self._digest.close()
+        self.parts.append({
+            'file': os.path.basename(self._part_path),
+            'rows': self._part_rows,
+            'bytes': self._digest.bytes,
+            'sha256': self._digest.sha256.hexdigest()
+        })
+        self._digest = None
+
+    def write_rows(self, rows):
+        for row in rows:
+            if self._fieldnames is None:
+                self._fieldnames = list(row.keys())
+            if self._digest is None:
+                self._open_part()
+            self._writer.writerow(row)
+            self._part_rows += 1
+            if self._digest.bytes >= self.target_bytes:
+                self._close_part()
+        self.rows_written += len(rows)
+
+    def close(self):
+        if self._digest is not None:
+            self._close_part()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def require_pyarrow():
+    if pa is None:
+        raise ImportError("Parquet output requires pyarrow (pip install pyarrow)")
+
+
+def _boolean(value):
+    return value if isinstance(value, bool) else str(value).lower() in ('true', '1')
+
+
+def _date(value):
+    return to_epoch(value) // SECONDS_PER_DAY
+
+
+def _decimal(value):
+    return Decimal(str(value)).quantize(Decimal(1).scaleb(-DECIMAL_SCALE))
+
+
+# Arrow type and value converter for each schema type. Values may be generated
+# (ints, bools, Timestamps) or read back from CSV (strings); '' is NULL either way.
+def _parquet_types():
+    return {
+        'VARCHAR': (pa.string(), str),
+        'INTEGER': (pa.int64(), int),
+        'FLOAT': (pa.float64(), float),
+        'DECIMAL': (pa.decimal128(DECIMAL_PRECISION, DECIMAL_SCALE), _decimal),
+        'BOOLEAN': (pa.bool_(), _boolean),
+        'DATE': (pa.date32(), _date),
+        'TIMESTAMP': (pa.timestamp('s'), to_epoch)
+    }
+
+
+class ParquetTableSink:
+    """Append-only Parquet writer with typed columns; each batch becomes a row group
+
+    Column types come from table_schema (matching the CREATE TABLE definitions),
+    pages are compressed and low-cardinality string columns dictionary-encoded.
+    """
+
+    def __init__(self, path, table, compression='zstd'):
+        require_pyarrow()
+        self.path = path
+        self.rows_written = 0
+        types = _parquet_types()
+        self._columns = [(name, types[sql_type][1]) for name, sql_type in TABLE_COLUMNS[table]]
+        self._schema = pa.schema([(name, types[sql_type][0]) for name, sql_type in TABLE_COLUMNS[table]])
+        self._writer = pq.ParquetWriter(
+            path, self._schema, compression=compression,
+            use_dictionary=[name for name, _ in self._columns if name in LOW_CARDINALITY_COLUMNS],
+            coerce_timestamps='ms'
+        )
+
+    def write_rows(self, rows):
+        if not rows:
+            return
+        arrays = [[None if row[name] == '' or row[name] is None else convert(row[name]) for row in rows]
+                  for name, convert in self._columns]
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self._schema))
+        self.rows_written += len(rows)
+
+    def close(self):
+        self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def open_table_sink(path, table, output_format='csv', part_bytes=None, compression='gzip'):
+    """Open a CSV or Parquet sink for a generated table (CSV split into parts when part_bytes is set)"""
+    if output_format == 'parquet':
+        return ParquetTableSink(path, table)
+    if part_bytes:
+        return PartitionedCsvSink(path, part_bytes, compression)
+    return CsvTableSink(path)
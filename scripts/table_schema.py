@@ -0,0 +1,169 @@
+# Column types of each generated table, in the order the generators write them.
+# Types follow the CREATE TABLE definitions in queries/snowflake_setup.sql
+# (VARCHAR/TEXT are both 'VARCHAR', TIMESTAMP_NTZ is 'TIMESTAMP', FLOAT/NUMBER(10,1) are 'FLOAT').
+TABLE_COLUMNS = {
+    'customers': [
+        ('customer_id', 'VARCHAR'),
+        ('organization_name', 'VARCHAR'),
+        ('organization_type', 'VARCHAR'),
+        ('organization_subtype', 'VARCHAR'),
+        ('size_category', 'VARCHAR'),
+        ('employee_count', 'INTEGER'),
+        ('subscription_tier', 'VARCHAR'),
+        ('monthly_revenue', 'DECIMAL'),
+        ('setup_date', 'DATE'),
+        ('primary_contact_name', 'VARCHAR'),
+        ('primary_contact_email', 'VARCHAR'),
+        ('primary_contact_phone', 'VARCHAR'),
+        ('street_address', 'VARCHAR'),
+        ('city', 'VARCHAR'),
+        ('state', 'VARCHAR'),
+        ('zip_code', 'VARCHAR'),
+        ('time_zone', 'VARCHAR'),
+        ('payment_methods', 'VARCHAR'),
+        ('integration_count', 'INTEGER'),
+        ('last_login_date', 'DATE'),
+        ('support_tier', 'VARCHAR'),
+        ('created_at', 'TIMESTAMP'),
+        ('updated_at', 'TIMESTAMP')
+    ],
+    'employees': [
+        ('employee_id', 'VARCHAR'),
+        ('customer_id', 'VARCHAR'),
+        ('first_name', 'VARCHAR'),
+        ('last_name', 'VARCHAR'),
+        ('email', 'VARCHAR'),
+        ('phone', 'VARCHAR'),
+        ('title', 'VARCHAR'),
+        ('role', 'VARCHAR'),
+        ('department', 'VARCHAR'),
+        ('hire_date', 'DATE'),
+        ('is_primary_contact', 'BOOLEAN'),
+        ('is_active', 'BOOLEAN'),
+        ('last_login_date', 'DATE'),
+        ('training_completed', 'BOOLEAN'),
+        ('permissions', 'VARCHAR'),
+        ('created_at', 'TIMESTAMP'),
+        ('updated_at', 'TIMESTAMP')
+    ],
+    'tickets': [
+        ('ticket_id', 'INTEGER'),
+        ('customer_id', 'VARCHAR'),
+        ('employee_id', 'VARCHAR'),
+        ('description', 'VARCHAR'),
+        ('status', 'VARCHAR'),
+        ('priority', 'VARCHAR'),
+        ('type', 'VARCHAR'),
+        ('via_channel', 'VARCHAR'),
+        ('satisfaction_rating', 'VARCHAR'),
+        ('satisfaction_comment', 'VARCHAR'),
+        ('tags', 'VARCHAR'),
+        ('due_at', 'TIMESTAMP'),
+        ('created_at', 'TIMESTAMP'),
+        ('updated_at', 'TIMESTAMP'),
+        ('solved_at', 'TIMESTAMP')
+    ],
+    'call_transcripts': [
+        ('transcript_id', 'INTEGER'),
+        ('ticket_id', 'INTEGER'),
+        ('call_duration', 'INTEGER'),
+        ('transcript_text', 'VARCHAR'),
+        ('call_date', 'TIMESTAMP'),
+        ('agent_name', 'VARCHAR'),
+        ('customer_satisfaction', 'INTEGER'),
+        ('resolution_provided', 'BOOLEAN'),
+        ('follow_up_needed', 'BOOLEAN')
+    ],
+    'ticket_metrics': [
+        ('metric_id', 'INTEGER'),
+        ('ticket_id', 'INTEGER'),
+        ('first_resolution_time', 'INTEGER'),
+        ('full_resolution_time', 'INTEGER'),
+        ('agent_work_time', 'INTEGER'),
+        ('requester_wait_time', 'INTEGER'),
+        ('reply_time', 'INTEGER'),
+        ('group_stations', 'INTEGER'),
+        ('assignee_stations', 'INTEGER'),
+        ('reopens', 'INTEGER'),
+        ('replies', 'INTEGER'),
+        ('assignee_updated_at', 'TIMESTAMP'),
+        ('requester_updated_at', 'TIMESTAMP'),
+        ('status_updated_at', 'TIMESTAMP'),
+        ('initially_assigned_at', 'TIMESTAMP'),
+        ('assigned_at', 'TIMESTAMP'),
+        ('solved_at', 'TIMESTAMP')
+    ],
+    # Columns of transcripts_enriched.sql, as built offline by offline_cortex.py
+    'enriched_call_transcripts': [
+        ('transcript_id', 'INTEGER'),
+        ('ticket_id', 'INTEGER'),
+        ('call_duration', 'INTEGER'),
+        ('call_duration_minutes', 'FLOAT'),
+        ('transcript_text', 'VARCHAR'),
+        ('call_date', 'TIMESTAMP'),
+        ('agent_name', 'VARCHAR'),
+        ('customer_satisfaction', 'INTEGER'),
+        ('resolution_provided', 'BOOLEAN'),
+        ('follow_up_needed', 'BOOLEAN'),
+        ('sentiment_score', 'FLOAT'),
+        ('sentiment_category', 'VARCHAR'),
+        ('conversation_category', 'VARCHAR'),
+        ('conversation_summary', 'VARCHAR'),
+        ('original_text_length', 'INTEGER'),
+        ('summary_length', 'INTEGER'),
+        ('compression_ratio', 'FLOAT')
+    ]
+}
+
+# Snowflake table each generated table is loaded into
+SNOWFLAKE_TABLES = {
+    'customers': 'ZENDESK_CUSTOMERS',
+    'employees': 'ZENDESK_EMPLOYEES',
+    'tickets': 'ZENDESK_TICKETS',
+    'call_transcripts': 'CALL_TRANSCRIPTS',
+    'ticket_metrics': 'TICKET_METRICS',
+    'enriched_call_transcripts': 'ENRICHED_CALL_TRANSCRIPTS'
+}
+
+# Tables each table references through a foreign key; a table can only be loaded after its parents
+TABLE_PARENTS = {
+    'customers': [],
+    'employees': ['customers'],
+    'tickets': ['customers', 'employees'],
+    'call_transcripts': ['tickets'],
+    'ticket_metrics': ['tickets'],
+    'enriched_call_transcripts': ['tickets']
+}
+
+# Columns with a handful of distinct values, stored dictionary-encoded in columnar output
+LOW_CARDINALITY_COLUMNS = {
+    'organization_type', 'organization_subtype', 'size_category', 'subscription_tier', 'state',
+    'time_zone', 'support_tier', 'title', 'role', 'department', 'status', 'priority', 'type',
+    'via_channel', 'satisfaction_rating', 'satisfaction_comment', 'tags', 'agent_name', 'sentiment_category',
+    'conversation_category'
+}
+
+# DECIMAL(10,2) in the CREATE TABLE definitions
+DECIMAL_PRECISION = 10
+DECIMAL_SCALE = 2
+
+
+def column_types(table):
+    """{column: type} for a table"""
+    return dict(TABLE_COLUMNS[table])
+
+
+def load_order(tables):
+    """Order tables so every table comes after the tables it references"""
+    ordered = []
+
+    def visit(table):
+        if table in ordered:
+            return
+        for parent in TABLE_PARENTS[table]:
+            if parent in tables:
+                visit(parent)
+        ordered.append(table)
+    for table in tables:
+        visit(table)
+    return ordered
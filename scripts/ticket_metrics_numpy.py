@@ -0,0 +1,270 @@
+import argparse
+import time
+
+from columnar import CounterStreams, category_codes, epoch_seconds, np, require_numpy, timestamp_column
+
+# Categorical codes shared by every column below
+STATUSES = ('new', 'open', 'pending', 'hold', 'solved', 'closed')
+PRIORITIES = ('low', 'normal', 'high', 'urgent')
+SIZES = ('small', 'medium', 'large')
+TIERS = ('basic', 'standard', 'premium')
+SATISFACTIONS = ('', 'good', 'bad')
+ORG_TYPES = ('faith', 'school', 'nonprofit', 'childcare', 'community_ed', 'unknown')
+
+METRIC_FIELDS = (
+    'metric_id', 'ticket_id', 'first_resolution_time', 'full_resolution_time', 'agent_work_time',
+    'requester_wait_time', 'reply_time', 'group_stations', 'assignee_stations', 'reopens', 'replies',
+    'assignee_updated_at', 'requester_updated_at', 'status_updated_at', 'initially_assigned_at',
+    'assigned_at', 'solved_at'
+)
+
+# Lookup tables indexed by the codes above (same values as generate_ticket_metrics.py)
+WORK_TIME_RANGE = {'low': (10, 45), 'normal': (15, 60), 'high': (20, 90), 'urgent': (30, 120)}
+REPLY_RANGE = {'low': (1, 4), 'normal': (1, 4), 'high': (2, 6), 'urgent': (3, 8)}
+SIZE_MULTIPLIER = {'small': 0.9, 'medium': 1.0, 'large': 1.2}
+TIER_MULTIPLIER = {'basic': 0.85, 'standard': 1.0, 'premium': 1.15}
+ORG_TYPE_REPLY_MULTIPLIER = {'faith': 1.2, 'school': 1.1, 'nonprofit': 1.0, 'childcare': 1.0,
+                             'community_ed': 0.9, 'unknown': 1.0}
+
+# Call-duration bands: (upper bound in minutes, quick probability, quick hours, slow hours)
+CALL_RESOLUTION_BANDS = (
+    (5, 0.3, (1, 8), (24, 120)),
+    (15, 0.4, (2, 24), (12, 96)),
+    (30, 0.5, (1, 12), (48, 168)),
+    (None, 0.6, (2, 24), (72, 240))
+)
+
+HOUR = 3600.0
+
+
+def _lookup(codes, categories, table):
+    return np.array([table[c] for c in categories], dtype=np.float64)[codes]
+
+
+def ticket_columns_from_rows(tickets, customers, transcripts=()):
+    """Build the columnar ticket table from row dicts (customers as a list or dict by ID)"""
+    require_numpy()
+    if not isinstance(customers, dict):
+        customers = {row['customer_id']: row for row in customers}
+
+    call_minutes = {}
+    for row in transcripts:
+        call_minutes[int(row['ticket_id'])] = int(row['call_duration']) // 60
+
+    ticket_ids = np.fromiter((int(t['ticket_id']) for t in tickets), dtype=np.int64, count=len(tickets))
+    ticket_customers = [customers.get(t['customer_id'], {}) for t in tickets]
+
+    return {
+        'ticket_id': ticket_ids,
+        'status': category_codes([t['status'] for t in tickets], STATUSES, 'new'),
+        'priority': category_codes([t['priority'] for t in tickets], PRIORITIES, 'normal'),
+        'satisfaction': category_codes([t.get('satisfaction_rating', '') for t in tickets], SATISFACTIONS, ''),
+        'org_type': category_codes([c.get('organization_type', 'unknown') for c in ticket_customers], ORG_TYPES, 'unknown'),
+        'size': category_codes([c.get('size_category', 'medium') for c in ticket_customers], SIZES, 'medium'),
+        'tier': category_codes([c.get('subscription_tier', 'standard') for c in ticket_customers], TIERS, 'standard'),
+        'created_at': epoch_seconds([t['created_at'] for t in tickets]),
+        'updated_at': epoch_seconds([t['updated_at'] for t in tickets]),
+        'solved_at': epoch_seconds([t['solved_at'] for t in tickets]),
+        'has_call': np.fromiter((i in call_minutes for i in ticket_ids.tolist()), dtype=bool, count=len(tickets)),
+        'call_minutes': np.fromiter((call_minutes.get(i, 0) for i in ticket_ids.tolist()), dtype=np.int64,
+                                    count=len(tickets))
+    }
+
+
+def compute_ticket_metrics(columns, seed):
+    """Compute every TICKET_METRICS column as array operations over the whole ticket table
+
+    Timestamps stay as float epoch seconds; use metric_rows() to format them for CSV.
+    """
+    require_numpy()
+    n = len(columns['ticket_id'])
+    rng = CounterStreams(seed, columns['ticket_id'], 'metrics_numpy')
+
+    status = columns['status']
+    priority = columns['priority']
+    satisfaction = columns['satisfaction']
+    created = columns['created_at'].astype(np.float64)
+    updated = columns['updated_at'].astype(np.float64)
+    has_solved = columns['solved_at'] >= 0
+    solved = np.where(has_solved, columns['solved_at'], columns['updated_at']).astype(np.float64)
+    has_call = columns['has_call']
+    call_minutes = columns['call_minutes']
+
+    is_closed = (status == STATUSES.index('solved')) | (status == STATUSES.index('closed'))
+    is_waiting = np.isin(status, [STATUSES.index(s) for s in ('open', 'pending', 'hold')])
+    is_good = satisfaction == SATISFACTIONS.index('good')
+    is_bad = satisfaction == SATISFACTIONS.index('bad')
+
+    # Ticket lifecycle duration in hours
+    total_duration = (np.where(has_solved, solved, updated) - created) / HOUR
+
+    # Assignment timing
+    initial_assign_delay = rng.uniform('initial_assign_delay', 0.1, np.minimum(4, total_duration * 0.1))
+    initially_assigned_at = created + initial_assign_delay * HOUR
+    reassigned = rng.uniform('reassigned') < 0.15
+    assign_delay = rng.uniform('assign_delay', initial_assign_delay,
+                               np.minimum(total_duration * 0.3, initial_assign_delay + 24))
+    assigned_at = np.where(reassigned, created + assign_delay * HOUR, initially_assigned_at)
+    assignee_stations = np.where(reassigned, 2, 1)
+    group_stations = rng.choices('group_stations', [1, 2, 3], [80, 15, 5])
+    assign_hours = (assigned_at - created) / HOUR
+
+    # Agent work time
+    work_low = _lookup(priority, PRIORITIES, {p: r[0] for p, r in WORK_TIME_RANGE.items()})
+    work_high = _lookup(priority, PRIORITIES, {p: r[1] for p, r in WORK_TIME_RANGE.items()})
+    base_work_time = rng.randint('base_work_time', work_low, work_high)
+    satisfaction_multiplier = np.where(is_bad, 1.4, np.where(is_good, 1.1, 1.0))
+    work_time_multiplier = np.where(is_closed, rng.uniform('work_time_multiplier', 1.0, 1.5),
+                                    rng.uniform('work_time_multiplier', 0.5, 1.0))
+    agent_work_time = np.trunc(base_work_time
+                               * _lookup(columns['size'], SIZES, SIZE_MULTIPLIER)
+                               * _lookup(columns['tier'], TIERS, TIER_MULTIPLIER)
+                               * np.where(has_call, 1.3, 1.0)
+                               * satisfaction_multiplier
+                               * work_time_multiplier).astype(np.int64)
+
+    # Resolution times, correlated with call duration for tickets with calls
+    resolved = is_closed & has_solved
+    base_resolution_hours = (solved - created) / HOUR
+    quick = rng.uniform('quick_resolution')
+    band_hours = np.full(n, np.nan)
+    lower = 0
+    for upper, quick_probability, quick_hours, slow_hours in CALL_RESOLUTION_BANDS:
+        in_band = (call_minutes > lower) if upper is None else (call_minutes > lower) & (call_minutes <= upper)
+        hours = np.where(quick < quick_probability,
+                         rng.uniform('resolution_hours', *quick_hours),
+                         rng.uniform('resolution_hours', *slow_hours))
+        band_hours = np.where(in_band, hours, band_hours)
+        lower = upper
+    call_adjusted = has_call & (call_minutes > 0)
+    base_resolution_hours = np.where(call_adjusted, band_hours, base_resolution_hours)
+    base_resolution_hours = np.where(has_call & is_bad,
+                                     base_resolution_hours * rng.uniform('resolution_satisfaction', 1.5, 2.5),
+                                     base_resolution_hours)
+    base_resolution_hours = np.where(has_call & is_good,
+                                     base_resolution_hours * rng.uniform('resolution_satisfaction', 0.7, 1.0),
+                                     base_resolution_hours)
+
+    first_resolution_time = np.where(
+        resolved,
+        np.trunc(np.maximum(1, assign_hours + rng.uniform('first_resolution', 1, 8))),
+        np.where(is_waiting, np.trunc(np.maximum(1, assign_hours + rng.uniform('first_resolution', 1, 4))), 0)
+    ).astype(np.int64)
+    full_resolution_time = np.where(resolved, np.maximum(1, np.trunc(base_resolution_hours)), 0).astype(np.int64)
+
+    reply_time = np.maximum(1, np.trunc(assign_hours + rng.uniform('reply_time', 0.5, 3))).astype(np.int64)
+    requester_wait_time = np.maximum(
+        1, np.trunc((np.where(is_closed, solved, updated) - created) / HOUR)).astype(np.int64)
+
+    # Reopens and replies
+    reopens = np.where(is_closed, rng.choices('reopens', [0, 1, 2], [85, 12, 3]), 0)
+    reply_low = _lookup(priority, PRIORITIES, {p: r[0] for p, r in REPLY_RANGE.items()})
+    reply_high = _lookup(priority, PRIORITIES, {p: r[1] for p, r in REPLY_RANGE.items()})
+    base_replies = rng.randint('base_replies', reply_low, reply_high)
+    replies = (np.trunc(base_replies * _lookup(columns['org_type'], ORG_TYPES, ORG_TYPE_REPLY_MULTIPLIER))
+               .astype(np.int64)
+               + np.where(has_call, rng.randint('call_reply_boost', 1, 3), 0)
+               + np.where(is_bad, rng.randint('satisfaction_reply_boost', 1, 4),
+                          np.where(is_good, rng.randint('satisfaction_reply_boost', 0, 1), 0))
+               + reopens * rng.randint('reopen_replies', 1, 3))
+
+    # Update timestamps
+    open_hours = (updated - created) / HOUR
+    assignee_updated_at = np.where(is_closed,
+                                   solved - rng.uniform('assignee_updated', 0.1, 2) * HOUR,
+                                   updated - rng.uniform('assignee_updated', 0.1, 6) * HOUR)
+    requester_updated_at = np.where(
+        rng.uniform('requester_interacted') < 0.7,
+        np.where(is_closed,
+                 solved - rng.uniform('requester_updated', 1, 12) * HOUR,
+                 created + rng.uniform('requester_updated', 0, open_hours) * HOUR),
+        created + rng.uniform('requester_updated', 0.1, 1) * HOUR
+    )
+    status_updated_at = np.where(is_closed, solved,
+                                 created + rng.uniform('status_updated', 1, open_hours) * HOUR)
+
+    return {
+        'metric_id': columns['ticket_id'],
+        'ticket_id': columns['ticket_id'],
+        'first_resolution_time': first_resolution_time,
+        'full_resolution_time': full_resolution_time,
+        'agent_work_time': agent_work_time,
+        'requester_wait_time': requester_wait_time,
+        'reply_time': reply_time,
+        'group_stations': group_stations,
+        'assignee_stations': assignee_stations,
+        'reopens': reopens,
+        'replies': replies,
+        'assignee_updated_at': np.maximum(assignee_updated_at, assigned_at),
+        'requester_updated_at': np.maximum(requester_updated_at, created),
+        'status_updated_at': np.maximum(status_updated_at, created),
+        'initially_assigned_at': initially_assigned_at,
+        'assigned_at': assigned_at,
+        'solved_at': np.where(has_solved, solved, np.nan)
+    }
+
+
+def metric_rows(metric_columns):
+    """Convert computed metric columns to the row dicts written by generate_ticket_metrics()"""
+    columns = {}
+    for field in METRIC_FIELDS:
+        values = metric_columns[field]
+        if field == 'solved_at':
+            present = ~np.isnan(values)
+            columns[field] = timestamp_column(np.where(present, values, 0), present)
+        elif field.endswith('_at'):
+            columns[field] = timestamp_column(values)
+        else:
+            columns[field] = values.tolist()
+    return [dict(zip(METRIC_FIELDS, row)) for row in zip(*(columns[f] for f in METRIC_FIELDS))]
+
+
+def synthetic_ticket_columns(count, seed=0):
+    """Random ticket columns with realistic shapes, for benchmarking the engine"""
+    require_numpy()
+    gen = np.random.default_rng(seed)
+    created = gen.integers(1420070400, 1732060800, size=count)  # 2015-01-01 .. 2024-11-20
+    status = gen.integers(0, len(STATUSES), size=count).astype(np.int8)
+    is_closed = status >= STATUSES.index('solved')
+    solved = np.where(is_closed, created + gen.integers(1, 15, size=count) * 86400, -1)
+    has_call = gen.random(count) < 0.68
+    return {
+        'ticket_id': np.arange(1, count + 1, dtype=np.int64),
+        'status': status,
+        'priority': gen.integers(0, len(PRIORITIES), size=count).astype(np.int8),
+        'satisfaction': gen.integers(0, len(SATISFACTIONS), size=count).astype(np.int8),
+        'org_type': gen.integers(0, len(ORG_TYPES) - 1, size=count).astype(np.int8),
+        'size': gen.integers(0, len(SIZES), size=count).astype(np.int8),
+        'tier': gen.integers(0, len(TIERS), size=count).astype(np.int8),
+        'created_at': created,
+        'updated_at': np.where(is_closed, solved, created + gen.integers(3600, 7 * 86400, size=count)),
+        'solved_at': solved,
+        'has_call': has_call,
+        'call_minutes': np.where(has_call, gen.integers(2, 61, size=count), 0)
+    }
+
+
+def main():
+    """Benchmark the columnar engine on synthetic tickets"""
+    parser = argparse.ArgumentParser(description="Benchmark the NumPy ticket metrics engine")
+    parser.add_argument('--tickets', type=int, default=1_000_000, help="Number of synthetic tickets")
+    parser.add_argument('--batch-size', type=int, default=5_000_000,
+                        help="Tickets per batch (bounds memory; results do not depend on it)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    require_numpy()
+    started = time.perf_counter()
+    computed = 0
+    for offset in range(0, args.tickets, args.batch_size):
+        count = min(args.batch_size, args.tickets - offset)
+        columns = synthetic_ticket_columns(count, seed=offset)
+        columns['ticket_id'] += offset
+        metrics = compute_ticket_metrics(columns, args.seed)
+        computed += len(metrics['ticket_id'])
+    elapsed = time.perf_counter() - started
+    print(f"Computed metrics for {computed:,} tickets in {elapsed:.2f}s ({computed / elapsed:,.0f} tickets/sec)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import math
+from datetime import date, datetime
+from functools import lru_cache
+
+SECONDS_PER_HOUR = 3600
+SECONDS_PER_DAY = 86400
+
+# Generated data is "as of" this date unless a run is given another one, so
+# output doesn't drift with the wall clock between runs
+DEFAULT_AS_OF = datetime(2024, 11, 20)
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+@lru_cache(maxsize=None)
+def _day_number(prefix):
+    """Days since 1970-01-01 for a 'YYYY-MM-DD' prefix (cached: generated tables reuse a few thousand dates)"""
+    return date(int(prefix[0:4]), int(prefix[5:7]), int(prefix[8:10])).toordinal() - _EPOCH_ORDINAL
+
+
+@lru_cache(maxsize=None)
+def _civil_date(day):
+    return date.fromordinal(day + _EPOCH_ORDINAL)
+
+
+@lru_cache(maxsize=None)
+def _date_text(day):
+    return _civil_date(day).isoformat()
+
+
+def parse_timestamp(text):
+    """Parse 'YYYY-MM-DD' or 'YYYY-MM-DD HH:MM:SS' to epoch seconds (None for blanks)
+
+    Only the fixed layout the generators write is accepted, so fields are sliced
+    by position instead of going through strptime.
+    """
+    if not text:
+        return None
+    seconds = _day_number(text[:10]) * SECONDS_PER_DAY
+    if len(text) > 10:
+        seconds += int(text[11:13]) * 3600 + int(text[14:16]) * 60 + int(text[17:19])
+    return seconds
+
+
+def to_epoch(value):
+    """Epoch seconds for a Timestamp/int or a timestamp string (None for blanks)"""
+    if isinstance(value, int):
+        return int(value)
+    return parse_timestamp(value)
+
+
+def epoch_of(year, month, day):
+    """Epoch seconds at midnight of a calendar date"""
+    return _day_number(f'{year:04d}-{month:02d}-{day:02d}') * SECONDS_PER_DAY
+
+
+def from_datetime(value):
+    """Epoch seconds for a naive datetime"""
+    return math.floor((value - datetime(1970, 1, 1)).total_seconds())
+
+
+def calendar_date(seconds):
+    """The datetime.date an epoch second falls on (for .year / .month)"""
+    return _civil_date(math.floor(seconds) // SECONDS_PER_DAY)
+
+
+def hour_of(seconds):
+    return math.floor(seconds) % SECONDS_PER_DAY // SECONDS_PER_HOUR
+
+
+@lru_cache(maxsize=None)
+def _clock_text(second_of_day):
+    hour, rest = divmod(second_of_day, 3600)
+    minute, second = divmod(rest, 60)
+    return f' {hour:02d}:{minute:02d}:{second:02d}'
+
+
+def _format_seconds(seconds):
+    day, rest = divmod(seconds, SECONDS_PER_DAY)
+    return _date_text(day) + _clock_text(rest)
+
+
+def format_timestamp(seconds):
+    """Format epoch seconds (int or float, floored) as 'YYYY-MM-DD HH:MM:SS'"""
+    return _format_seconds(math.floor(seconds))
+
+
+def format_date(seconds):
+    return _date_text(math.floor(seconds) // SECONDS_PER_DAY)
+
+
+class Timestamp(int):
+    """Epoch seconds that print as 'YYYY-MM-DD HH:MM:SS'
+
+    Generated rows carry these instead of strings: stages do integer arithmetic
+    on them directly, and csv writers call str() on each field, so formatting
+    only happens at the output sink. Float seconds are truncated, which is the
+    same as flooring for every date after 1970.
+    """
+
+    __slots__ = ()
+
+    def __str__(self):
+        return _format_seconds(int(self))
+
+    def __repr__(self):
+        return f"Timestamp('{self}')"
+
+
+def timestamp_or_blank(seconds):
+    """Timestamp for a value, '' for None (the CSV form of a missing timestamp)"""
+    return '' if seconds is None else Timestamp(seconds)
@@ -0,0 +1,64 @@
+import json
+import os
+from datetime import datetime
+
+from table_io import iter_csv_table
+from timestamps import format_date, to_epoch
+
+WATERMARK_FILE = 'watermark.json'
+DELTA_DIR = 'deltas'
+
+
+def watermark_path(data_dir):
+    return os.path.join(data_dir, WATERMARK_FILE)
+
+
+def delta_dir(data_dir, as_of):
+    """Directory an incremental run's delta files go to, e.g. data/deltas/2024-11-27/"""
+    return os.path.join(data_dir, DELTA_DIR, as_of.strftime('%Y-%m-%d'))
+
+
+def derive_watermark(data_dir, tickets_file, transcripts_file):
+    """Watermark for data written before watermark.json existed: the newest ticket date and next IDs
+
+    The tables are streamed, so this costs one pass over each CSV but no memory.
+    """
+    last_created, last_ticket, last_transcript = 0, 0, 0
+    for ticket in iter_csv_table(os.path.join(data_dir, tickets_file)):
+        last_created = max(last_created, to_epoch(ticket['created_at']))
+        last_ticket = max(last_ticket, int(ticket['ticket_id']))
+    try:
+        for transcript in iter_csv_table(os.path.join(data_dir, transcripts_file)):
+            last_transcript = max(last_transcript, int(transcript['transcript_id']))
+    except FileNotFoundError:
+        pass
+    return {
+        'as_of': format_date(last_created),
+        'next_ids': {'tickets': last_ticket + 1, 'call_transcripts': last_transcript + 1},
+        'deltas': []
+    }
+
+
+def read_watermark(data_dir, tickets_file='zendesk_tickets.csv', transcripts_file='call_transcripts.csv'):
+    """The date the data is loaded through and the next free IDs, from watermark.json or the tables"""
+    try:
+        with open(watermark_path(data_dir)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return derive_watermark(data_dir, tickets_file, transcripts_file)
+
+
+def watermark_date(watermark):
+    return datetime.strptime(watermark['as_of'], '%Y-%m-%d')
+
+
+def write_watermark(data_dir, as_of, next_ids, deltas=()):
+    """Record that the data is loaded through `as_of`, with the IDs the next run continues from"""
+    watermark = {
+        'as_of': as_of.strftime('%Y-%m-%d'),
+        'next_ids': {'tickets': next_ids['tickets'], 'call_transcripts': next_ids['call_transcripts']},
+        'deltas': list(deltas)
+    }
+    with open(watermark_path(data_dir), 'w') as f:
+        json.dump(watermark, f, indent=2)
+    return watermark